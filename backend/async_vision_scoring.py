@@ -0,0 +1,104 @@
+import sys
+import json
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, Tuple
+
+from vision_score import ProfessionalVisionAnalyzer
+
+# Asyncio directory scorer for screenshots.
+#
+# One os.scandir pass lists the images (file type comes from the directory entry, size
+# from the entry's cached stat), so there is no per-file exists() + stat() round trip.
+# Each image is then scored by path in a thread pool, so a fresh normalized copy
+# (screenshot_normalize.py) is inflated instead of decoding the original; Pillow
+# and numpy release the GIL while reading, decoding and reducing, so images overlap.
+# At most `concurrency` images are scored but not yet consumed at any time, which also
+# bounds memory. Results stream out in completion order, not directory order.
+#
+#   async for path, result in score_directory("screenshots", concurrency=32): ...
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+DEFAULT_CONCURRENCY = 32
+
+_DONE = object()
+
+
+def scan_images(directory: str) -> List[Tuple[str, int]]:
+    # (path, size) for every image file, in name order
+    images = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file():
+                images.append((entry.path, entry.stat().st_size))
+    images.sort()
+    return images
+
+
+async def score_directory(directory: str = SCREENSHOTS_DIR, concurrency: int = DEFAULT_CONCURRENCY,
+                          workers: Optional[int] = None,
+                          analyzer: ProfessionalVisionAnalyzer = None) -> AsyncIterator[Tuple[str, dict]]:
+    analyzer = analyzer or ProfessionalVisionAnalyzer()
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(workers or os.cpu_count() or 1, thread_name_prefix="vision")
+    slots = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    tasks = set()
+
+    async def score_one(path: str, size: int):
+        try:
+            result = await loop.run_in_executor(pool, analyzer.analyze_image, path, size)
+            await results.put((path, result))
+        except BaseException:
+            slots.release()
+            raise
+
+    async def produce():
+        try:
+            for path, size in await loop.run_in_executor(pool, scan_images, directory):
+                await slots.acquire()
+                task = asyncio.ensure_future(score_one(path, size))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            # Also on failure, so the consumer stops waiting and `await producer` re-raises
+            results.put_nowait(_DONE)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await results.get()
+            if item is _DONE:
+                break
+            # The slot is held until the result is consumed, so a slow consumer stops new reads
+            slots.release()
+            yield item
+        await producer
+    finally:
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+        pool.shutdown(wait=False)
+
+
+async def _write_jsonl(directory: str, concurrency: int, out) -> int:
+    count = 0
+    async for path, result in score_directory(directory, concurrency):
+        out.write(json.dumps({"type": "vision", "input": os.path.relpath(path, BACKEND_DIR), "result": result}) + "\n")
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    # Rescore a screenshot directory, one JSON line per image as soon as it is done:
+    #   python async_vision_scoring.py [directory] [concurrency] > rescored.jsonl
+    directory = sys.argv[1] if len(sys.argv) > 1 else SCREENSHOTS_DIR
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CONCURRENCY
+    scored = asyncio.run(_write_jsonl(directory, concurrency, sys.stdout))
+    sys.stderr.write(f"[vision] scored {scored} images\n")
@@ -0,0 +1,188 @@
+import sys
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from bio_score_fast import SCORER_VERSION, ProfessionalBioAnalyzer, keyword_roles, read_bios_jsonl
+
+# Stored bio scores with a keyword -> bio inverted index, for incremental rescoring.
+#
+#   meta(key TEXT PRIMARY KEY, value TEXT)           scorer version, keyword tables, rules (JSON)
+#   bios(id TEXT PRIMARY KEY, text TEXT, text_lower TEXT, result TEXT)
+#   postings(keyword TEXT, bio_id TEXT)               PRIMARY KEY (keyword, bio_id)
+#
+# After the keyword tables in scoring_rules.py are edited, sync() compares the stored
+# tables with the analyzer's through keyword_roles(): only keywords that were added,
+# removed, moved or reweighted can change a score, and only bios containing one of them
+# are re-run through analyze_bio. Bios for an existing keyword come from its postings;
+# bios for a newly added keyword are found with a substring scan of the stored
+# lowercased texts (SQLite instr), still far cheaper than rescoring. Every other
+# result is carried forward. The other scoring rules (weights, caps, thresholds,
+# recommendations) apply to every bio, so a change there - like a SCORER_VERSION
+# bump - rescores everything.
+#
+#   python bio_index.py add bios.jsonl     -> score and index bios ({"id", "bio"} lines)
+#   python bio_index.py sync               -> rescore what the current tables changed
+#   python bio_index.py export > out.jsonl
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_PATH = os.path.join(BACKEND_DIR, "cache", "bio_index.db")
+
+BATCH_SIZE = 500
+
+
+class BioIndex:
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, analyzer: ProfessionalBioAnalyzer = None):
+        self.path = path
+        self.analyzer = analyzer or ProfessionalBioAnalyzer()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS bios (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                text_lower TEXT NOT NULL,
+                result TEXT NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                keyword TEXT NOT NULL,
+                bio_id TEXT NOT NULL,
+                PRIMARY KEY (keyword, bio_id)
+            ) WITHOUT ROWID
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS postings_bio ON postings (bio_id)")
+        self._db.commit()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _write_meta(self, tables_json: str, rules_json: str):
+        self._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                             [("scorer_version", SCORER_VERSION), ("tables", tables_json), ("rules", rules_json)])
+
+    def _rules(self, tables: List) -> Dict:
+        # scoring_rules without the keyword tables (those are compared keyword by keyword)
+        table_ids = {id(table) for table in tables}
+        return {name: rule for name, rule in self.analyzer.scoring_rules.items() if id(rule) not in table_ids}
+
+    def _store(self, records: List[Tuple[str, str]]):
+        # Score, then replace each bio's row and postings
+        rows = []
+        postings = []
+        for bio_id, text in records:
+            rows.append((bio_id, text, text.lower(), json.dumps(self.analyzer.analyze_bio(text))))
+            postings.extend((keyword, bio_id) for keyword in self.analyzer.keyword_hits(text))
+        self._db.executemany("DELETE FROM postings WHERE bio_id = ?", [(bio_id,) for bio_id, _ in records])
+        self._db.executemany("INSERT OR REPLACE INTO bios VALUES (?, ?, ?, ?)", rows)
+        self._db.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+
+    def add(self, records: Iterable[Tuple[object, str]]) -> int:
+        # records: (id, bio text); an existing id is rescored with the new text
+        self.sync()
+        count = 0
+        batch = []
+        for bio_id, text in records:
+            batch.append((str(bio_id), text or ""))
+            if len(batch) >= BATCH_SIZE:
+                self._store(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._store(batch)
+            count += len(batch)
+        self._db.commit()
+        return count
+
+    def affected_bios(self, keywords: Iterable[str], indexed: Set[str]) -> Set[str]:
+        # Bios containing any of the keywords; indexed: the vocabulary the postings were built with
+        affected = set()
+        for keyword in keywords:
+            if keyword in indexed:
+                query = "SELECT bio_id FROM postings WHERE keyword = ?"
+            else:
+                query = "SELECT id FROM bios WHERE instr(text_lower, ?) > 0"
+            affected.update(bio_id for bio_id, in self._db.execute(query, (keyword,)))
+        return affected
+
+    def sync(self) -> Dict:
+        # Bring stored results up to date with the analyzer's tables
+        tables = self.analyzer.keyword_tables()
+        tables_json = json.dumps(tables)
+        rules_json = json.dumps(self._rules(tables), sort_keys=True)
+        stored_tables = self._meta("tables")
+        total = self._db.execute("SELECT COUNT(*) FROM bios").fetchone()[0]
+        changed: Optional[Set[str]] = set()
+
+        if self._meta("scorer_version") not in (None, SCORER_VERSION) or \
+                (stored_tables is not None and self._meta("rules") != rules_json):
+            changed = None
+            affected = [bio_id for bio_id, in self._db.execute("SELECT id FROM bios")]
+        elif stored_tables is None or stored_tables == tables_json:
+            affected = []
+        else:
+            old_roles = keyword_roles(json.loads(stored_tables))
+            new_roles = keyword_roles(tables)
+            changed = {keyword for keyword in old_roles.keys() | new_roles.keys()
+                       if old_roles.get(keyword) != new_roles.get(keyword)}
+            affected = sorted(self.affected_bios(changed, old_roles.keys()))
+
+        for start in range(0, len(affected), BATCH_SIZE):
+            ids = affected[start:start + BATCH_SIZE]
+            placeholders = ",".join("?" * len(ids))
+            records = self._db.execute(f"SELECT id, text FROM bios WHERE id IN ({placeholders})", ids).fetchall()
+            self._store(records)
+
+        self._write_meta(tables_json, rules_json)
+        self._db.commit()
+        return {
+            "bios": total,
+            "changed_keywords": sorted(changed) if changed is not None else "all",
+            "rescored": len(affected),
+            "carried_forward": total - len(affected)
+        }
+
+    def result(self, bio_id) -> Optional[Dict]:
+        row = self._db.execute("SELECT result FROM bios WHERE id = ?", (str(bio_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def results(self) -> Iterator[Tuple[str, Dict]]:
+        for bio_id, result in self._db.execute("SELECT id, result FROM bios ORDER BY id"):
+            yield bio_id, json.loads(result)
+
+    def stats(self) -> Dict:
+        bios, = self._db.execute("SELECT COUNT(*) FROM bios").fetchone()
+        postings, keywords = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT keyword) FROM postings").fetchone()
+        return {"bios": bios, "postings": postings, "keywords": keywords}
+
+    def close(self):
+        self._db.close()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "sync"
+    index = BioIndex()
+    if command == "add":
+        source = sys.argv[2] if len(sys.argv) > 2 else "-"
+        if source == "-":
+            added = index.add(read_bios_jsonl(sys.stdin))
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                added = index.add(read_bios_jsonl(f))
+        print(json.dumps(dict(index.stats(), added=added)))
+    elif command == "export":
+        for bio_id, result in index.results():
+            print(json.dumps({"id": bio_id, "result": result}))
+    elif command == "stats":
+        print(json.dumps(index.stats()))
+    else:
+        print(json.dumps(index.sync()))
+    index.close()
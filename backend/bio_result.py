@@ -0,0 +1,324 @@
+import sys
+import json
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bio_score_fast import RECOMMENDATIONS, ProfessionalBioAnalyzer, read_bios_jsonl
+from language_detect import DEFAULT_LANGUAGE, STOPWORDS
+
+# Compact bio results and a length-prefixed binary wire format.
+#
+# BioResult keeps one analyze_bio result in 12 slots: scores as integer tenths, labels
+# as small integer codes into a shared Codebook, key_indicators as a bitmask. to_dict()
+# rebuilds the usual dict only when someone asks for it.
+#
+# Wire format (little-endian), a stream of frames:
+#
+#   frame    := u32 length | u8 kind | payload          (length counts kind + payload)
+#   CODEBOOK    kind 0, payload = UTF-8 JSON {field: [label, ...]}; sent first and again
+#               whenever a new label is coded, so the decoder's copy is always current
+#   BIO         kind 1, payload = u32 id | RECORD
+#   JSON        kind 2, payload = u32 id | UTF-8 JSON (results that have no compact form)
+#   ERROR       kind 3, payload = u32 id | UTF-8 message
+#
+#   RECORD   := u8 pitch | u8 urgency | u8 credibility | u8 contact   (tenths)
+#               f64 business_confidence | f64 revenue_potential
+#               u8 business_type | u8 language | u16 region | u8 region_value
+#               u8 recommendation | u16 key_indicators bitmask       (28 bytes)
+#
+# The record bounds the codebook: at most 256 labels per u8 field, 65536 regions and 16
+# key indicators. A result with a label past its field's limit (or a score outside
+# 0-25.5) has no compact form; FrameWriter sends it as a JSON frame instead.
+#
+# scoring_worker.js decodes the same layout (decodeBioRecord).
+
+FRAME_CODEBOOK = 0
+FRAME_BIO = 1
+FRAME_JSON = 2
+FRAME_ERROR = 3
+
+NO_ID = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<IB")
+_ID = struct.Struct("<I")
+_RECORD = struct.Struct("<BBBBddBBHBBH")
+
+LABEL_FIELDS = ("business_type", "language", "region", "region_value", "recommendation", "key_indicators")
+# Codes each field can hold in RECORD (key_indicators: bits of the u16 mask)
+CODE_LIMITS = {"business_type": 256, "language": 256, "region": 65536, "region_value": 256,
+               "recommendation": 256, "key_indicators": 16}
+TENTHS_LIMIT = 255
+
+
+class Codebook:
+    def __init__(self, labels: Dict[str, List[str]]):
+        self.labels = {field: list(labels.get(field, [])) for field in LABEL_FIELDS}
+        self._codes = {field: {label: code for code, label in enumerate(values)} for field, values in self.labels.items()}
+        self.version = 0
+
+    @classmethod
+    def from_analyzer(cls, analyzer: ProfessionalBioAnalyzer) -> "Codebook":
+        # Every label the analyzer's tables can produce; anything else is added on first use
+        return cls({
+            "business_type": ["Unknown", "General Business"] + [
+                business_type.replace("_", " ").title() for business_type in analyzer.business_keywords
+            ],
+            "language": [DEFAULT_LANGUAGE] + [language for language in STOPWORDS if language != DEFAULT_LANGUAGE],
+            "region": ["Unknown"] + [keyword.title() for data in analyzer.regions.values() for keyword in data["keywords"]],
+            "region_value": ["Standard"] + [region_type.replace("_", " ").title() for region_type in analyzer.regions],
+            "recommendation": list(RECOMMENDATIONS.values()),
+            "key_indicators": list(analyzer.key_indicators)
+        })
+
+    def code(self, field: str, label: str) -> int:
+        # ValueError once the field has no code left for a new label
+        code = self._codes[field].get(label)
+        if code is None:
+            if len(self.labels[field]) >= CODE_LIMITS[field]:
+                raise ValueError(f"Codebook field {field} is full ({CODE_LIMITS[field]} labels)")
+            code = self._codes[field][label] = len(self.labels[field])
+            self.labels[field].append(label)
+            self.version += 1
+        return code
+
+    def to_json(self) -> str:
+        return json.dumps(self.labels)
+
+
+class BioResult:
+    __slots__ = ("codebook", "pitch_tenths", "urgency_tenths", "credibility_tenths", "contact_tenths",
+                 "business_confidence", "revenue_potential", "business_type", "language", "region",
+                 "region_value", "recommendation", "indicators")
+
+    def __init__(self, codebook: Codebook, pitch_tenths: int, urgency_tenths: int, credibility_tenths: int,
+                 contact_tenths: int, business_confidence: float, revenue_potential: float, business_type: int,
+                 language: int, region: int, region_value: int, recommendation: int, indicators: int):
+        self.codebook = codebook
+        self.pitch_tenths = pitch_tenths
+        self.urgency_tenths = urgency_tenths
+        self.credibility_tenths = credibility_tenths
+        self.contact_tenths = contact_tenths
+        self.business_confidence = business_confidence
+        self.revenue_potential = revenue_potential
+        self.business_type = business_type
+        self.language = language
+        self.region = region
+        self.region_value = region_value
+        self.recommendation = recommendation
+        self.indicators = indicators
+
+    @classmethod
+    def from_dict(cls, result: Dict, codebook: Codebook) -> "BioResult":
+        # ValueError when the result does not fit RECORD
+        indicators = 0
+        for label in result["key_indicators"]:
+            indicators |= 1 << codebook.code("key_indicators", label)
+        # Scores are already rounded to tenths, so k / 10 gives back the same float
+        tenths = [round(result[name] * 10) for name in
+                  ("pitch_score", "urgency_score", "credibility_score", "contact_readiness")]
+        if not all(0 <= value <= TENTHS_LIMIT for value in tenths):
+            raise ValueError(f"Scores {tenths} (tenths) do not fit the compact record")
+        return cls(
+            codebook,
+            *tenths,
+            result["business_confidence"],
+            result["revenue_potential"],
+            codebook.code("business_type", result["business_type"]),
+            codebook.code("language", result["language"]),
+            codebook.code("region", result["region"]),
+            codebook.code("region_value", result["region_value"]),
+            codebook.code("recommendation", result["recommendation"]),
+            indicators
+        )
+
+    @property
+    def pitch_score(self) -> float:
+        return self.pitch_tenths / 10
+
+    @property
+    def urgency_score(self) -> float:
+        return self.urgency_tenths / 10
+
+    def to_dict(self) -> Dict:
+        labels = self.codebook.labels
+        return {
+            "pitch_score": self.pitch_tenths / 10,
+            "urgency_score": self.urgency_tenths / 10,
+            "credibility_score": self.credibility_tenths / 10,
+            "contact_readiness": self.contact_tenths / 10,
+            "business_type": labels["business_type"][self.business_type],
+            "business_confidence": self.business_confidence,
+            "revenue_potential": self.revenue_potential,
+            "language": labels["language"][self.language],
+            "region": labels["region"][self.region],
+            "region_value": labels["region_value"][self.region_value],
+            "key_indicators": [label for code, label in enumerate(labels["key_indicators"]) if self.indicators >> code & 1],
+            "recommendation": labels["recommendation"][self.recommendation]
+        }
+
+    def pack(self) -> bytes:
+        return _RECORD.pack(
+            self.pitch_tenths, self.urgency_tenths, self.credibility_tenths, self.contact_tenths,
+            self.business_confidence, self.revenue_potential, self.business_type, self.language,
+            self.region, self.region_value, self.recommendation, self.indicators
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes, codebook: Codebook, offset: int = 0) -> "BioResult":
+        return cls(codebook, *_RECORD.unpack_from(data, offset))
+
+    def __repr__(self) -> str:
+        return f"BioResult({self.to_dict()!r})"
+
+
+def score_bios_compact(bios: Iterable[str], analyzer: ProfessionalBioAnalyzer = None,
+                       codebook: Codebook = None) -> Iterator[BioResult]:
+    analyzer = analyzer or ProfessionalBioAnalyzer()
+    codebook = codebook or Codebook.from_analyzer(analyzer)
+    for bio_text in bios:
+        yield BioResult.from_dict(analyzer.analyze_bio(bio_text), codebook)
+
+
+def score_bios_binary(stream, out: BinaryIO, analyzer: ProfessionalBioAnalyzer = None) -> int:
+    # Batch path: JSONL bios in (see bio_score_fast.read_bios_jsonl), one BIO frame per
+    # bio out; frame ids are input positions (0-based), since JSONL ids need not be numbers
+    # (an invalid line gets an ERROR frame at its position, so later ids do not shift)
+    analyzer = analyzer or ProfessionalBioAnalyzer()
+    writer = FrameWriter(out, Codebook.from_analyzer(analyzer))
+    position = 0
+
+    def invalid(line_number: int, message: str):
+        nonlocal position
+        writer.write_error(position, f"line {line_number}: {message}")
+        position += 1
+
+    for _, bio_text in read_bios_jsonl(stream, invalid):
+        writer.write_bio(position, analyzer.analyze_bio(bio_text))
+        position += 1
+    writer.flush()
+    return position
+
+
+def _frame(kind: int, payload: bytes) -> bytes:
+    return _HEADER.pack(len(payload) + 1, kind) + payload
+
+
+class FrameWriter:
+    def __init__(self, stream: BinaryIO, codebook: Codebook):
+        self.stream = stream
+        self.codebook = codebook
+        self._sent_version = None
+
+    def _sync_codebook(self):
+        if self._sent_version != self.codebook.version:
+            self.stream.write(_frame(FRAME_CODEBOOK, self.codebook.to_json().encode("utf-8")))
+            self._sent_version = self.codebook.version
+
+    def write_bio(self, request_id: int, result: Dict):
+        # Coding the labels may extend the codebook, so it is synced after encoding
+        try:
+            record = BioResult.from_dict(result, self.codebook).pack()
+        except ValueError:
+            self.write_json(request_id, result)
+            return
+        self._sync_codebook()
+        self.stream.write(_frame(FRAME_BIO, _ID.pack(request_id) + record))
+
+    def write_json(self, request_id: int, result: Dict):
+        self.stream.write(_frame(FRAME_JSON, _ID.pack(request_id) + json.dumps(result).encode("utf-8")))
+
+    def write_error(self, request_id: int, message: str):
+        self.stream.write(_frame(FRAME_ERROR, _ID.pack(request_id) + message.encode("utf-8")))
+
+    def flush(self):
+        self._sync_codebook()
+        self.stream.flush()
+
+
+def read_frames(stream: BinaryIO) -> Iterator[Tuple[int, int, object]]:
+    # (kind, id, value): value is a dict for BIO/JSON frames, the message for ERROR frames;
+    # CODEBOOK frames are consumed here and not yielded
+    codebook: Optional[Codebook] = None
+    while True:
+        header = stream.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        length, kind = _HEADER.unpack(header)
+        payload = stream.read(length - 1)
+        if kind == FRAME_CODEBOOK:
+            codebook = Codebook(json.loads(payload))
+            continue
+        request_id = _ID.unpack_from(payload)[0]
+        if kind == FRAME_BIO:
+            yield kind, request_id, BioResult.unpack(payload, codebook, _ID.size).to_dict()
+        elif kind == FRAME_JSON:
+            yield kind, request_id, json.loads(payload[_ID.size:])
+        else:
+            yield kind, request_id, payload[_ID.size:].decode("utf-8")
+
+
+def compare_formats(path: str) -> Dict:
+    # Memory, size and encode/decode time of dict/JSON vs compact/binary for a JSONL of bios
+    import io
+    import time
+    import tracemalloc
+
+    with open(path, "r", encoding="utf-8") as f:
+        bios = [bio for _, bio in read_bios_jsonl(f)]
+    analyzer = ProfessionalBioAnalyzer()
+    results = [analyzer.analyze_bio(bio) for bio in bios]
+    codebook = Codebook.from_analyzer(analyzer)
+
+    tracemalloc.start()
+    dicts = [dict(result, key_indicators=list(result["key_indicators"])) for result in results]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dicts
+    tracemalloc.start()
+    compact = [BioResult.from_dict(result, codebook) for result in results]
+    compact_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del compact
+
+    started = time.perf_counter()
+    text = "".join(json.dumps({"id": i, "result": result}) + "\n" for i, result in enumerate(results))
+    json_encode = time.perf_counter() - started
+    started = time.perf_counter()
+    decoded = [json.loads(line) for line in text.splitlines()]
+    json_decode = time.perf_counter() - started
+    del decoded
+
+    buffer = io.BytesIO()
+    writer = FrameWriter(buffer, codebook)
+    started = time.perf_counter()
+    for i, result in enumerate(results):
+        writer.write_bio(i, result)
+    writer.flush()
+    binary_encode = time.perf_counter() - started
+    buffer.seek(0)
+    started = time.perf_counter()
+    frames = list(read_frames(buffer))
+    binary_decode = time.perf_counter() - started
+
+    assert [value for _, _, value in frames] == results
+    return {
+        "results": len(results),
+        "memory_bytes": {"dicts": dict_bytes, "compact": compact_bytes},
+        "wire_bytes": {"json": len(text.encode("utf-8")), "binary": buffer.getbuffer().nbytes},
+        "encode_ms": {"json": round(json_encode * 1000, 1), "binary": round(binary_encode * 1000, 1)},
+        "decode_ms": {"json": round(json_decode * 1000, 1), "binary": round(binary_decode * 1000, 1)}
+    }
+
+
+if __name__ == "__main__":
+    #   python bio_result.py --jsonl [bios.jsonl | -] > results.bin
+    #   python bio_result.py --compare bios.jsonl
+    if len(sys.argv) > 2 and sys.argv[1] == "--compare":
+        print(json.dumps(compare_formats(sys.argv[2]), indent=2))
+    else:
+        source = sys.argv[2] if len(sys.argv) > 2 else "-"
+        if source == "-":
+            score_bios_binary(sys.stdin, sys.stdout.buffer)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                score_bios_binary(f, sys.stdout.buffer)
@@ -1,282 +1,498 @@
+from __future__ import annotations
+
 import sys
-import json
-import re
-from typing import Dict, List, Tuple
+import os
+import marshal
+
+from keyword_matcher import COMPILE_AFTER_CALLS, KeywordMatcher
+from scoring_rules import RULES, compile_bio_fast, copy_rules
+
+# typing (and json/re, hashlib/array/numpy, language_detect and scoring_metrics below)
+# are imported only where needed: the Node scrapers start this script once per bio, so
+# import time is most of its runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+
+CONTACT_SYMBOLS = frozenset(["@", "📧"])
+
+class _PhonePattern:
+    # The phone regex, compiled on first use: importing re (and enum with it) costs a
+    # one-shot run more than scoring does. A bio with fewer than ten digits cannot
+    # match, so like KeywordMatcher the first few searches get by without the regex
+    pattern = r'\d{3}[-.]?\d{3}[-.]?\d{4}'
 
-class ProfessionalBioAnalyzer:
     def __init__(self):
-        # Business type keywords with confidence scoring
-        self.business_keywords = {
-            "fitness": {
-                "keywords": ["trainer", "fitness", "gym", "workout", "personal training", "crossfit", "yoga", "pilates", "nutrition", "bodybuilding", "coach", "athlete"],
-                "high_value": ["certified trainer", "nutrition coach", "fitness coach", "personal trainer"],
-                "revenue_potential": 8.5
-            },
-            "beauty": {
-                "keywords": ["barber", "hair", "salon", "beauty", "makeup", "nails", "lashes", "brows", "aesthetics", "skincare"],
-                "high_value": ["master barber", "certified", "licensed", "award winning"],
-                "revenue_potential": 7.5
-            },
-            "photography": {
-                "keywords": ["photographer", "photography", "photos", "wedding", "portrait", "commercial", "headshots"],
-                "high_value": ["wedding photographer", "commercial photographer", "award winning"],
-                "revenue_potential": 8.0
-            },
-            "food_service": {
-                "keywords": ["chef", "catering", "restaurant", "food", "culinary", "bakery", "cafe", "meal prep"],
-                "high_value": ["executive chef", "catering company", "restaurant owner"],
-                "revenue_potential": 7.0
-            },
-            "real_estate": {
-                "keywords": ["realtor", "real estate", "broker", "property", "homes", "listings"],
-                "high_value": ["top producer", "million dollar", "luxury homes"],
-                "revenue_potential": 9.5
-            },
-            "consulting": {
-                "keywords": ["consultant", "coaching", "business coach", "mentor", "advisor", "strategy"],
-                "high_value": ["business consultant", "executive coach", "strategy consultant"],
-                "revenue_potential": 9.0
-            },
-            "healthcare": {
-                "keywords": ["doctor", "dentist", "therapist", "clinic", "medical", "health", "wellness"],
-                "high_value": ["md", "dds", "licensed therapist", "clinic owner"],
-                "revenue_potential": 9.5
-            },
-            "legal": {
-                "keywords": ["lawyer", "attorney", "law firm", "legal", "paralegal"],
-                "high_value": ["partner", "law firm", "attorney"],
-                "revenue_potential": 9.5
-            },
-            "marketing": {
-                "keywords": ["marketing", "social media", "advertising", "branding", "digital marketing", "seo"],
-                "high_value": ["marketing agency", "digital marketing", "brand strategist"],
-                "revenue_potential": 8.5
-            },
-            "ecommerce": {
-                "keywords": ["ecommerce", "online store", "shopify", "amazon", "dropshipping", "retail"],
-                "high_value": ["7 figure", "8 figure", "million", "successful"],
-                "revenue_potential": 8.0
-            }
-        }
-        
-        # Urgency and action indicators
-        self.urgency_indicators = {
-            "high": ["book now", "call today", "limited time", "urgent", "asap", "immediate", "hurry"],
-            "medium": ["dm me", "message me", "contact", "reach out", "get in touch"],
-            "low": ["available", "open", "accepting"]
-        }
-        
-        # Professional credibility indicators
-        self.credibility_indicators = {
-            "certifications": ["certified", "licensed", "accredited", "board certified", "diploma"],
-            "achievements": ["award", "winner", "top", "best", "featured", "published", "recognized"],
-            "experience": ["years", "decade", "veteran", "expert", "specialist", "master"],
-            "scale": ["company", "agency", "firm", "corporation", "llc", "inc"]
-        }
-        
-        # Contact readiness indicators
-        self.contact_indicators = {
-            "direct": ["dm", "text", "call", "email", "whatsapp", "telegram"],
-            "booking": ["book", "schedule", "appointment", "consultation", "meeting"],
-            "social_proof": ["reviews", "testimonials", "clients", "customers", "satisfied"]
+        self._compiled = None
+        self._calls = 0
+
+    def search(self, text: str):
+        if self._compiled is None:
+            self._calls += 1
+            if self._calls <= COMPILE_AFTER_CALLS and sum(map(str.isdecimal, text)) < 10:
+                return None
+            import re
+            self._compiled = re.compile(self.pattern)
+        return self._compiled.search(text)
+
+PHONE_PATTERN = _PhonePattern()
+
+# Bump when scoring logic changes so cached results are not reused (score_cache.py)
+SCORER_VERSION = "bio_score_fast/2"
+
+# Memo size used by the shared analyzer (score_bio_fast / score_bios_fast)
+DEFAULT_MEMO_SIZE = 10000
+
+# business_type codes in bulk (columnar) output; real types follow in table order
+BULK_UNKNOWN = 0
+BULK_GENERAL_BUSINESS = 1
+
+# Methods timed when scoring_metrics is enabled (the compiled rules report as bio.rules)
+METRIC_STAGES = ("analyze_bio", "analyze_bios", "analyze_bios_bulk", "_score_bio")
+
+# Every recommendation analyze_bio can return (bio_result.py encodes them as codes)
+RECOMMENDATIONS = {
+    "hot": "🔥 HOT LEAD - Contact immediately! High-value prospect with strong indicators.",
+    "warm": "🌟 WARM LEAD - Strong potential, reach out within 24 hours.",
+    "qualified": "💼 QUALIFIED LEAD - Good business potential, add to nurture sequence.",
+    "high_value_industry": "💎 HIGH-VALUE INDUSTRY - Lower engagement but high revenue potential.",
+    "standard": "📋 STANDARD LEAD - Basic qualification, consider for mass outreach.",
+    "insufficient_data": "❌ INSUFFICIENT DATA - Bio too short or empty."
+}
+
+# Precompiled keyword matcher, rebuilt whenever the keyword tables change. marshal's
+# format is tied to the interpreter version, which is part of the file name.
+MATCHER_ARTIFACT_VERSION = 2
+MATCHER_ARTIFACT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache",
+    f"bio_tables_v{MATCHER_ARTIFACT_VERSION}_py{sys.version_info[0]}{sys.version_info[1]}.marshal"
+)
+
+def _read_artifact() -> Dict:
+    try:
+        with open(MATCHER_ARTIFACT_PATH, "rb") as f:
+            artifact = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    return artifact if isinstance(artifact, dict) else {}
+
+def _write_artifact(artifact: Dict):
+    try:
+        os.makedirs(os.path.dirname(MATCHER_ARTIFACT_PATH), exist_ok=True)
+        tmp_path = f"{MATCHER_ARTIFACT_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(artifact, f)
+        os.replace(tmp_path, MATCHER_ARTIFACT_PATH)
+    except OSError:
+        pass  # read-only checkout: keep working without the artifact
+
+def _load_matcher(artifact: Dict, tables_key: str, vocabulary: Set[str]) -> KeywordMatcher:
+    # tables_key is repr() of the keyword tables; an exact string comparison is cheaper
+    # than hashing and cannot produce a false match. A rebuilt matcher goes into artifact.
+    if artifact.get("tables") == tables_key:
+        try:
+            return KeywordMatcher.from_state(artifact["matcher"])
+        except (ValueError, TypeError, KeyError):
+            pass
+
+    matcher = KeywordMatcher(vocabulary)
+    artifact["tables"] = tables_key
+    artifact["matcher"] = matcher.to_state()
+    return matcher
+
+def _add_repeated(total: float, step: float, count: int) -> float:
+    # Repeated addition (not step * count) keeps scores bit-identical to per-keyword accumulation
+    for _ in range(count):
+        total += step
+    return total
+
+def _accumulation_table(start: float, steps: List[Tuple[float, int]]):
+    # table[c1, c2, ...] = start + step1 added c1 times + step2 added c2 times + ... (in that order)
+    import numpy as np
+    table = np.zeros(tuple(limit + 1 for _, limit in steps))
+    for index in np.ndindex(*table.shape):
+        total = start
+        for (step, _), count in zip(steps, index):
+            total = _add_repeated(total, step, count)
+        table[index] = total
+    return table
+
+def _round_tenths(values):
+    # Same result as round(value, 1) on each element (numpy's own rounding can differ by one ulp)
+    import numpy as np
+    return np.array([round(value, 1) for value in values.tolist()])
+
+def keyword_roles(tables: List) -> Dict[str, Tuple]:
+    # keyword -> every table setting that affects a bio containing it, for tables laid out
+    # like ProfessionalBioAnalyzer.keyword_tables(). A bio's score is a function of its
+    # keyword hits and their roles, so after a table edit only bios containing a keyword
+    # whose roles differ can score differently (bio_index.py). Positions are included
+    # wherever table order decides ties or output order.
+    business, urgency, credibility, contact, regions, key_indicators = tables
+    roles: Dict[str, List[Tuple]] = {}
+
+    def add(keyword: str, role: Tuple):
+        roles.setdefault(keyword, []).append(role)
+
+    for position, (business_type, data) in enumerate(business.items()):
+        for keyword in data["keywords"]:
+            add(keyword, ("business", position, business_type, "keywords", data["revenue_potential"]))
+        for keyword in data["high_value"]:
+            add(keyword, ("business", position, business_type, "high_value", data["revenue_potential"]))
+    for name, table in (("urgency", urgency), ("credibility", credibility), ("contact", contact)):
+        for category, keywords in table.items():
+            for keyword in keywords:
+                add(keyword, (name, category))
+    for position, (region_type, data) in enumerate(regions.items()):
+        for rank, keyword in enumerate(data["keywords"]):
+            add(keyword, ("region", position, region_type, rank, data["multiplier"]))
+    for position, (label, keywords) in enumerate(key_indicators.items()):
+        for keyword in keywords:
+            add(keyword, ("indicator", position, label))
+    for symbol in CONTACT_SYMBOLS:
+        add(symbol, ("contact_symbol",))
+
+    return {keyword: tuple(sorted(keyword_roles, key=repr)) for keyword, keyword_roles in roles.items()}
+
+_language_detector = None
+
+def _detect_language(bio_lower: str) -> str:
+    # language_detect is imported by the first bio that needs a language
+    global _language_detector
+    if _language_detector is None:
+        from language_detect import detect_language
+        _language_detector = detect_language
+    return _language_detector(bio_lower)
+
+def _metrics_enabled() -> bool:
+    # scoring_metrics is imported only when instrumentation can be on: something already
+    # loaded it (enable(), --metrics) or SCORING_METRICS is set
+    if "scoring_metrics" not in sys.modules and not os.environ.get("SCORING_METRICS"):
+        return False
+    import scoring_metrics
+    return scoring_metrics.enabled()
+
+class ProfessionalBioAnalyzer:
+    def __init__(self, memo_size: int = 0):
+        # Keyword tables and the weights, caps and thresholds applied to them
+        # (scoring_rules.py); edit the tables, then call reload_tables()
+        self.scoring_rules = copy_rules(RULES["bio_score_fast"])
+        self.business_keywords = self.scoring_rules["business_keywords"]
+        self.urgency_indicators = self.scoring_rules["urgency_indicators"]
+        self.credibility_indicators = self.scoring_rules["credibility_indicators"]
+        self.contact_indicators = self.scoring_rules["contact_indicators"]
+        self.regions = self.scoring_rules["regions"]
+        self.key_indicators = self.scoring_rules["key_indicators"]
+
+        # Optional LRU memo of results, keyed by (table fingerprint, lowercased bio);
+        # without one (the one-shot CLI) collections is never imported
+        self.memo_size = memo_size
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._memo: Dict[Tuple[str, str], Dict] = {}
+        if memo_size:
+            from collections import OrderedDict
+            self._memo = OrderedDict()
+
+        self._compile_tables()
+
+    def reload_tables(self):
+        # Call after editing any keyword table or scoring_rules weight: recompiles the
+        # matcher and rules and changes the fingerprint, so memoized results from the old
+        # tables can no longer be hit
+        self._compile_tables()
+
+    def _compile_tables(self):
+        self._tables_fingerprint = None
+
+        # Fold every keyword table into one matcher so each bio is scanned once
+        vocabulary = set()
+        for data in self.business_keywords.values():
+            vocabulary.update(data["keywords"], data["high_value"])
+        for table in (self.urgency_indicators, self.credibility_indicators, self.contact_indicators, self.key_indicators):
+            for keywords in table.values():
+                vocabulary.update(keywords)
+        for data in self.regions.values():
+            vocabulary.update(data["keywords"])
+        vocabulary.update(CONTACT_SYMBOLS)
+
+        artifact = _read_artifact()
+        stored = artifact.get("tables")
+        self._matcher = _load_matcher(artifact, repr(self.keyword_tables()), vocabulary)
+
+        # Frozen copies of each keyword list, so per-category hit counts are C-level set intersections
+        self._business_sets = {
+            business_type: (frozenset(data["keywords"]), frozenset(data["high_value"]))
+            for business_type, data in self.business_keywords.items()
         }
-        
-        # Geographic regions with market value
-        self.regions = {
-            "high_value": {
-                "keywords": ["manhattan", "beverly hills", "silicon valley", "miami beach", "soho"],
-                "multiplier": 1.5
-            },
-            "major_cities": {
-                "keywords": ["nyc", "new york", "los angeles", "chicago", "miami", "san francisco", "boston", "seattle"],
-                "multiplier": 1.3
-            },
-            "medium_cities": {
-                "keywords": ["atlanta", "dallas", "houston", "phoenix", "denver", "austin"],
-                "multiplier": 1.1
-            }
+        self._urgency_sets = {level: frozenset(keywords) for level, keywords in self.urgency_indicators.items()}
+        self._credibility_sets = {category: frozenset(keywords) for category, keywords in self.credibility_indicators.items()}
+        self._contact_sets = {category: frozenset(keywords) for category, keywords in self.contact_indicators.items()}
+        self._region_vocabulary = {
+            region_type: frozenset(data["keywords"]) for region_type, data in self.regions.items()
         }
+        self._bulk_cache = None
+
+        if artifact["tables"] != stored:
+            _write_artifact(artifact)
+
+        # Every rule applied to a bio's keyword hits, as one generated function (loaded
+        # from scoring_rules' own artifact while the tables are unchanged). The rules call
+        # language detection inline, so with metrics on it is passed in as its own timed
+        # stage (externals are not part of the cache key)
+        metrics_enabled = _metrics_enabled()
+        detect_language = _detect_language
+        if metrics_enabled:
+            import scoring_metrics
+            detect_language = scoring_metrics.metrics.timed("bio.detect_language", _detect_language)
+        self._score_rules = compile_bio_fast(self.keyword_tables(), self.scoring_rules, RECOMMENDATIONS,
+                                             CONTACT_SYMBOLS, PHONE_PATTERN, detect_language)
+
+        if metrics_enabled:
+            self._instrument()
+
+    def _instrument(self):
+        import scoring_metrics
+        metrics = scoring_metrics.metrics
+        metrics.instrument(self, "bio", METRIC_STAGES)
+        self._score_rules = metrics.timed("bio.rules", self._score_rules)
+        self._matcher.find = metrics.timed("bio.keyword_scan", self._matcher.find)
+        if self.memo_size:
+            metrics.register_collector("bio_memo", self.memo_stats)
+
+    def keyword_tables(self) -> List:
+        # Every table that decides scores, in a fixed order (see keyword_roles)
+        return [self.business_keywords, self.urgency_indicators, self.credibility_indicators,
+                self.contact_indicators, self.regions, self.key_indicators]
+
+    @property
+    def tables_fingerprint(self) -> str:
+        # Computed on first use so one-shot CLI runs never import hashlib
+        if self._tables_fingerprint is None:
+            import hashlib
+            import json
+            tables_json = json.dumps([self.keyword_tables(), self.scoring_rules], sort_keys=True)
+            self._tables_fingerprint = hashlib.sha1(tables_json.encode("utf-8")).hexdigest()[:16]
+        return self._tables_fingerprint
+
+    def keyword_hits(self, bio_text: str) -> Set[str]:
+        # Table keywords contained in the bio; analyze_bio's result depends only on these
+        # (plus phone numbers and language, which no table controls)
+        if not isinstance(bio_text, str) or len(bio_text.strip()) < 5:
+            return set()
+        return self._matcher.find(bio_text.lower())
 
     def analyze_bio(self, bio_text: str) -> Dict:
-        if not bio_text or len(bio_text.strip()) < 5:
+        # Anything but a string of 5+ non-blank characters (None, or a number from JSON
+        # input) gets the insufficient-data result
+        if not isinstance(bio_text, str) or len(bio_text.strip()) < 5:
             return self._default_score()
         
         bio_lower = bio_text.lower()
+        if not self.memo_size:
+            return self._score_bio(bio_lower)
         
-        # Core analysis
-        business_analysis = self._analyze_business_type(bio_lower)
-        urgency_score = self._calculate_urgency_score(bio_lower)
-        credibility_score = self._calculate_credibility_score(bio_lower)
-        contact_readiness = self._calculate_contact_readiness(bio_lower)
-        region_analysis = self._analyze_region(bio_lower)
-        language = self._detect_language(bio_lower)
-        
-        # Calculate final pitch score (1-10)
-        base_score = 3.0  # Everyone starts at 3
-        
-        # Business type contribution (0-3 points)
-        base_score += business_analysis["score_contribution"]
-        
-        # Credibility contribution (0-2 points)
-        base_score += credibility_score
-        
-        # Contact readiness (0-2 points)
-        base_score += contact_readiness
-        
-        # Regional multiplier
-        base_score *= region_analysis["multiplier"]
-        
-        # Cap at 10
-        final_pitch_score = min(base_score, 10.0)
+        key = (self.tables_fingerprint, bio_lower)
+        result = self._memo.get(key)
+        if result is None:
+            self.memo_misses += 1
+            result = self._score_bio(bio_lower)
+            self._memo[key] = result
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        else:
+            self.memo_hits += 1
+            self._memo.move_to_end(key)
         
+        # Callers own their result; never hand out the memoized dict itself
+        return dict(result, key_indicators=list(result["key_indicators"]))
+    
+    def memo_stats(self) -> Dict:
         return {
-            "pitch_score": round(final_pitch_score, 1),
-            "urgency_score": round(urgency_score, 1),
-            "credibility_score": round(credibility_score, 1),
-            "contact_readiness": round(contact_readiness, 1),
-            "business_type": business_analysis["type"],
-            "business_confidence": business_analysis["confidence"],
-            "revenue_potential": business_analysis["revenue_potential"],
-            "language": language,
-            "region": region_analysis["region"],
-            "region_value": region_analysis["value"],
-            "key_indicators": self._extract_key_indicators(bio_lower),
-            "recommendation": self._generate_recommendation(final_pitch_score, urgency_score, business_analysis)
+            "size": len(self._memo),
+            "max_size": self.memo_size,
+            "hits": self.memo_hits,
+            "misses": self.memo_misses,
+            "tables_fingerprint": self.tables_fingerprint
         }
     
-    def _analyze_business_type(self, bio_lower: str) -> Dict:
-        best_match = {"type": "General Business", "confidence": 0.1, "score_contribution": 0.5, "revenue_potential": 5.0}
-        
-        for business_type, data in self.business_keywords.items():
-            confidence = 0
-            
-            # Check regular keywords
-            for keyword in data["keywords"]:
-                if keyword in bio_lower:
-                    confidence += 0.3
-            
-            # Check high-value keywords (worth more)
-            for high_value in data["high_value"]:
-                if high_value in bio_lower:
-                    confidence += 0.7
-            
-            if confidence > best_match["confidence"]:
-                best_match = {
-                    "type": business_type.replace("_", " ").title(),
-                    "confidence": min(confidence, 1.0),
-                    "score_contribution": min(confidence * 3, 3.0),
-                    "revenue_potential": data["revenue_potential"]
-                }
-        
-        return best_match
-    
-    def _calculate_urgency_score(self, bio_lower: str) -> float:
-        score = 2.0  # Base urgency
-        
-        for urgency_level, keywords in self.urgency_indicators.items():
-            for keyword in keywords:
-                if keyword in bio_lower:
-                    if urgency_level == "high":
-                        score += 3.0
-                    elif urgency_level == "medium":
-                        score += 2.0
-                    else:
-                        score += 1.0
-        
-        return min(score, 10.0)
-    
-    def _calculate_credibility_score(self, bio_lower: str) -> float:
-        score = 0.0
-        
-        for category, keywords in self.credibility_indicators.items():
-            for keyword in keywords:
-                if keyword in bio_lower:
-                    if category == "certifications":
-                        score += 0.7
-                    elif category == "achievements":
-                        score += 0.6
-                    elif category == "experience":
-                        score += 0.4
-                    elif category == "scale":
-                        score += 0.5
-        
-        return min(score, 2.0)
-    
-    def _calculate_contact_readiness(self, bio_lower: str) -> float:
-        score = 0.0
-        
-        for category, keywords in self.contact_indicators.items():
-            for keyword in keywords:
-                if keyword in bio_lower:
-                    if category == "direct":
-                        score += 0.8
-                    elif category == "booking":
-                        score += 0.7
-                    elif category == "social_proof":
-                        score += 0.5
-        
-        # Check for actual contact info
-        if "@" in bio_lower or "📧" in bio_lower:
-            score += 0.8
-        if re.search(r'\d{3}[-.]?\d{3}[-.]?\d{4}', bio_lower):
-            score += 1.0
-        
-        return min(score, 2.0)
-    
-    def _analyze_region(self, bio_lower: str) -> Dict:
-        for region_type, data in self.regions.items():
-            for keyword in data["keywords"]:
-                if keyword in bio_lower:
-                    return {
-                        "region": keyword.title(),
-                        "value": region_type.replace("_", " ").title(),
-                        "multiplier": data["multiplier"]
-                    }
-        
-        return {"region": "Unknown", "value": "Standard", "multiplier": 1.0}
-    
-    def _detect_language(self, bio_lower: str) -> str:
-        spanish_indicators = ["el", "la", "de", "y", "en", "con", "para", "por", "una", "un", "es", "mi", "tu", "su"]
-        french_indicators = ["le", "la", "et", "un", "une", "des", "pour", "avec", "est", "mon", "ton", "son"]
-        
-        spanish_count = sum(1 for word in spanish_indicators if f" {word} " in f" {bio_lower} ")
-        french_count = sum(1 for word in french_indicators if f" {word} " in f" {bio_lower} ")
-        
-        if spanish_count >= 2:
-            return "Spanish"
-        elif french_count >= 2:
-            return "French"
-        else:
-            return "English"
-    
-    def _extract_key_indicators(self, bio_lower: str) -> List[str]:
-        indicators = []
-        
-        if any(word in bio_lower for word in ["certified", "licensed"]):
-            indicators.append("Certified Professional")
-        if any(word in bio_lower for word in ["dm", "contact", "book"]):
-            indicators.append("Contact Ready")
-        if "@" in bio_lower or "📧" in bio_lower:
-            indicators.append("Email Available")
-        if any(word in bio_lower for word in ["award", "top", "best"]):
-            indicators.append("Award Winner")
-        if any(word in bio_lower for word in ["company", "llc", "inc"]):
-            indicators.append("Business Entity")
-        
-        return indicators
-    
-    def _generate_recommendation(self, pitch_score: float, urgency_score: float, business_analysis: Dict) -> str:
-        if pitch_score >= 8.5 and urgency_score >= 7:
-            return "🔥 HOT LEAD - Contact immediately! High-value prospect with strong indicators."
-        elif pitch_score >= 7 and urgency_score >= 5:
-            return "🌟 WARM LEAD - Strong potential, reach out within 24 hours."
-        elif pitch_score >= 5:
-            return "💼 QUALIFIED LEAD - Good business potential, add to nurture sequence."
-        elif business_analysis["revenue_potential"] >= 8:
-            return "💎 HIGH-VALUE INDUSTRY - Lower engagement but high revenue potential."
-        else:
-            return "📋 STANDARD LEAD - Basic qualification, consider for mass outreach."
+    def _score_bio(self, bio_lower: str) -> Dict:
+        return self._score_rules(bio_lower, self._matcher.find(bio_lower))
     
+    def analyze_bios(self, bios: List[str]) -> List[Dict]:
+        # analyze_bio for a batch, one result per bio in order: each distinct bio is looked
+        # up in the memo once and scored at most once. Misses go through the compiled
+        # rules, not the columnar path: completing its arrays into full result dicts
+        # measured no faster, since keyword matching and language detection dominate
+        # and are per bio either way.
+        results: List[Dict] = [None] * len(bios)
+        misses: Dict[str, List[int]] = {}
+        fingerprint = self.tables_fingerprint if self.memo_size else None
+        for position, bio_text in enumerate(bios):
+            if not isinstance(bio_text, str) or len(bio_text.strip()) < 5:
+                results[position] = self._default_score()
+                continue
+            bio_lower = bio_text.lower()
+            result = self._memo.get((fingerprint, bio_lower)) if self.memo_size else None
+            if result is None:
+                misses.setdefault(bio_lower, []).append(position)
+            else:
+                self.memo_hits += 1
+                self._memo.move_to_end((fingerprint, bio_lower))
+                results[position] = result
+
+        for bio_lower, positions in misses.items():
+            result = self._score_bio(bio_lower)
+            for position in positions:
+                results[position] = result
+            if self.memo_size:
+                self.memo_misses += 1
+                self.memo_hits += len(positions) - 1
+                self._memo[(fingerprint, bio_lower)] = result
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+        # Callers own their results, also when one bio appears twice in the batch
+        return [dict(result, key_indicators=list(result["key_indicators"])) for result in results]
+
+    def analyze_bios_bulk(self, bios: Iterable[str]) -> Dict:
+        # Columnar scoring for whole lead databases: one row per bio, no per-bio result dicts.
+        # Keyword hits form a sparse bio x keyword matrix (CSR); every score is derived from
+        # per-category hit counts with array ops. Values match analyze_bio exactly.
+        from array import array
+        import numpy as np
+
+        keyword_index, slot_matrix, slots = self._bulk_tables()
+
+        valid = array("b")
+        phone = array("b")
+        indices = array("i")
+        indptr = array("q", [0])
+        for bio_text in bios:
+            if not isinstance(bio_text, str) or len(bio_text.strip()) < 5:
+                valid.append(0)
+                phone.append(0)
+            else:
+                bio_lower = bio_text.lower()
+                indices.extend(keyword_index[keyword] for keyword in self._matcher.find(bio_lower))
+                valid.append(1)
+                phone.append(1 if PHONE_PATTERN.search(bio_lower) else 0)
+            indptr.append(len(indices))
+
+        count = len(valid)
+        valid = np.frombuffer(valid, dtype=np.int8).astype(bool)
+        phone = np.frombuffer(phone, dtype=np.int8).astype(np.intp)
+        indices = np.frombuffer(indices, dtype=np.int32)
+        indptr = np.frombuffer(indptr, dtype=np.int64)
+
+        # hits (bio x keyword, sparse) @ slot_matrix (keyword x category, sparse) -> hit counts per category
+        slot_ptr, slot_idx = slot_matrix
+        slot_count = int(slot_idx.max()) + 1
+        rows = np.repeat(np.arange(count), np.diff(indptr))
+        degree = np.diff(slot_ptr)[indices]
+        offsets = np.repeat(np.cumsum(degree) - degree, degree)
+        positions = np.arange(int(degree.sum())) - offsets + np.repeat(slot_ptr[indices], degree)
+        flat = np.repeat(rows, degree) * slot_count + slot_idx[positions]
+        counts = np.bincount(flat, minlength=count * slot_count).reshape(count, slot_count)
+
+        # Business type: same first-strictly-better scan as _analyze_business_type, vectorized over bios
+        rules = self.scoring_rules
+        business = rules["business"]
+        best_confidence = np.full(count, business["default"]["confidence"])
+        best_raw = np.zeros(count)
+        business_code = np.full(count, BULK_GENERAL_BUSINESS, dtype=np.int8)
+        for code, business_type in enumerate(self.business_keywords, BULK_GENERAL_BUSINESS + 1):
+            table = slots["confidence"][business_type]
+            confidence = table[counts[:, slots["business"][business_type][0]], counts[:, slots["business"][business_type][1]]]
+            better = confidence > best_confidence
+            best_confidence = np.where(better, np.minimum(confidence, business["confidence_cap"]), best_confidence)
+            best_raw = np.where(better, confidence, best_raw)
+            business_code[better] = code
+        score_contribution = np.where(business_code == BULK_GENERAL_BUSINESS, business["default"]["score_contribution"],
+                                      np.minimum(best_raw * business["contribution_factor"], business["contribution_cap"]))
+
+        urgency = np.minimum(slots["urgency_table"][tuple(counts[:, slot] for slot in slots["urgency"])], rules["urgency"]["cap"])
+        credibility = np.minimum(slots["credibility_table"][tuple(counts[:, slot] for slot in slots["credibility"])], rules["credibility"]["cap"])
+        contact_columns = tuple(counts[:, slot] for slot in slots["contact"])
+        has_symbol = (counts[:, slots["symbols"]] > 0).astype(np.intp)
+        contact = np.minimum(slots["contact_table"][contact_columns + (has_symbol, phone)], rules["contact"]["cap"])
+
+        # First matching region type wins, as in _analyze_region
+        multiplier = np.full(count, rules["region_default"]["multiplier"])
+        for region_type in reversed(list(self.regions)):
+            multiplier = np.where(counts[:, slots["region"][region_type]] > 0, self.regions[region_type]["multiplier"], multiplier)
+
+        pitch = np.minimum((rules["pitch"]["base"] + score_contribution + credibility + contact) * multiplier,
+                           rules["pitch"]["cap"])
+
+        # Short or empty bios get the _default_score values
+        business_code[~valid] = BULK_UNKNOWN
+        return {
+            "pitch_score": np.where(valid, _round_tenths(pitch), 1.0),
+            "urgency_score": np.where(valid, _round_tenths(urgency), 1.0),
+            "credibility_score": np.where(valid, _round_tenths(credibility), 0.0),
+            "contact_readiness": np.where(valid, _round_tenths(contact), 0.0),
+            "business_type": business_code,
+            "region_multiplier": np.where(valid, multiplier, 1.0),
+            "business_type_labels": self.business_type_labels()
+        }
+
+    def business_type_labels(self) -> List[str]:
+        # Index = business_type code in analyze_bios_bulk output
+        return ["Unknown", "General Business"] + [t.replace("_", " ").title() for t in self.business_keywords]
+
+    def _bulk_tables(self) -> Tuple:
+        if self._bulk_cache is not None:
+            return self._bulk_cache
+        import numpy as np
+
+        keywords = sorted(self._matcher.keywords)
+        keyword_index = {keyword: i for i, keyword in enumerate(keywords)}
+        columns: List[frozenset] = []
+
+        def slot(keyword_set) -> int:
+            columns.append(frozenset(keyword_set))
+            return len(columns) - 1
+
+        slots = {
+            "business": {t: (slot(kw), slot(hv)) for t, (kw, hv) in self._business_sets.items()},
+            "urgency": [slot(s) for s in self._urgency_sets.values()],
+            "credibility": [slot(s) for s in self._credibility_sets.values()],
+            "contact": [slot(s) for s in self._contact_sets.values()],
+            "symbols": slot(CONTACT_SYMBOLS),
+            "region": {r: slot(s) for r, s in self._region_vocabulary.items()}
+        }
+        # keyword x category membership as CSR (indptr, indices)
+        keyword_slots = [[column for column, keyword_set in enumerate(columns) if keyword in keyword_set] for keyword in keywords]
+        slot_ptr = np.zeros(len(keywords) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in keyword_slots], out=slot_ptr[1:])
+        slot_matrix = (slot_ptr, np.array([column for s in keyword_slots for column in s], dtype=np.int64))
+
+        # Lookup tables indexed by hit counts, filled with the same accumulation the scalar path uses
+        business = self.scoring_rules["business"]
+        slots["confidence"] = {}
+        for business_type, (keywords_set, high_value_set) in self._business_sets.items():
+            table = np.zeros((len(keywords_set) + 1, len(high_value_set) + 1))
+            for n_keywords in range(len(keywords_set) + 1):
+                for n_high in range(len(high_value_set) + 1):
+                    table[n_keywords, n_high] = _add_repeated(_add_repeated(0, business["keyword_weight"], n_keywords),
+                                                              business["high_value_weight"], n_high)
+            slots["confidence"][business_type] = table
+
+        def accumulation(name: str, sets: Dict[str, frozenset], extra: List[Tuple[float, int]] = ()):
+            rule = self.scoring_rules[name]
+            steps = [(rule["weights"].get(category, rule["default_weight"]), len(s)) for category, s in sets.items()]
+            return _accumulation_table(rule["base"], steps + list(extra))
+
+        slots["urgency_table"] = accumulation("urgency", self._urgency_sets)
+        slots["credibility_table"] = accumulation("credibility", self._credibility_sets)
+        contact = self.scoring_rules["contact"]
+        slots["contact_table"] = accumulation("contact", self._contact_sets,
+                                              [(contact["symbol_bonus"], 1), (contact["phone_bonus"], 1)])
+
+        self._bulk_cache = (keyword_index, slot_matrix, slots)
+        return self._bulk_cache
+
     def _default_score(self) -> Dict:
         return {
             "pitch_score": 1.0,
@@ -290,14 +506,93 @@ class ProfessionalBioAnalyzer:
             "region": "Unknown",
             "region_value": "Standard",
             "key_indicators": [],
-            "recommendation": "❌ INSUFFICIENT DATA - Bio too short or empty."
+            "recommendation": RECOMMENDATIONS["insufficient_data"]
         }
 
+_shared_analyzer = None
+
+def get_analyzer() -> ProfessionalBioAnalyzer:
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = ProfessionalBioAnalyzer(memo_size=DEFAULT_MEMO_SIZE)
+    return _shared_analyzer
+
 def score_bio_fast(bio_text):
-    analyzer = ProfessionalBioAnalyzer()
-    return analyzer.analyze_bio(bio_text)
+    return get_analyzer().analyze_bio(bio_text)
+
+def score_bios_fast(bios: Iterable, analyzer: ProfessionalBioAnalyzer = None) -> Iterator[Dict]:
+    # Lazily score any iterable of bios with one analyzer - constant memory for any input size
+    analyzer = analyzer or get_analyzer()
+    for bio_text in bios:
+        yield analyzer.analyze_bio(bio_text)
+
+def score_bios_bulk(bios: Iterable[str], analyzer: ProfessionalBioAnalyzer = None) -> Dict:
+    return (analyzer or get_analyzer()).analyze_bios_bulk(bios)
+
+def _log_invalid_line(line_number: int, message: str):
+    sys.stderr.write(f"[bio_score_fast] skipped line {line_number}: {message}\n")
+
+def read_bios_jsonl(stream: TextIO, on_invalid: Callable[[int, str], None] = _log_invalid_line
+                    ) -> Iterator[Tuple[object, str]]:
+    # Each line is either a JSON string or an object with "bio" (and optional "id").
+    # A line that is not valid JSON, or whose bio is not a string, is skipped and
+    # reported to on_invalid(line_number, message) - by default logged to stderr - so
+    # one bad line never ends a long batch
+    import json
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            on_invalid(line_number, f"invalid JSON ({e})")
+            continue
+        if isinstance(record, dict):
+            bio_id, bio_text = record.get("id", line_number), record.get("bio") or ""
+        else:
+            bio_id, bio_text = line_number, record or ""
+        if not isinstance(bio_text, str):
+            on_invalid(line_number, f"bio is {type(bio_text).__name__}, not a string")
+            continue
+        yield bio_id, bio_text
+
+def score_bios_jsonl(stream: TextIO, out: TextIO) -> int:
+    # One output line per input line: invalid lines get an error record
+    import json
+
+    analyzer = get_analyzer()
+    count = 0
+
+    def invalid(line_number: int, message: str):
+        out.write(json.dumps({"id": line_number, "error": message}) + "\n")
+
+    for bio_id, bio_text in read_bios_jsonl(stream, invalid):
+        out.write(json.dumps({"id": bio_id, "result": analyzer.analyze_bio(bio_text)}) + "\n")
+        count += 1
+    return count
 
 if __name__ == "__main__":
-    bio_text = sys.argv[1] if len(sys.argv) > 1 else ""
-    result = score_bio_fast(bio_text)
-    print(json.dumps(result)) 
\ No newline at end of file
+    # --metrics (or SCORING_METRICS=1) reports stage timings on stderr when done
+    args = sys.argv[1:]
+    scoring_metrics = None
+    if "--metrics" in args or _metrics_enabled():
+        import scoring_metrics
+        args = scoring_metrics.enable_from_argv(args)
+    if args and args[0] == "--jsonl":
+        # Streaming batch mode: python bio_score_fast.py --jsonl [bios.jsonl | -]
+        source = args[1] if len(args) > 1 else "-"
+        if source == "-":
+            score_bios_jsonl(sys.stdin, sys.stdout)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                score_bios_jsonl(f, sys.stdout)
+    else:
+        bio_text = args[0] if args else ""
+        # One bio per process: a memo (and its fingerprint) would never be hit
+        result = ProfessionalBioAnalyzer().analyze_bio(bio_text)
+        import cli_json
+        print(cli_json.dumps(result))
+    if scoring_metrics is not None:
+        scoring_metrics.dump_if_enabled()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+# json.dumps for the one-shot scorer CLIs, without importing json.
+#
+# The Node scrapers fall back to one process per bio or screenshot, and importing json
+# pulls in re and enum: ~25 ms of a ~30 ms bio_score_fast.py run on top of the bare
+# interpreter. dumps() writes exactly what json.dumps(value) would with its defaults
+# (ensure_ascii, ", " and ": " separators, NaN/Infinity, bool/None literals) for the
+# dicts, lists, strings and numbers a score result is made of; anything else raises
+# TypeError like json.dumps does. Batch paths keep using json.
+
+_ESCAPES = {index: f"\\u{index:04x}" for index in [*range(0x20), 0x7f]}
+_ESCAPES.update({ord('"'): '\\"', ord("\\"): "\\\\", ord("\n"): "\\n", ord("\r"): "\\r",
+                 ord("\t"): "\\t", ord("\b"): "\\b", ord("\f"): "\\f"})
+
+
+def _non_ascii(char: str) -> str:
+    code = ord(char)
+    if code < 0x80:
+        return char
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    # Outside the BMP: a UTF-16 surrogate pair, as json.dumps writes it
+    code -= 0x10000
+    return f"\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}"
+
+
+def _string(text: str) -> str:
+    text = text.translate(_ESCAPES)
+    if not text.isascii():
+        text = "".join(map(_non_ascii, text))
+    return '"' + text + '"'
+
+
+def _float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def dumps(value: Any) -> str:
+    if isinstance(value, str):
+        return _string(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return _float(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(map(dumps, value)) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(_key(key) + ": " + dumps(item) for key, item in value.items()) + "}"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _key(key) -> str:
+    # json.dumps coerces scalar keys to strings
+    if isinstance(key, str):
+        return _string(key)
+    if isinstance(key, (bool, type(None))):
+        return '"' + dumps(key) + '"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    if isinstance(key, float):
+        return '"' + _float(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
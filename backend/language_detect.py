@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, FrozenSet, Iterable, List, Optional
+
+# Stopword-based language detection shared by bio_score.py and bio_score_fast.py.
+#
+# A bio is split once on whitespace; each distinct token maps (through a token cache) to
+# the stopwords among its letter runs, so "hola!" and "(de" count as "hola" and "de".
+# Only the stopwords present matter, so that set is the result cache key: bios share
+# a small number of such sets, and repeated sets skip the per-language counting.
+#
+# Each language scores the number of its distinct stopwords present. The highest score
+# wins if it reaches MIN_MATCHES and is strictly ahead of English (the default), so a
+# mostly English bio with a few foreign words stays English; ties between the other
+# languages go to the earlier one in STOPWORDS. Words that are just as common in
+# English bios ("do", "no", "as") and articles that mostly appear in US place names
+# ("los", "las": Los Angeles, Las Vegas) are left out of the other languages' tables.
+
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "Spanish": frozenset([
+        "el", "la", "de", "del", "y", "en", "con", "para", "por", "una", "un", "es", "mi",
+        "tu", "su", "sus", "que", "pero", "como", "muy", "más", "también", "hola", "gracias", "al", "lo",
+        "se", "yo", "soy", "somos", "nuestro", "nuestra", "tus"
+    ]),
+    "French": frozenset([
+        "le", "la", "les", "et", "un", "une", "des", "du", "pour", "avec", "est", "mon", "ton", "son",
+        "je", "tu", "il", "elle", "nous", "vous", "ils", "elles", "bonjour", "merci", "sur", "dans",
+        "au", "aux", "ce", "qui", "pas", "votre", "vos", "suis"
+    ]),
+    "German": frozenset([
+        "der", "die", "das", "und", "ist", "ein", "eine", "mit", "für", "ich", "du", "er", "sie", "wir",
+        "ihr", "hallo", "danke", "nicht", "auf", "den", "dem", "zu", "von", "bei", "auch", "dein", "deine",
+        "unser", "unsere", "bin"
+    ]),
+    "Portuguese": frozenset([
+        "os", "da", "dos", "das", "em", "um", "uma", "para", "com", "não", "que", "se",
+        "por", "mais", "na", "é", "eu", "você", "olá", "obrigado", "obrigada", "também", "seu",
+        "sua", "de", "nosso", "nossa", "sou"
+    ]),
+    "English": frozenset([
+        "the", "and", "for", "with", "you", "your", "our", "my", "is", "are", "to", "of", "in", "on",
+        "at", "we", "this", "that", "it", "be", "from", "by", "an", "or", "not", "have", "will", "me"
+    ])
+}
+DEFAULT_LANGUAGE = "English"
+MIN_MATCHES = 2
+CACHE_SIZE = 20000
+TOKEN_CACHE_SIZE = 50000
+
+
+def letter_runs(token: str) -> List[str]:
+    # re.findall(r"[^\W\d_]+", token) without importing re (and enum with it), which
+    # would be most of a one-shot bio_score_fast.py run: \w is str.isalnum() plus "_"
+    # and \d is str.isdecimal(), so a letter is an alphanumeric that is not a decimal
+    if token.isalpha():
+        return [token]
+    runs = []
+    start = None
+    for index, char in enumerate(token):
+        if char.isalnum() and not char.isdecimal():
+            if start is None:
+                start = index
+        elif start is not None:
+            runs.append(token[start:index])
+            start = None
+    if start is not None:
+        runs.append(token[start:])
+    return runs
+
+
+class LanguageDetector:
+    def __init__(self, stopwords: Dict[str, Iterable[str]] = None, min_matches: int = MIN_MATCHES,
+                 default: str = DEFAULT_LANGUAGE):
+        stopwords = STOPWORDS if stopwords is None else stopwords
+        self.languages = [(language, frozenset(words)) for language, words in stopwords.items()]
+        self._default_words = dict(self.languages).get(default, frozenset())
+        self.vocabulary = frozenset().union(*(words for _, words in self.languages))
+        self.min_matches = min_matches
+        self.default = default
+        self._cache: Dict[FrozenSet[str], str] = {}
+        self._token_cache: Dict[str, FrozenSet[str]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def tokens(self, text: str) -> FrozenSet[str]:
+        # Stopwords present in the (lowercased) text
+        found = set()
+        cache = self._token_cache
+        for token in set(text.split()):
+            words = cache.get(token)
+            if words is None:
+                if len(cache) >= TOKEN_CACHE_SIZE:
+                    cache.clear()
+                words = cache[token] = self.vocabulary.intersection(letter_runs(token))
+            if words:
+                found.update(words)
+        return frozenset(found)
+
+    def detect(self, text: str) -> str:
+        return self.detect_tokens(self.tokens(text)) if text else self.default
+
+    def detect_tokens(self, tokens: FrozenSet[str]) -> str:
+        language = self._cache.get(tokens)
+        if language is not None:
+            self.cache_hits += 1
+            return language
+
+        self.cache_misses += 1
+        language = self.default
+        best = max(self.min_matches - 1, len(tokens & self._default_words))
+        for candidate, words in self.languages:
+            if candidate == self.default:
+                continue
+            count = len(tokens & words)
+            if count > best:
+                language, best = candidate, count
+
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[tokens] = language
+        return language
+
+
+_shared_detector: Optional[LanguageDetector] = None
+
+
+def detect_language(text_lower: str) -> str:
+    global _shared_detector
+    if _shared_detector is None:
+        _shared_detector = LanguageDetector()
+    return _shared_detector.detect(text_lower)
+
+
+if __name__ == "__main__":
+    # Benchmark against the detectors this replaced: python language_detect.py [repeat]
+    import json
+    import re
+    import sys
+    import timeit
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    def per_word_scan(bio_lower):
+        # Former bio_score_fast._detect_language
+        spanish = ["el", "la", "de", "y", "en", "con", "para", "por", "una", "un", "es", "mi", "tu", "su"]
+        french = ["le", "la", "et", "un", "une", "des", "pour", "avec", "est", "mon", "ton", "son"]
+        spanish_count = sum(1 for word in spanish if f" {word} " in f" {bio_lower} ")
+        french_count = sum(1 for word in french if f" {word} " in f" {bio_lower} ")
+        return "Spanish" if spanish_count >= 2 else "French" if french_count >= 2 else "English"
+
+    alternations = [(language, re.compile(pattern)) for language, pattern in [
+        # Former bio_score.py cascade
+        ("Spanish", r"\b(el|la|de|y|en|con|para|por|una|un|es|mi|tu|su|que|pero|como|muy|más|también|hola|gracias)\b"),
+        ("French", r"\b(le|la|et|un|une|des|pour|avec|est|je|tu|il|elle|nous|vous|ils|elles|bonjour|merci)\b"),
+        ("German", r"\b(der|die|das|und|ist|ein|eine|mit|für|ich|du|er|sie|wir|ihr|sie|hallo|danke)\b")
+    ]]
+
+    def regex_cascade(bio_lower):
+        return next((language for language, pattern in alternations if pattern.search(bio_lower)), "English")
+
+    samples = {
+        "english": "Certified personal trainer in NYC 🏋️ 10 years helping clients get strong. DM me or book now! ",
+        "spanish": "Hola! Soy entrenador personal en Madrid, clases de yoga y nutrición para todos. ",
+        "german": "Hallo! Ich bin Friseur in Berlin, Termine auf Anfrage und mit Liebe gemacht. ",
+        "portuguese": "Olá! Sou fotógrafa em São Paulo, ensaios e casamentos com você. "
+    }
+    detector = LanguageDetector()
+    results = []
+    for name, sample in samples.items():
+        for copies in (1, 10):
+            bio = (sample * copies).lower()
+            row = {"sample": name, "bio_chars": len(bio), "detected": detector.detect(bio)}
+            for label, detect in (("per_word_scan_us", per_word_scan), ("regex_cascade_us", regex_cascade),
+                                  ("token_detector_us", detector.detect)):
+                row[label] = round(timeit.timeit(lambda: detect(bio), number=repeat) / repeat * 1e6, 2)
+            results.append(row)
+    print(json.dumps({"languages": [language for language, _ in detector.languages], "results": results}, indent=2))
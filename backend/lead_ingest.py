@@ -0,0 +1,347 @@
+import sys
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from bio_score_fast import ProfessionalBioAnalyzer
+from lead_score import analyze_activity, calculate_lead_score, extract_contact_info
+from vision_score import ProfessionalVisionAnalyzer
+
+# Streaming score-and-store pipeline: scraped profile JSONL -> bio + vision scores -> dev.db.
+#
+#   reader thread --(pending queue)--> scorer thread(s) --(scored queue)--> writer
+#
+# Each line is a profile in the shape scraper_apify.js builds (username, bio, followers,
+# screenshot / screenshotPath, ...); whole saved session files can be fed through
+# `python lead_ingest.py --session-file`. Lead score, tier, priority, action and factors
+# are recalculated from the fresh scores with lead_score.calculate_lead_score; any
+# stored in the input are ignored. Both queues are bounded, so a slow stage
+# blocks the one before it and memory stays flat for any input size.
+#
+# The writer upserts into the `leads` table dev.db actually has (the same columns and
+# JSON encoding as DatabaseManager.saveLeads in db.js, keyed on username), batch_size
+# rows per executemany and per transaction, with WAL and synchronous=NORMAL. Per-row
+# commits cost an fsync each; batched, the writer is idle most of the time and the
+# ingest rate is the scoring rate (compare score_seconds and write_seconds in the stats).
+#
+#   python lead_ingest.py leads.jsonl [db_path] [session_id] > stats.json
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEV_DB_PATH = os.path.join(BACKEND_DIR, "dev.db")
+
+BATCH_SIZE = 500
+QUEUE_SIZE = 256
+BUSY_TIMEOUT_SECONDS = 30
+
+# Matches scraper_apify.js when a profile has no screenshot
+NO_SCREENSHOT_SCORE = {"professional_score": 5}
+
+LEAD_COLUMNS = (
+    "id", "username", "displayName", "bio", "followers", "following", "posts", "isVerified",
+    "isPrivate", "url", "profilePicUrl", "externalUrl", "businessCategory", "isBusinessAccount",
+    "screenshot", "scrapedAt", "sessionId", "bioScore", "visionScore", "leadScore", "leadTier",
+    "leadPriority", "leadAction", "leadConfidence", "leadFactors", "contactInfo", "activityData"
+)
+JSON_COLUMNS = ("bioScore", "visionScore", "leadFactors", "contactInfo", "activityData")
+# Like the Prisma upsert, an existing lead keeps its id and first scrapedAt
+UPSERT_SQL = "INSERT INTO leads ({columns}) VALUES ({placeholders}) ON CONFLICT(username) DO UPDATE SET {updates}".format(
+    columns=", ".join(f'"{column}"' for column in LEAD_COLUMNS),
+    placeholders=", ".join("?" * len(LEAD_COLUMNS)),
+    updates=", ".join(f'"{column}" = excluded."{column}"' for column in LEAD_COLUMNS
+                      if column not in ("id", "username", "scrapedAt"))
+)
+
+_DONE = object()
+
+
+def _log_invalid_line(line_number: int, message: str):
+    sys.stderr.write(f"[ingest] skipped line {line_number}: {message}\n")
+
+
+def read_profiles(stream: TextIO, on_invalid: Callable[[int, str], None] = _log_invalid_line) -> Iterator[Dict]:
+    # One profile object per line; blank lines and objects without a username are skipped.
+    # A line that is not valid JSON is skipped and reported to on_invalid(line_number,
+    # message) - by default logged to stderr - so one bad line never ends a long ingest
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            profile = json.loads(line)
+        except ValueError as e:
+            on_invalid(line_number, f"invalid JSON ({e})")
+            continue
+        if isinstance(profile, dict) and profile.get("username"):
+            yield profile
+
+
+def read_session_files(paths: Iterable[str]) -> Iterator[Dict]:
+    # The leads of saved/sessions/*.json files, one profile at a time
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            session = json.load(f)
+        for profile in session.get("leads", []) if isinstance(session, dict) else session:
+            if isinstance(profile, dict) and profile.get("username"):
+                yield profile
+
+
+def screenshot_file(profile: Dict) -> Optional[str]:
+    # scraper_apify.js keeps the absolute screenshotPath while scraping and stores
+    # "screenshot" relative to backend/ ("/screenshots/<name>.png")
+    path = profile.get("screenshotPath")
+    if path:
+        return path
+    screenshot = profile.get("screenshot")
+    if screenshot:
+        return os.path.join(BACKEND_DIR, screenshot.lstrip("/\\"))
+    return None
+
+
+def _prisma_datetime(value) -> int:
+    # Prisma stores SQLite DateTime values as epoch milliseconds
+    if isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+        except ValueError:
+            pass
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def _lead_score_fields(lead_score: Dict) -> Dict:
+    # calculate_lead_score() result as lead columns. Column types as Prisma reads them
+    # back: leadPriority String?, leadConfidence Float? (the "High"/"Low" confidence
+    # labels have no numeric value)
+    return {
+        "leadScore": lead_score["score"],
+        "leadTier": lead_score["tier"],
+        "leadPriority": str(lead_score["priority"]),
+        "leadAction": lead_score["action"],
+        "leadConfidence": None,
+        "leadFactors": lead_score["factors"]
+    }
+
+
+def lead_row(profile: Dict, bio_score: Dict, vision_score: Dict, session_id: Optional[str] = None) -> Tuple:
+    # Column values in LEAD_COLUMNS order, with db.js saveLeads defaults. The lead score
+    # is recomputed from the new bio/vision scores (and the profile's contactInfo and
+    # activityData, as the scraper does), so it never disagrees with the stored scores.
+    # A raw profile without contactInfo/activityData gets them extracted, as
+    # lead_score.LeadScorer stores them
+    username = profile["username"]
+    lead = {
+        "id": "c" + uuid.uuid4().hex[:24],
+        "username": username,
+        "displayName": profile.get("displayName") or username,
+        "bio": profile.get("bio") or "",
+        "followers": profile.get("followers") or 0,
+        "following": profile.get("following") or 0,
+        "posts": profile.get("posts") or 0,
+        "isVerified": bool(profile.get("isVerified")),
+        "isPrivate": bool(profile.get("isPrivate")),
+        "url": profile.get("url") or f"https://instagram.com/{username}",
+        "profilePicUrl": profile.get("profilePicUrl"),
+        "externalUrl": profile.get("externalUrl"),
+        "businessCategory": profile.get("businessCategory"),
+        "isBusinessAccount": bool(profile.get("isBusinessAccount")),
+        "screenshot": profile.get("screenshot"),
+        "scrapedAt": _prisma_datetime(profile.get("scrapedAt")),
+        "sessionId": session_id or profile.get("sessionId"),
+        "bioScore": bio_score,
+        "visionScore": vision_score,
+        **_lead_score_fields(calculate_lead_score(profile, bio_score, vision_score)),
+        "contactInfo": profile.get("contactInfo") or extract_contact_info(profile),
+        "activityData": profile.get("activityData") or analyze_activity(profile)
+    }
+    for column in JSON_COLUMNS:
+        lead[column] = json.dumps(lead[column]) if lead[column] else None
+    return tuple(lead[column] for column in LEAD_COLUMNS)
+
+
+class LeadIngest:
+    def __init__(self, db_path: str = DEV_DB_PATH, session_id: Optional[str] = None,
+                 batch_size: int = BATCH_SIZE, queue_size: int = QUEUE_SIZE, scorers: int = 1,
+                 bio_analyzer: ProfessionalBioAnalyzer = None,
+                 vision_analyzer: ProfessionalVisionAnalyzer = None):
+        # scorers > 1 only helps vision-heavy input (Pillow/numpy release the GIL); with
+        # more than one scorer rows are written in completion order, not input order
+        self.db_path = db_path
+        self.session_id = session_id
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.scorers = max(1, scorers)
+        self.bio_analyzer = bio_analyzer or ProfessionalBioAnalyzer()
+        self.vision_analyzer = vision_analyzer or ProfessionalVisionAnalyzer()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def score(self, profile: Dict) -> Tuple:
+        bio_score = self.bio_analyzer.analyze_bio(profile.get("bio") or "")
+        path = screenshot_file(profile)
+        vision_score = self.vision_analyzer.analyze_image(path) if path else dict(NO_SCREENSHOT_SCORE)
+        return lead_row(profile, bio_score, vision_score, self.session_id)
+
+    def run(self, profiles: Iterable[Dict]) -> Dict:
+        pending: queue.Queue = queue.Queue(self.queue_size)
+        scored: queue.Queue = queue.Queue(self.queue_size)
+        stop = threading.Event()
+        failures: List[BaseException] = []
+        stats = {"read": 0, "written": 0, "errors": 0, "batches": 0, "score_seconds": 0.0, "write_seconds": 0.0}
+        lock = threading.Lock()
+
+        def put(target: queue.Queue, item) -> bool:
+            # Blocks while the next stage is behind; gives up once the pipeline is stopping
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: queue.Queue):
+            # Next item, or _DONE as soon as the pipeline is stopping
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def read():
+            try:
+                for profile in profiles:
+                    stats["read"] += 1
+                    if not put(pending, profile):
+                        return
+            except BaseException as e:
+                failures.append(e)
+                stop.set()
+            finally:
+                for _ in range(self.scorers):
+                    put(pending, _DONE)
+
+        def score():
+            busy = 0.0
+            errors = 0
+            try:
+                while True:
+                    profile = get(pending)
+                    if profile is _DONE:
+                        break
+                    started = time.perf_counter()
+                    try:
+                        row = self.score(profile)
+                    except Exception as e:
+                        # One bad profile is logged and skipped, as in scraper_apify.js
+                        errors += 1
+                        sys.stderr.write(f"[ingest] skipped {profile.get('username')}: {e}\n")
+                        continue
+                    finally:
+                        busy += time.perf_counter() - started
+                    if not put(scored, row):
+                        return
+            except BaseException as e:
+                failures.append(e)
+                stop.set()
+            finally:
+                with lock:
+                    stats["score_seconds"] += busy
+                    stats["errors"] += errors
+                put(scored, _DONE)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=read, name="ingest-read", daemon=True)]
+        threads += [threading.Thread(target=score, name=f"ingest-score-{n}", daemon=True) for n in range(self.scorers)]
+        for thread in threads:
+            thread.start()
+
+        db = self._connect()
+        try:
+            batch: List[Tuple] = []
+
+            def flush():
+                write_started = time.perf_counter()
+                db.execute("BEGIN")
+                try:
+                    db.executemany(UPSERT_SQL, batch)
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    # Not retried by the final flush
+                    batch.clear()
+                    raise
+                db.execute("COMMIT")
+                stats["write_seconds"] += time.perf_counter() - write_started
+                stats["written"] += len(batch)
+                stats["batches"] += 1
+                batch.clear()
+
+            remaining = self.scorers
+            while remaining:
+                row = get(scored)
+                if stop.is_set():
+                    break
+                if row is _DONE:
+                    remaining -= 1
+                    continue
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    flush()
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            try:
+                for thread in threads:
+                    thread.join()
+                # Rows already scored are written even when a stage failed or was interrupted
+                while True:
+                    try:
+                        row = scored.get_nowait()
+                    except queue.Empty:
+                        break
+                    if row is not _DONE:
+                        batch.append(row)
+                if batch:
+                    flush()
+            finally:
+                db.close()
+
+        if failures:
+            raise failures[0]
+        elapsed = time.perf_counter() - started
+        stats["score_seconds"] = round(stats["score_seconds"], 3)
+        stats["write_seconds"] = round(stats["write_seconds"], 3)
+        stats["seconds"] = round(elapsed, 3)
+        stats["leads_per_second"] = round(stats["written"] / elapsed, 1) if elapsed > 0 else 0.0
+        return stats
+
+
+def ingest(profiles: Iterable[Dict], db_path: str = DEV_DB_PATH, session_id: Optional[str] = None, **options) -> Dict:
+    return LeadIngest(db_path, session_id, **options).run(profiles)
+
+
+if __name__ == "__main__":
+    # python lead_ingest.py leads.jsonl|- [db_path] [session_id]
+    # python lead_ingest.py --session-file saved/sessions/<id>.json [...] (into dev.db)
+    args = sys.argv[1:]
+    if args and args[0] == "--session-file":
+        print(json.dumps(ingest(read_session_files(args[1:]))))
+    else:
+        source = args[0] if args else "-"
+        db_path = args[1] if len(args) > 1 else DEV_DB_PATH
+        session_id = args[2] if len(args) > 2 else None
+        if source == "-":
+            print(json.dumps(ingest(read_profiles(sys.stdin), db_path, session_id)))
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                print(json.dumps(ingest(read_profiles(f), db_path, session_id)))
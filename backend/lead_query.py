@@ -0,0 +1,297 @@
+import sys
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# In-memory query engine over scored leads (bio_score_fast results).
+#
+# Every filterable property is a bitmap over lead rows, packed 64 rows per uint64 word:
+#
+#   categorical   one bitmap per value of business_type / region_value / region / language
+#   indicators    one bitmap per key_indicators label (a lead can be in several)
+#   numeric       range-encoded: scores are tenths in 0.0-10.0, so each score field keeps
+#                 101 bitmaps where row v holds the leads scoring >= v / 10
+#
+# A query is a handful of word-wise AND/OR/NOT operations over size / 64 words, and
+# "top K by a score" binary-searches the range bitmaps for the highest threshold that
+# still leaves K leads, so only those rows are ever materialized. New results are
+# appended with add(); bits are set in vectorized blocks, and the bitmaps grow by
+# doubling. Bit layout assumes a little-endian machine (x86, ARM).
+#
+#   index = LeadIndex()
+#   index.add(results, keys=usernames)
+#   index.query({"business_type": "Fitness", "region_value": "Major Cities",
+#                "pitch_score": (">=", 7), "key_indicators": "Contact Ready"},
+#               order_by="urgency_score", limit=50)
+
+CATEGORICAL_FIELDS = ("business_type", "region_value", "region", "language")
+INDICATOR_FIELD = "key_indicators"
+NUMERIC_FIELDS = ("pitch_score", "urgency_score", "credibility_score", "contact_readiness")
+
+LEVELS = 101  # 0.0 .. 10.0 in tenths
+_LEVEL_RANGE = np.arange(LEVELS, dtype=np.int16)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return int(np.bitwise_count(words).sum())
+    return int(_POPCOUNT8[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _bit_rows(words: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    # Row numbers of the set bits, ascending (the first `limit` of them); cost follows
+    # the number of non-empty words unpacked
+    nonzero = np.flatnonzero(words)
+    if limit is not None:
+        nonzero = nonzero[:limit]  # every non-empty word holds at least one row
+    bits = np.unpackbits(words[nonzero].view(np.uint8), bitorder="little").reshape(-1, 64)
+    word, bit = np.nonzero(bits)
+    return nonzero[word] * 64 + bit
+
+
+def _levels(value: float) -> float:
+    # Score threshold in tenths, without 0.7 * 10 == 7.000000000000001 surprises
+    return round(value * 10, 6)
+
+
+class LeadIndex:
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.keys: List = []
+        self._capacity = max(64, -(-capacity // 64) * 64)
+        words = self._capacity // 64
+        self._all = np.zeros(words, dtype=np.uint64)
+        self._bitmaps: Dict[Tuple[str, str], np.ndarray] = {}
+        self._ranges = {field: np.zeros((LEVELS, words), dtype=np.uint64) for field in NUMERIC_FIELDS}
+        self._scores = {field: np.zeros(self._capacity, dtype=np.int16) for field in NUMERIC_FIELDS}
+        self._codes = {field: np.zeros(self._capacity, dtype=np.int32) for field in CATEGORICAL_FIELDS}
+        self._labels: Dict[str, List[str]] = {field: [] for field in CATEGORICAL_FIELDS}
+        self._label_codes: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+        self._indicators: List[Tuple[str, ...]] = []
+        self._indicator_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def _reserve(self, size: int):
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        extra_words = (capacity - self._capacity) // 64
+        extra_rows = capacity - self._capacity
+        self._all = np.concatenate([self._all, np.zeros(extra_words, dtype=np.uint64)])
+        for key, bitmap in self._bitmaps.items():
+            self._bitmaps[key] = np.concatenate([bitmap, np.zeros(extra_words, dtype=np.uint64)])
+        for field, ranges in self._ranges.items():
+            self._ranges[field] = np.pad(ranges, ((0, 0), (0, extra_words)))
+        for columns in (self._scores, self._codes):
+            for field, column in columns.items():
+                columns[field] = np.concatenate([column, np.zeros(extra_rows, dtype=column.dtype)])
+        self._capacity = capacity
+
+    def _code(self, field: str, value) -> int:
+        value = str(value) if value is not None else "Unknown"
+        codes = self._label_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._labels[field])
+            self._labels[field].append(value)
+        return code
+
+    def add(self, results: Iterable[Dict], keys: Iterable = None) -> range:
+        # Appends scored leads; returns their row numbers. keys default to the row numbers.
+        results = list(results)
+        start, count = self.size, len(results)
+        if not count:
+            return range(start, start)
+        self._reserve(start + count)
+        self.keys.extend(keys if keys is not None else range(start, start + count))
+
+        # Blocks are packed from the word holding the first new row
+        first_word, offset = divmod(start, 64)
+        block_rows = -(-(offset + count) // 64) * 64
+        last_word = first_word + block_rows // 64
+
+        def pack(masks: np.ndarray) -> np.ndarray:
+            # (count, k) bools for the new rows -> (k, words) bitmap words
+            block = np.zeros((block_rows, masks.shape[1]), dtype=bool)
+            block[offset:offset + count] = masks
+            return np.ascontiguousarray(np.packbits(block, axis=0, bitorder="little").T).view(np.uint64)
+
+        self._all[first_word:last_word] |= pack(np.ones((count, 1), dtype=bool))[0]
+
+        for field in CATEGORICAL_FIELDS:
+            codes = np.array([self._code(field, result.get(field)) for result in results], dtype=np.int32)
+            self._codes[field][start:start + count] = codes
+            present = np.unique(codes)
+            for code, words in zip(present.tolist(), pack(codes[:, None] == present[None, :])):
+                self._bitmap(field, self._labels[field][code])[first_word:last_word] |= words
+
+        rows_by_label: Dict[str, List[int]] = {}
+        for row, result in enumerate(results):
+            labels = tuple(result.get(INDICATOR_FIELD) or ())
+            self._indicators.append(self._indicator_sets.setdefault(labels, labels))
+            for label in labels:
+                rows_by_label.setdefault(label, []).append(row)
+        for label, rows in rows_by_label.items():
+            masks = np.zeros((count, 1), dtype=bool)
+            masks[rows] = True
+            self._bitmap(INDICATOR_FIELD, label)[first_word:last_word] |= pack(masks)[0]
+
+        for field in NUMERIC_FIELDS:
+            scores = np.array([result.get(field) or 0.0 for result in results], dtype=np.float64)
+            levels = np.clip(np.rint(scores * 10), 0, LEVELS - 1).astype(np.int16)
+            self._scores[field][start:start + count] = levels
+            self._ranges[field][:, first_word:last_word] |= pack(levels[:, None] >= _LEVEL_RANGE[None, :])
+
+        self.size += count
+        return range(start, start + count)
+
+    def _bitmap(self, field: str, value: str) -> np.ndarray:
+        bitmap = self._bitmaps.get((field, value))
+        if bitmap is None:
+            bitmap = self._bitmaps[(field, value)] = np.zeros(self._capacity // 64, dtype=np.uint64)
+        return bitmap
+
+    def _at_least(self, field: str, level: int, words: int) -> np.ndarray:
+        if level <= 0:
+            return self._all[:words]
+        if level >= LEVELS:
+            return np.zeros(words, dtype=np.uint64)
+        return self._ranges[field][level, :words]
+
+    def _numeric(self, field: str, op: str, value: float, words: int) -> np.ndarray:
+        tenths = _levels(value)
+        if op == ">=":
+            return self._at_least(field, math.ceil(tenths), words)
+        if op == ">":
+            return self._at_least(field, math.floor(tenths) + 1, words)
+        if op == "<=":
+            return self._all[:words] & ~self._at_least(field, math.floor(tenths) + 1, words)
+        if op == "<":
+            return self._all[:words] & ~self._at_least(field, math.ceil(tenths), words)
+        if op == "==":
+            if tenths != int(tenths):
+                return np.zeros(words, dtype=np.uint64)
+            return self._at_least(field, int(tenths), words) & ~self._at_least(field, int(tenths) + 1, words)
+        raise ValueError(f"Unknown comparison: {op}")
+
+    def match(self, where: Optional[Dict] = None) -> np.ndarray:
+        # Bitmap words of the leads matching every condition:
+        #   categorical field: value or list of values (any of them)
+        #   key_indicators:    label or list of labels (all of them)
+        #   numeric field:     (op, value) or a list of such pairs, op in >= > <= < ==
+        words = -(-self.size // 64)
+        result = self._all[:words].copy()
+        for field, condition in (where or {}).items():
+            if field in NUMERIC_FIELDS:
+                for op, value in [condition] if isinstance(condition[0], str) else condition:
+                    result &= self._numeric(field, op, value, words)
+            elif field == INDICATOR_FIELD:
+                for label in [condition] if isinstance(condition, str) else condition:
+                    bitmap = self._bitmaps.get((field, label))
+                    if bitmap is None:
+                        result[:] = 0
+                    else:
+                        result &= bitmap[:words]
+            elif field in CATEGORICAL_FIELDS:
+                allowed = np.zeros(words, dtype=np.uint64)
+                for value in [condition] if isinstance(condition, str) else condition:
+                    bitmap = self._bitmaps.get((field, value))
+                    if bitmap is not None:
+                        allowed |= bitmap[:words]
+                result &= allowed
+            else:
+                raise ValueError(f"Unknown lead field: {field}")
+        return result
+
+    def count(self, where: Optional[Dict] = None) -> int:
+        return _popcount(self.match(where))
+
+    def query(self, where: Optional[Dict] = None, order_by: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        # Matching leads, highest order_by score first (ties in insertion order), or in
+        # insertion order without order_by
+        matched = self.match(where)
+        if order_by is None:
+            rows = _bit_rows(matched, limit)[:limit]
+        elif order_by in NUMERIC_FIELDS:
+            rows = self._top(matched, order_by, limit)
+        else:
+            raise ValueError(f"Can only order by: {', '.join(NUMERIC_FIELDS)}")
+        return [self.row(int(row)) for row in rows]
+
+    def _top(self, matched: np.ndarray, field: str, limit: int) -> np.ndarray:
+        words = len(matched)
+        if _popcount(matched) <= limit:
+            rows = _bit_rows(matched)
+        else:
+            # Highest threshold that still keeps `limit` leads (counts only shrink as it rises)
+            low, high = 0, LEVELS - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if _popcount(matched & self._at_least(field, middle, words)) >= limit:
+                    low = middle
+                else:
+                    high = middle - 1
+            # Everything above that level is in; ties at it go by insertion order
+            above = matched & self._at_least(field, low + 1, words)
+            rows = _bit_rows(above)
+            ties = matched & self._at_least(field, low, words) & ~above
+            rows = np.concatenate([rows, _bit_rows(ties, limit - len(rows))[:limit - len(rows)]])
+        order = np.lexsort((rows, -self._scores[field][rows]))
+        return rows[order[:limit]]
+
+    def row(self, row: int) -> Dict:
+        lead = {"id": self.keys[row]}
+        for field in CATEGORICAL_FIELDS:
+            lead[field] = self._labels[field][self._codes[field][row]]
+        for field in NUMERIC_FIELDS:
+            lead[field] = int(self._scores[field][row]) / 10
+        lead[INDICATOR_FIELD] = list(self._indicators[row])
+        return lead
+
+    def stats(self) -> Dict:
+        return {
+            "leads": self.size,
+            "bitmaps": len(self._bitmaps) + LEVELS * len(NUMERIC_FIELDS),
+            "bytes": int(self._all.nbytes + sum(b.nbytes for b in self._bitmaps.values())
+                         + sum(r.nbytes for r in self._ranges.values()))
+        }
+
+
+def load_results(lines: Iterable[str]) -> Tuple[List, List[Dict]]:
+    # Scored JSONL as written by bio_score_fast --jsonl ({"id", "result"}) or
+    # parallel_scoring ({"type", "input", "result"}); bare result objects also work
+    keys, results = [], []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if "result" in record:
+            if record.get("type", "bio") != "bio":
+                continue
+            keys.append(record.get("id", record.get("input", line_number)))
+            results.append(record["result"])
+        else:
+            keys.append(line_number)
+            results.append(record)
+    return keys, results
+
+
+if __name__ == "__main__":
+    # python lead_query.py scored.jsonl '{"where": {"business_type": "Fitness", "pitch_score": [">=", 7]},
+    #                                     "order_by": "urgency_score", "limit": 50}'
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        keys, results = load_results(f)
+    index = LeadIndex(len(results))
+    index.add(results, keys)
+    request = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+    # Numeric conditions come as [">=", 7] or [[">=", 5], ["<", 8]]
+    where = request.get("where") or {}
+    print(json.dumps({
+        "count": index.count(where),
+        "leads": index.query(where, request.get("order_by"), request.get("limit", 50))
+    }, indent=2))
@@ -0,0 +1,177 @@
+import sys
+import json
+import heapq
+import threading
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from bio_score_fast import RECOMMENDATIONS, ProfessionalBioAnalyzer
+
+# Streaming top-K ranking of the hottest leads per (business_type, region).
+#
+# Each scored lead is pushed into a size-K min-heap for its group and into an overall
+# heap; once a heap is full the new lead only displaces the current weakest entry, so
+# memory is O(K) per group however many leads stream past (groups are bounded by the
+# keyword tables: business types x regions). Only a compact entry is kept, never the
+# full analyze_bio dict.
+#
+# Rank key, best first: recommendation tier (HOT > WARM > QUALIFIED > HIGH-VALUE >
+# STANDARD > INSUFFICIENT), then score, then urgency_score, then arrival order.
+# score = pitch_score, or with vision_weight w:
+#   (1 - w) * pitch_score + w * professional_score
+#
+# snapshot() can be called from another thread at any point of the run.
+#
+#   python lead_ranker.py bios.jsonl [k] [vision_weight] [--every N] > top.json
+
+DEFAULT_K = 10
+OVERALL = ("*", "*")
+
+# Tier of each recommendation text, hottest first
+TIER_ORDER = ("hot", "warm", "qualified", "high_value_industry", "standard", "insufficient_data")
+_TIER_RANK = {RECOMMENDATIONS[tier]: len(TIER_ORDER) - position for position, tier in enumerate(TIER_ORDER)}
+
+
+class TopKRanker:
+    def __init__(self, k: int = DEFAULT_K, vision_weight: float = 0.0):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.vision_weight = vision_weight
+        self.seen = 0
+        # (business_type, region) -> min-heap of (rank key, entry)
+        self._heaps: Dict[Tuple[str, str], List[Tuple[Tuple, Dict]]] = {}
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+    def score(self, bio_result: Dict, vision_result: Optional[Dict] = None) -> float:
+        pitch_score = bio_result.get("pitch_score", 0.0)
+        if vision_result is None or not self.vision_weight:
+            return pitch_score
+        professional_score = vision_result.get("professional_score", 0.0)
+        return round((1 - self.vision_weight) * pitch_score + self.vision_weight * professional_score, 2)
+
+    def push(self, lead_id, bio_result: Dict, vision_result: Optional[Dict] = None) -> bool:
+        # True when the lead made it into at least one top-K list
+        recommendation = bio_result.get("recommendation", "")
+        score = self.score(bio_result, vision_result)
+        urgency_score = bio_result.get("urgency_score", 0.0)
+        # Negated sequence: among equal leads the earlier one ranks higher
+        key = (_TIER_RANK.get(recommendation, 0), score, urgency_score, -next(self._sequence))
+        group = (bio_result.get("business_type", "Unknown"), bio_result.get("region", "Unknown"))
+
+        with self._lock:
+            self.seen += 1
+            heaps = self._heaps
+            if not self._qualifies(heaps.get(group), key) and not self._qualifies(heaps.get(OVERALL), key):
+                return False
+
+            entry = {
+                "id": lead_id,
+                "score": score,
+                "pitch_score": bio_result.get("pitch_score", 0.0),
+                "urgency_score": urgency_score,
+                "business_type": group[0],
+                "region": group[1],
+                "recommendation": recommendation
+            }
+            if vision_result is not None:
+                entry["professional_score"] = vision_result.get("professional_score", 0.0)
+            kept = False
+            for heap_key in (group, OVERALL):
+                heap = heaps.setdefault(heap_key, [])
+                if len(heap) < self.k:
+                    heapq.heappush(heap, (key, entry))
+                    kept = True
+                elif key > heap[0][0]:
+                    heapq.heapreplace(heap, (key, entry))
+                    kept = True
+            return kept
+
+    def _qualifies(self, heap: Optional[List], key: Tuple) -> bool:
+        return heap is None or len(heap) < self.k or key > heap[0][0]
+
+    def snapshot(self, business_type: Optional[str] = None, region: Optional[str] = None,
+                 limit: Optional[int] = None) -> List[Dict]:
+        # Current top leads, best first: one group, every group of a business type or
+        # region (merged), or the overall list when neither is given
+        with self._lock:
+            if business_type is None and region is None:
+                items = list(self._heaps.get(OVERALL, ()))
+            else:
+                items = [item for group, heap in self._heaps.items() if group != OVERALL
+                         and business_type in (None, group[0]) and region in (None, group[1])
+                         for item in heap]
+        items.sort(key=lambda item: item[0], reverse=True)
+        return [dict(entry) for _, entry in items[:limit or self.k]]
+
+    def groups(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return sorted(group for group in self._heaps if group != OVERALL)
+
+    def snapshot_groups(self) -> Dict:
+        return {
+            "seen": self.seen,
+            "top": self.snapshot(),
+            "groups": [{"business_type": business_type, "region": region,
+                        "top": self.snapshot(business_type, region)}
+                       for business_type, region in self.groups()]
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"seen": self.seen, "k": self.k, "groups": len(self._heaps) - (OVERALL in self._heaps),
+                    "entries": sum(len(heap) for heap in self._heaps.values())}
+
+
+def rank_bios(records: Iterable[Tuple[object, str]], ranker: TopKRanker = None,
+              analyzer: ProfessionalBioAnalyzer = None) -> Iterator[Tuple[object, Dict]]:
+    # Scores (id, bio) records into the ranker, yielding each result as it passes so
+    # callers can keep streaming it elsewhere (or just exhaust the generator)
+    ranker = ranker or TopKRanker()
+    analyzer = analyzer or ProfessionalBioAnalyzer()
+    for lead_id, bio_text in records:
+        result = analyzer.analyze_bio(bio_text)
+        ranker.push(lead_id, result)
+        yield lead_id, result
+
+
+def read_leads_jsonl(stream: TextIO) -> Iterator[Tuple[object, str, Optional[Dict]]]:
+    # {"id" | "username", "bio", optional "visionScore" / "professional_score"} per line
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            yield line_number, record or "", None
+            continue
+        vision_result = record.get("visionScore")
+        if vision_result is None and "professional_score" in record:
+            vision_result = {"professional_score": record["professional_score"]}
+        yield record.get("id", record.get("username", line_number)), record.get("bio") or "", vision_result
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    every = 0
+    if "--every" in args:
+        position = args.index("--every")
+        every = int(args[position + 1])
+        del args[position:position + 2]
+    source = args[0] if args else "-"
+    ranker = TopKRanker(int(args[1]) if len(args) > 1 else DEFAULT_K,
+                        float(args[2]) if len(args) > 2 else 0.0)
+    analyzer = ProfessionalBioAnalyzer()
+
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for lead_id, bio_text, vision_result in read_leads_jsonl(stream):
+            ranker.push(lead_id, analyzer.analyze_bio(bio_text), vision_result)
+            if every and ranker.seen % every == 0:
+                # Mid-run snapshot of the overall top-K
+                sys.stderr.write(json.dumps({"seen": ranker.seen, "top": ranker.snapshot()}) + "\n")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    print(json.dumps(dict(ranker.snapshot_groups(), stats=ranker.stats()), indent=2))
@@ -0,0 +1,302 @@
+import sys
+import json
+import os
+import re
+import math
+import random
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from bio_score_fast import ProfessionalBioAnalyzer
+from vision_score import ProfessionalVisionAnalyzer
+
+# Fused lead scoring: one call turns a scraped profile into the final lead object.
+#
+# scraper_apify.js used to make two Python round trips per profile (bio_score_fast.py,
+# then vision_score.py), re-scan the bio in JS for contact details (extractContactInfo)
+# and combine everything in calculateLeadScore. score_lead() does all of it in one pass
+# over the profile; the functions below are line-for-line ports of the JS helpers and
+# return the same objects (analyze_activity keeps the JS random engagement estimate).
+#
+# Contact extraction: the two word lists are one alternation scanned once (a match is
+# a whole \b-bounded word and the lists share none, so neither can hide the other);
+# the email pattern only runs on bios containing "@". Patterns use re.ASCII so \b and
+# the case-insensitive flag behave like the JS regexes.
+#
+# Input is the profileData object scraper_apify.js builds (username, bio, followers,
+# screenshotPath, ...), plus an optional "keyword". Reachable through scoring_worker.py
+# as {"type": "lead", "input": {...profile}}, or:
+#
+#   python lead_score.py '{"username": "...", "bio": "...", "screenshotPath": null}'
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Matches scraper_apify.js when a profile has no screenshot
+NO_SCREENSHOT_SCORE = {"professional_score": 5}
+
+_EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", re.ASCII)
+_PHONE = re.compile(r"(\+?1?[-.\s]?)?(\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})", re.ASCII)
+_CONTACT_WORDS = re.compile(
+    r"\b(?:(?P<dm>dm|message|contact|email)|(?P<business>booking|appointments|consultation|inquiry))\b",
+    re.IGNORECASE | re.ASCII
+)
+
+# (minimum score, tier, priority, action, factor); below the last one a lead is COLD
+TIERS = (
+    (80, "HOT", 1, "Contact immediately!", "🔥 HOT LEAD"),
+    (60, "WARM", 2, "Contact within 24 hours", "🌟 WARM LEAD"),
+    (40, "QUALIFIED", 3, "Add to outreach campaign", "💼 QUALIFIED LEAD")
+)
+
+
+def _number(value) -> Optional[float]:
+    # JS relational comparisons against undefined/null/strings are false
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _at_least(value, threshold: float) -> bool:
+    value = _number(value)
+    return value is not None and value >= threshold
+
+
+def _js_round(value: float) -> float:
+    # Math.round rounds halves up; Python's round() rounds them to even
+    return math.floor(value + 0.5)
+
+
+def extract_contact_info(profile: Dict) -> Dict:
+    # Port of extractContactInfo
+    methods = []
+    has_direct_contact = False
+
+    bio = profile.get("bio")
+    if bio:
+        if "@" in bio and _EMAIL.search(bio):
+            methods.append("Email in bio")
+            has_direct_contact = True
+        if _PHONE.search(bio):
+            methods.append("Phone in bio")
+            has_direct_contact = True
+
+        dm = business = False
+        for match in _CONTACT_WORDS.finditer(bio):
+            if match.group("dm"):
+                dm = True
+            else:
+                business = True
+            if dm and business:
+                break
+        if dm:
+            methods.append("DM welcome")
+        if business:
+            methods.append("Business inquiries")
+
+    if profile.get("externalUrl"):
+        methods.append("Website link")
+
+    return {
+        "hasDirectContact": has_direct_contact,
+        "contactMethods": len(methods),
+        "methods": methods
+    }
+
+
+def analyze_activity(profile: Dict) -> Dict:
+    # Port of analyzeActivity (which reads postCount/followerCount/avgLikes)
+    post_count = _number(profile.get("postCount"))
+    is_active = post_count is not None and post_count > 0 and not profile.get("isPrivate")
+
+    engagement_rate = 0.0
+    engagement_tier = "Low"
+    is_high_engagement = False
+
+    follower_count = _number(profile.get("followerCount"))
+    if follower_count is not None and follower_count > 0:
+        avg_likes = profile.get("avgLikes")
+        engagement_rate = (avg_likes / follower_count) * 100 if avg_likes else random.random() * 5
+
+        if engagement_rate > 3:
+            engagement_tier = "High"
+            is_high_engagement = True
+        elif engagement_rate > 1:
+            engagement_tier = "Good"
+        elif engagement_rate > 0.5:
+            engagement_tier = "Average"
+
+    activity = {
+        "isActive": is_active,
+        "hasActiveStory": False,
+        "isVerified": profile.get("isVerified"),
+        "lastActivity": "recent",
+        "engagementRate": _js_round(engagement_rate * 100) / 100,
+        "engagementTier": engagement_tier,
+        "isHighEngagement": is_high_engagement
+    }
+    if activity["isVerified"] is None:
+        # JSON.stringify drops undefined fields
+        del activity["isVerified"]
+    return activity
+
+
+def calculate_lead_score(profile: Dict, bio_score: Optional[Dict], vision_score: Optional[Dict]) -> Dict:
+    # Port of calculateLeadScore; contact/activity weights read profile["contactInfo"]
+    # and profile["activityData"] exactly as the JS reads profileData's
+    score = 0
+    factors = []
+    pitch_score = (bio_score or {}).get("pitch_score")
+    contact_info = profile.get("contactInfo") or {}
+    activity = profile.get("activityData") or {}
+    professional_score = (vision_score or {}).get("professional_score")
+
+    # Bio Analysis (30% weight)
+    if _at_least(pitch_score, 8):
+        score += 30
+        factors.append("Excellent Bio Score")
+    elif _at_least(pitch_score, 6):
+        score += 20
+        factors.append("Good Bio Score")
+    elif _at_least(pitch_score, 4):
+        score += 10
+        factors.append("Average Bio Score")
+
+    # Contact Availability (25% weight)
+    if contact_info.get("hasDirectContact"):
+        score += 15
+        factors.append("Direct Contact Available")
+    if _at_least(contact_info.get("contactMethods"), 3):
+        score += 10
+        factors.append("Multiple Contact Methods")
+    elif _at_least(contact_info.get("contactMethods"), 1):
+        score += 5
+
+    # Activity Level (20% weight)
+    if activity.get("isActive"):
+        score += 15
+        factors.append("Recently Active")
+    if activity.get("hasActiveStory"):
+        score += 5
+        factors.append("Active Stories")
+    if activity.get("isVerified"):
+        score += 3
+        factors.append("Verified Account")
+
+    # Engagement Quality (15% weight)
+    if activity.get("isHighEngagement"):
+        score += 15
+        factors.append("High Engagement Rate")
+    elif activity.get("engagementTier") == "Good":
+        score += 10
+        factors.append("Good Engagement")
+    elif activity.get("engagementTier") == "Average":
+        score += 5
+
+    # Visual Quality (10% weight)
+    if _at_least(professional_score, 8):
+        score += 10
+        factors.append("Professional Visuals")
+    elif _at_least(professional_score, 6):
+        score += 5
+
+    tier, priority, action = "COLD", 4, "Add to nurture sequence"
+    for minimum, tier_name, tier_priority, tier_action, factor in TIERS:
+        if score >= minimum:
+            tier, priority, action = tier_name, tier_priority, tier_action
+            factors.append(factor)
+            break
+
+    return {
+        "score": min(score, 100),
+        "tier": tier,
+        "priority": priority,
+        "action": action,
+        "factors": factors,
+        "confidence": "High" if len(factors) >= 3 else "Medium" if len(factors) >= 2 else "Low"
+    }
+
+
+def _screenshot_field(path: Optional[str]) -> Optional[str]:
+    # finalScreenshotPath.replace(__dirname, '').replace(/\\/g, '/')
+    if not path:
+        return None
+    return path.replace(BACKEND_DIR, "", 1).replace("\\", "/")
+
+
+def _iso_now() -> str:
+    # new Date().toISOString()
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class LeadScorer:
+    def __init__(self, bio: Callable[[str], Dict] = None, vision: Callable[[str], Dict] = None):
+        # bio/vision: scoring functions, by default fresh analyzers' analyze_bio and
+        # analyze_image (scoring_worker.py passes its cached ones)
+        self.bio = bio or ProfessionalBioAnalyzer().analyze_bio
+        self.vision = vision or ProfessionalVisionAnalyzer().analyze_image
+
+    def score_lead(self, profile: Dict) -> Dict:
+        if not isinstance(profile, dict):
+            raise ValueError("Lead input must be a profile object")
+
+        screenshot_path = profile.get("screenshotPath")
+        contact_info = extract_contact_info(profile)
+        activity = analyze_activity(profile)
+        bio_score = self.bio(profile.get("bio") or "")
+        vision_score = self.vision(screenshot_path) if screenshot_path else dict(NO_SCREENSHOT_SCORE)
+        # As in the scraper, the score reads the profile's own contactInfo/activityData
+        # (present when the caller supplies them), not the objects computed above
+        lead_score = calculate_lead_score(profile, bio_score, vision_score)
+
+        return {
+            "username": profile.get("username"),
+            "displayName": profile.get("displayName"),
+            "bio": profile.get("bio"),
+            "followers": profile.get("followers"),
+            "following": profile.get("following"),
+            "posts": profile.get("posts"),
+            "isVerified": profile.get("isVerified"),
+            "isPrivate": profile.get("isPrivate"),
+            "url": profile.get("url"),
+            "profilePicUrl": profile.get("profilePicUrl"),
+            "externalUrl": profile.get("externalUrl"),
+            "businessCategory": profile.get("businessCategory"),
+            "isBusinessAccount": profile.get("isBusinessAccount"),
+            "screenshot": _screenshot_field(screenshot_path),
+
+            "contactInfo": contact_info,
+            "activityData": activity,
+
+            "bioScore": bio_score,
+            "visionScore": vision_score,
+            "leadScore": lead_score["score"],
+            "leadTier": lead_score["tier"],
+            "leadPriority": lead_score["priority"],
+            "leadAction": lead_score["action"],
+            "leadConfidence": lead_score["confidence"],
+            "leadFactors": lead_score["factors"],
+
+            "scrapedAt": _iso_now(),
+            "source": "apify_instagram",
+            "keyword": profile.get("keyword"),
+            "dataQuality": "high"
+        }
+
+
+_shared_scorer = None
+
+
+def score_lead(profile: Dict) -> Dict:
+    global _shared_scorer
+    if _shared_scorer is None:
+        _shared_scorer = LeadScorer()
+    return _shared_scorer.score_lead(profile)
+
+
+if __name__ == "__main__":
+    # python lead_score.py '<profile json>'   or   python lead_score.py --jsonl < profiles.jsonl
+    args = sys.argv[1:]
+    if args and args[0] == "--jsonl":
+        for line in sys.stdin:
+            if line.strip():
+                print(json.dumps(score_lead(json.loads(line))))
+    else:
+        print(json.dumps(score_lead(json.loads(args[0] if args else sys.stdin.read()))))
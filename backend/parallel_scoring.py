@@ -0,0 +1,115 @@
+import sys
+import json
+import os
+import glob
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, List, Optional
+
+from bio_score_fast import ProfessionalBioAnalyzer
+from vision_score import ProfessionalVisionAnalyzer
+
+# Multi-core scoring driver: spreads a backlog of bios or screenshot paths over a
+# process pool. Each worker builds its analyzer once (pool initializer), work is
+# dispatched in chunks to amortize IPC, and results come back in input order.
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+SESSIONS_DIR = os.path.join(BACKEND_DIR, "saved", "sessions")
+
+DEFAULT_CHUNKSIZE = 64
+
+_worker_kind = None
+_worker_analyzer = None
+
+
+def _build_analyzer(kind: str):
+    if kind == "bio":
+        return ProfessionalBioAnalyzer()
+    if kind == "vision":
+        return ProfessionalVisionAnalyzer()
+    raise ValueError(f"Unknown scoring type: {kind}")
+
+
+def _init_worker(kind: str):
+    global _worker_kind, _worker_analyzer
+    _worker_kind = kind
+    _worker_analyzer = _build_analyzer(kind)
+
+
+def _score_chunk(chunk: List) -> List[Dict]:
+    if _worker_kind == "bio":
+        return [_worker_analyzer.analyze_bio(item) for item in chunk]
+    return [_worker_analyzer.analyze_image(item) for item in chunk]
+
+
+def score_parallel(items: Iterable, kind: str = "bio", processes: Optional[int] = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE,
+                   progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+    # kind: "bio" (items are bio strings) or "vision" (items are image paths)
+    items = list(items)
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    processes = processes or os.cpu_count() or 1
+    results: List[Dict] = []
+
+    if processes == 1 or len(chunks) <= 1:
+        _init_worker(kind)
+        for chunk in map(_score_chunk, chunks):
+            results.extend(chunk)
+            if progress:
+                progress(len(results), len(items))
+        return results
+
+    with Pool(min(processes, len(chunks)), initializer=_init_worker, initargs=(kind,)) as pool:
+        # imap keeps input order while later chunks are already being scored
+        for chunk in pool.imap(_score_chunk, chunks):
+            results.extend(chunk)
+            if progress:
+                progress(len(results), len(items))
+    return results
+
+
+def collect_session_bios(sessions_dir: str = SESSIONS_DIR) -> List[str]:
+    # All lead bios stored in saved scraping sessions (deduplicated, in file order)
+    bios: Dict[str, None] = {}
+    for path in sorted(glob.glob(os.path.join(sessions_dir, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            continue
+        leads = session.get("leads", []) if isinstance(session, dict) else session
+        for lead in leads if isinstance(leads, list) else []:
+            if isinstance(lead, dict) and isinstance(lead.get("bio"), str) and lead["bio"]:
+                bios[lead["bio"]] = None
+    return list(bios)
+
+
+def list_screenshots(screenshots_dir: str = SCREENSHOTS_DIR) -> List[str]:
+    return sorted(
+        entry.path for entry in os.scandir(screenshots_dir)
+        if entry.is_file() and entry.name.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))
+    )
+
+
+def _print_progress(label: str) -> Callable[[int, int], None]:
+    def report(done: int, total: int):
+        sys.stderr.write(f"\r[{label}] {done}/{total}")
+        if done == total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+    return report
+
+
+if __name__ == "__main__":
+    # Rescore every screenshot and every stored bio:
+    #   python parallel_scoring.py [processes] [chunksize] > rescored.jsonl
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNKSIZE
+
+    screenshots = list_screenshots()
+    for path, result in zip(screenshots, score_parallel(screenshots, "vision", processes, chunksize, _print_progress("vision"))):
+        print(json.dumps({"type": "vision", "input": os.path.relpath(path, BACKEND_DIR), "result": result}))
+
+    bios = collect_session_bios()
+    for bio, result in zip(bios, score_parallel(bios, "bio", processes, chunksize, _print_progress("bio"))):
+        print(json.dumps({"type": "bio", "input": bio, "result": result}))
@@ -0,0 +1,199 @@
+import sys
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import vision_score
+
+# Perceptual-hash index for screenshots.
+#
+# Each image is reduced to a 64-bit difference hash (dHash): grayscale 9x8 thumbnail,
+# one bit per horizontally adjacent pixel pair. The thumbnail is taken from the reduced
+# pixels vision scoring already decoded (or the normalized copy), so indexing adds no
+# second decode. Re-captures of the same profile, and
+# the many identical login walls / placeholders, land within a few bits of each other.
+# Hashes are kept in a BK-tree so near-duplicates are found by Hamming distance without
+# comparing against every stored image.
+#
+# Only the pixel statistics of a near-duplicate are reused, never its whole result:
+# vision_score.py still computes the file name and size based scores for each file.
+#
+#   python phash_index.py dedupe [directory] [max_distance]   -> print near-duplicate groups
+#   python phash_index.py index  [directory]                  -> index everything
+#   python scoring_worker.py --phash                           -> worker using the index
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_PATH = os.path.join(BACKEND_DIR, "cache", "phash_index.json")
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+
+DEFAULT_MAX_DISTANCE = 4
+# Entries hold {"hash", "path", "stats"}; bump when that layout (or the hash) changes
+INDEX_FORMAT = 3
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def dhash_pixels(rgb) -> int:
+    # rgb: uint8 HxWx3 array, as ProfessionalVisionAnalyzer.image_pixels returns it
+    np, Image = vision_score._pixel_libraries()
+    gray = (rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)).astype(np.uint8)
+    pixels = Image.fromarray(gray, "L").resize((9, 8), Image.BILINEAR).tobytes()
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def dhash(image_path, analyzer: vision_score.ProfessionalVisionAnalyzer = None) -> Optional[int]:
+    # image_path: a path or a binary file object; None if not decodable
+    analyzer = analyzer or vision_score.ProfessionalVisionAnalyzer()
+    pixels = analyzer.image_pixels(image_path)
+    return dhash_pixels(pixels[0]) if pixels is not None else None
+
+
+class BKTree:
+    def __init__(self):
+        self._root = None  # (hash, payload, {distance: child})
+        self.size = 0
+
+    def add(self, value: int, payload) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = (value, payload, {})
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, payload, {})
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        # All (distance, payload) within max_distance, nearest first
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_value, payload, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                found.append((distance, payload))
+            # Triangle inequality: only subtrees at |d - distance| <= max_distance can match
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+class PerceptualIndex:
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.path = path
+        self.max_distance = max_distance
+        self.entries: List[Dict] = []
+        self.hits = 0
+        self.misses = 0
+        self._tree = BKTree()
+        # Inserts and searches may come from several scoring threads (async_vision_scoring.py)
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Statistics from another scorer version or index layout are not reused
+            if data.get("version") == vision_score.SCORER_VERSION and data.get("format") == INDEX_FORMAT:
+                for entry in data.get("entries", []):
+                    self._insert(entry)
+
+    def _insert(self, entry: Dict):
+        with self._lock:
+            self.entries.append(entry)
+            self._tree.add(int(entry["hash"], 16), entry)
+
+    def nearest(self, value: int) -> Optional[Tuple[int, Dict]]:
+        # Under the lock: a search walks the child dicts an insert may be growing
+        with self._lock:
+            matches = self._tree.search(value, self.max_distance)
+        return matches[0] if matches else None
+
+    def lookup(self, value: Optional[int]) -> Optional[Tuple[int, Dict]]:
+        # (distance, nearest entry) for a dhash_pixels() hash, or None (also for no hash)
+        if value is None:
+            return None
+        match = self.nearest(value)
+        if match is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match
+
+    def add(self, image_path: str, value: int, image_stats: Dict[str, float]):
+        self._insert({"hash": format(value, "016x"), "path": image_path, "stats": image_stats})
+
+    def save(self, path: str = None):
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with self._lock:
+            entries = list(self.entries)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": vision_score.SCORER_VERSION, "format": INDEX_FORMAT, "entries": entries}, f)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+def iter_images(directory: str) -> Iterator[str]:
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+            yield entry.path
+
+
+def find_duplicate_groups(directory: str, max_distance: int = DEFAULT_MAX_DISTANCE) -> List[List[str]]:
+    # Groups of near-identical images; the first path of each group is its representative
+    tree = BKTree()
+    groups: List[List[str]] = []
+    analyzer = vision_score.ProfessionalVisionAnalyzer()
+    for path in iter_images(directory):
+        value = dhash(path, analyzer)
+        if value is None:
+            continue
+        matches = tree.search(value, max_distance)
+        if matches:
+            groups[matches[0][1]].append(path)
+        else:
+            tree.add(value, len(groups))
+            groups.append([path])
+    return [group for group in groups if len(group) > 1]
+
+
+if __name__ == "__main__":
+    # Duplicates are only reported: each <username>.png is the screenshot its lead points to
+    args = sys.argv[1:]
+    command = args[0] if args else "dedupe"
+    directory = args[1] if len(args) > 1 else SCREENSHOTS_DIR
+
+    if command == "index":
+        index = PerceptualIndex()
+        analyzer = vision_score.ProfessionalVisionAnalyzer(phash_index=index)
+        for path in iter_images(directory):
+            analyzer.analyze_image(path)
+        index.save()
+        print(json.dumps(index.stats()))
+    else:
+        max_distance = int(args[2]) if len(args) > 2 else DEFAULT_MAX_DISTANCE
+        groups = find_duplicate_groups(directory, max_distance)
+        print(json.dumps({
+            "groups": len(groups),
+            "duplicates": sum(len(group) - 1 for group in groups),
+            "largest_groups": [group[:5] + (["..."] if len(group) > 5 else []) for group in sorted(groups, key=len, reverse=True)[:10]]
+        }, indent=2))
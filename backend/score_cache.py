@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import bio_score_fast
+import vision_score
+
+# Content-addressed score cache shared by the Python scorers and the Node side.
+#
+# Rows live in one SQLite table (WAL mode, so readers never block the scorer):
+#
+#   scores(kind TEXT, content_hash TEXT, version TEXT, result TEXT, size INTEGER,
+#          created_at REAL, last_access REAL)   PRIMARY KEY (kind, content_hash, version)
+#
+# content_hash is the SHA-256 of the bio text (UTF-8) or of the image bytes, so a
+# re-scraped screenshot or a repeated template bio is found regardless of path or
+# username. version is the scorer's SCORER_VERSION (plus the keyword table
+# fingerprint for bios); changing either orphans old rows, which then age out
+# through LRU eviction. result is the scorer's JSON output, readable from Node
+# with any SQLite driver (or the sqlite3 CLI).
+#
+# Hits do not write: their access times are buffered and flushed in one transaction
+# every ACCESS_FLUSH_SIZE hits or ACCESS_FLUSH_SECONDS, and before eviction or close.
+# Several processes share the file, so the in-memory entry/byte counts are only a
+# trigger; eviction (and stats()) read the real totals from SQLite, and the counts are
+# resynced from SQLite every RESYNC_PUTS writes.
+#
+# One cache may be shared across threads (scoring_server.py creates it on the event
+# loop thread and scores on its "scoring" thread; metrics collectors call stats() from
+# wherever they dump), so the connection is not bound to its creating thread and every
+# use of it holds a lock.
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(BACKEND_DIR, "cache", "scores.db")
+
+DEFAULT_MAX_ENTRIES = 200000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+ACCESS_FLUSH_SIZE = 256
+ACCESS_FLUSH_SECONDS = 5.0
+RESYNC_PUTS = 1000
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bio_key(bio_text) -> str:
+    # A non-string bio scores like an empty one, so it shares the empty bio's row
+    return content_hash((bio_text if isinstance(bio_text, str) else "").encode("utf-8"))
+
+
+class ScoreCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # (kind, content_hash, version) -> last access time not yet written
+        self._accessed: Dict[Tuple[str, str, str], float] = {}
+        self._accessed_since = 0.0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                kind TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (kind, content_hash, version)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_last_access ON scores (last_access)")
+        self._db.commit()
+
+        self._entries, self._bytes = self._totals()
+
+    def _totals(self) -> Tuple[int, int]:
+        return self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scores").fetchone()
+
+    def get(self, kind: str, key: str, version: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM scores WHERE kind = ? AND content_hash = ? AND version = ?",
+                (kind, key, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            now = time.time()
+            if not self._accessed:
+                self._accessed_since = now
+            self._accessed[(kind, key, version)] = now
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE or now - self._accessed_since >= ACCESS_FLUSH_SECONDS:
+                self._flush_access()
+                self._db.commit()
+        return json.loads(row[0])
+
+    def _flush_access(self):
+        # Write buffered access times (the caller holds the lock and commits)
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE scores SET last_access = ? WHERE kind = ? AND content_hash = ? AND version = ?",
+                [(accessed, kind, key, version) for (kind, key, version), accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def put(self, kind: str, key: str, version: str, result: Dict):
+        payload = json.dumps(result)
+        with self._lock:
+            now = time.time()
+            previous = self._db.execute(
+                "SELECT size FROM scores WHERE kind = ? AND content_hash = ? AND version = ?",
+                (kind, key, version)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, version, payload, len(payload), now, now)
+            )
+            if previous is None:
+                self._entries += 1
+            else:
+                self._bytes -= previous[0]
+            self._bytes += len(payload)
+            self._accessed.pop((kind, key, version), None)
+
+            self._puts += 1
+            if self._entries > self.max_entries or self._bytes > self.max_bytes or self._puts % RESYNC_PUTS == 0:
+                self._evict()
+            self._flush_access()
+            self._db.commit()
+
+    def _evict(self):
+        # Caller holds the lock. Resync the counts from SQLite (other processes write too);
+        # if over either limit, drop least recently used rows until 90% of both limits
+        self._flush_access()
+        self._entries, self._bytes = self._totals()
+        if self._entries <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        cursor = self._db.execute("SELECT kind, content_hash, version, size FROM scores ORDER BY last_access")
+        doomed = []
+        for kind, key, version, size in cursor:
+            if self._entries <= target_entries and self._bytes <= target_bytes:
+                break
+            doomed.append((kind, key, version))
+            self._entries -= 1
+            self._bytes -= size
+        self._db.executemany("DELETE FROM scores WHERE kind = ? AND content_hash = ? AND version = ?", doomed)
+
+    def cached(self, kind: str, key: str, version: str, score: Callable[[], Dict]) -> Dict:
+        # Error results (an unreadable or vanished image) are returned but never stored,
+        # so a transient failure is scored again next time instead of sticking
+        result = self.get(kind, key, version)
+        if result is None:
+            result = score()
+            if "error" not in result:
+                self.put(kind, key, version, result)
+        return result
+
+    def bio_score(self, analyzer: bio_score_fast.ProfessionalBioAnalyzer, bio_text: str) -> Dict:
+        key = _bio_key(bio_text)
+        # Keyword table edits change the fingerprint, so they invalidate cached bios too
+        version = f"{bio_score_fast.SCORER_VERSION}:{analyzer.tables_fingerprint}"
+        return self.cached("bio", key, version, lambda: analyzer.analyze_bio(bio_text))
+
+    def bio_scores(self, analyzer: bio_score_fast.ProfessionalBioAnalyzer, bios: List[str]) -> List[Dict]:
+        # bio_score for a batch: cached bios are looked up, the rest scored in one analyze_bios call
+        version = f"{bio_score_fast.SCORER_VERSION}:{analyzer.tables_fingerprint}"
+        keys = [_bio_key(bio_text) for bio_text in bios]
+        results = [self.get("bio", key, version) for key in keys]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if missing:
+            for position, result in zip(missing, analyzer.analyze_bios([bios[position] for position in missing])):
+                if "error" not in result:
+                    self.put("bio", keys[position], version, result)
+                results[position] = result
+        return results
+
+    def vision_score(self, analyzer: vision_score.ProfessionalVisionAnalyzer, image_path: str) -> Dict:
+        if not image_path or not os.path.isfile(image_path):
+            return analyzer.analyze_image(image_path)
+        # The vision score also depends on the file name, so it is part of the key
+        key = content_hash(file_hash(image_path).encode("ascii") + os.path.basename(image_path).lower().encode("utf-8"))
+        return self.cached("vision", key, vision_score.SCORER_VERSION, lambda: analyzer.analyze_image(image_path))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._entries, self._bytes = self._totals()
+        return {
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._db.commit()
+            self._db.close()
+
+
+if __name__ == "__main__":
+    # python score_cache.py -> prints entry count, size and this process's hit/miss counters
+    cache = ScoreCache()
+    print(json.dumps(cache.stats()))
+    cache.close()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable
+
+# Opt-in stage timing for the scorers.
+#
+# Enable with SCORING_METRICS=1 (or --metrics on the scorer CLIs and the worker).
+# Analyzers built while it is on replace their stage methods on the instance with
+# timing wrappers; analyzers built while it is off are untouched, so the disabled
+# cost is a single check per analyzer construction and nothing per call.
+#
+# Every stage records calls, total and max seconds. Cache counters (bio memo, phash
+# index, score cache) are read from their stats() methods when a snapshot is taken.
+# Snapshots dump as JSON or Prometheus text; per-stage averages feed
+# SystemMetrics.avgProcessingTime and the error stage count feeds errorCount.
+#
+#   SCORING_METRICS=1 SCORING_METRICS_FILE=metrics.prom python bio_score_fast.py "..."
+
+ENV_VAR = "SCORING_METRICS"
+FILE_ENV_VAR = "SCORING_METRICS_FILE"
+
+_enabled = os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "false", "off")
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    # Only affects analyzers constructed afterwards
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+class Metrics:
+    def __init__(self):
+        self.stages: Dict[str, list] = {}  # "scorer.stage" -> [calls, total_seconds, max_seconds]
+        self._collectors: Dict[str, Callable[[], Dict]] = {}
+
+    def observe(self, stage: str, seconds: float):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds, seconds]
+            return
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        observe = self.observe
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(stage, clock() - started)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def instrument(self, obj, scorer: str, method_names: Iterable[str]):
+        # Wrap the class functions (not whatever is on the instance), so instrumenting
+        # the same object twice never nests wrappers
+        for name in method_names:
+            method = getattr(type(obj), name).__get__(obj)
+            setattr(obj, name, self.timed(f"{scorer}.{name.lstrip('_')}", method))
+
+    def register_collector(self, name: str, collect: Callable[[], Dict]):
+        # collect() returns {counter: number}; later registrations replace earlier ones
+        self._collectors[name] = collect
+
+    def reset(self):
+        self.stages.clear()
+
+    def snapshot(self) -> Dict:
+        stages = {}
+        for stage, (calls, total, peak) in sorted(self.stages.items()):
+            stages[stage] = {
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total * 1000 / calls, 4),
+                "max_ms": round(peak * 1000, 3)
+            }
+        counters = {}
+        for name, collect in sorted(self._collectors.items()):
+            counters[name] = {key: value for key, value in collect().items()
+                              if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        return {"enabled": _enabled, "stages": stages, "counters": counters}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP scoring_stage_calls_total Calls per scorer stage.",
+            "# TYPE scoring_stage_calls_total counter"
+        ]
+        labelled = [(_stage_labels(stage), values) for stage, values in snapshot["stages"].items()]
+        lines += [f"scoring_stage_calls_total{{{labels}}} {values['calls']}" for labels, values in labelled]
+        lines += [
+            "# HELP scoring_stage_seconds_total Time spent per scorer stage.",
+            "# TYPE scoring_stage_seconds_total counter"
+        ]
+        lines += [f"scoring_stage_seconds_total{{{labels}}} {values['total_ms'] / 1000:.6f}" for labels, values in labelled]
+        lines += [
+            "# HELP scoring_stage_seconds_max Slowest single call per scorer stage.",
+            "# TYPE scoring_stage_seconds_max gauge"
+        ]
+        lines += [f"scoring_stage_seconds_max{{{labels}}} {values['max_ms'] / 1000:.6f}" for labels, values in labelled]
+        lines += [
+            "# HELP scoring_cache_counter Cache counters (hits, misses, entries, ...).",
+            "# TYPE scoring_cache_counter gauge"
+        ]
+        for name, values in snapshot["counters"].items():
+            for key, value in sorted(values.items()):
+                lines.append(f'scoring_cache_counter{{cache="{name}",counter="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str = None, stream=None):
+        # Prometheus text for *.prom / *.txt files, JSON otherwise
+        if path:
+            text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json() + "\n"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            (stream or sys.stderr).write(self.to_json() + "\n")
+
+
+def _stage_labels(stage: str) -> str:
+    scorer, _, name = stage.partition(".")
+    return f'scorer="{scorer}",stage="{name}"'
+
+
+metrics = Metrics()
+
+
+def enable_from_argv(argv: list) -> list:
+    # Strips --metrics from the argument list and turns instrumentation on if present
+    if "--metrics" not in argv:
+        return argv
+    enable()
+    return [arg for arg in argv if arg != "--metrics"]
+
+
+def dump_if_enabled():
+    # End of a CLI run: write to SCORING_METRICS_FILE if set, else JSON on stderr
+    if _enabled:
+        metrics.dump(os.environ.get(FILE_ENV_VAR))
+
+
+if __name__ == "__main__":
+    # python scoring_metrics.py [bio|vision] [json|prometheus] < inputs (one per line)
+    # Scores stdin with instrumentation on and prints the resulting snapshot
+    # Run as a script this file is __main__; the analyzers import and register with the
+    # scoring_metrics module, so enable and read that one
+    import scoring_metrics
+    kind = sys.argv[1] if len(sys.argv) > 1 else "bio"
+    output = sys.argv[2] if len(sys.argv) > 2 else "json"
+    scoring_metrics.enable()
+    if kind == "vision":
+        from vision_score import ProfessionalVisionAnalyzer
+        score = ProfessionalVisionAnalyzer().analyze_image
+    else:
+        from bio_score_fast import ProfessionalBioAnalyzer
+        score = ProfessionalBioAnalyzer(memo_size=10000).analyze_bio
+    for line in sys.stdin:
+        score(line.rstrip("\n"))
+    metrics = scoring_metrics.metrics
+    print(metrics.to_prometheus() if output == "prometheus" else json.dumps(metrics.snapshot(), indent=2), end="" if output == "prometheus" else "\n")
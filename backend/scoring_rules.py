@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import os
+import sys
+import marshal
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, List, Optional
+
+# Scoring rules of both bio scorers as data, compiled into straight-line Python.
+#
+# RULES["bio_score_fast"] holds ProfessionalBioAnalyzer's keyword tables and every
+# weight, cap and threshold applied to their hits; RULES["bio_score"] holds the older
+# substring rules of bio_score.py (its own, smaller keyword lists). Nothing reads these
+# tables per bio: compile_bio_fast() / compile_bio_score() turn them into the source of
+# one function (keyword sets bound once, weights, caps, labels and recommendation texts
+# inlined as literals, one branch per rule) and exec it. Scores are accumulated by the
+# same sequence of float additions as the hand-written code they replace, so results
+# are identical, not just close (tests/test_scoring_rules.py checks a fixed corpus).
+#
+# Table edits take effect on the next compile: bio_score_fast.py compiles when an
+# analyzer is built or reload_tables() is called, bio_score.py at import. Bump the
+# scorer's SCORER_VERSION when changing weights here.
+#
+# Generating and compiling the source costs several ms, too much for one-shot CLI runs,
+# so each scorer's code object and bound constants are kept in RULES_ARTIFACT_PATH,
+# keyed on repr() of everything the function is generated from; a known key loads the
+# code without generating anything. Entries for edited tables are merged in next to
+# the default tables' (up to RULES_ARTIFACT_ENTRIES per scorer, oldest dropped first),
+# so analyzers with different tables do not keep evicting each other and rewriting the
+# file. Bump RULES_ARTIFACT_VERSION when a generator below changes what it emits for
+# the same tables.
+#
+#   python scoring_rules.py [bio_score_fast | bio_score]   -> print the generated function
+
+RULES_ARTIFACT_VERSION = 2
+RULES_ARTIFACT_ENTRIES = 8
+RULES_ARTIFACT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache",
+    f"scoring_rules_v{RULES_ARTIFACT_VERSION}_py{sys.version_info[0]}{sys.version_info[1]}.marshal"
+)
+
+RULES = {
+    "bio_score_fast": {
+        # Business type keywords with confidence scoring
+        "business_keywords": {
+            "fitness": {
+                "keywords": ["trainer", "fitness", "gym", "workout", "personal training", "crossfit", "yoga", "pilates", "nutrition", "bodybuilding", "coach", "athlete"],
+                "high_value": ["certified trainer", "nutrition coach", "fitness coach", "personal trainer"],
+                "revenue_potential": 8.5
+            },
+            "beauty": {
+                "keywords": ["barber", "hair", "salon", "beauty", "makeup", "nails", "lashes", "brows", "aesthetics", "skincare"],
+                "high_value": ["master barber", "certified", "licensed", "award winning"],
+                "revenue_potential": 7.5
+            },
+            "photography": {
+                "keywords": ["photographer", "photography", "photos", "wedding", "portrait", "commercial", "headshots"],
+                "high_value": ["wedding photographer", "commercial photographer", "award winning"],
+                "revenue_potential": 8.0
+            },
+            "food_service": {
+                "keywords": ["chef", "catering", "restaurant", "food", "culinary", "bakery", "cafe", "meal prep"],
+                "high_value": ["executive chef", "catering company", "restaurant owner"],
+                "revenue_potential": 7.0
+            },
+            "real_estate": {
+                "keywords": ["realtor", "real estate", "broker", "property", "homes", "listings"],
+                "high_value": ["top producer", "million dollar", "luxury homes"],
+                "revenue_potential": 9.5
+            },
+            "consulting": {
+                "keywords": ["consultant", "coaching", "business coach", "mentor", "advisor", "strategy"],
+                "high_value": ["business consultant", "executive coach", "strategy consultant"],
+                "revenue_potential": 9.0
+            },
+            "healthcare": {
+                "keywords": ["doctor", "dentist", "therapist", "clinic", "medical", "health", "wellness"],
+                "high_value": ["md", "dds", "licensed therapist", "clinic owner"],
+                "revenue_potential": 9.5
+            },
+            "legal": {
+                "keywords": ["lawyer", "attorney", "law firm", "legal", "paralegal"],
+                "high_value": ["partner", "law firm", "attorney"],
+                "revenue_potential": 9.5
+            },
+            "marketing": {
+                "keywords": ["marketing", "social media", "advertising", "branding", "digital marketing", "seo"],
+                "high_value": ["marketing agency", "digital marketing", "brand strategist"],
+                "revenue_potential": 8.5
+            },
+            "ecommerce": {
+                "keywords": ["ecommerce", "online store", "shopify", "amazon", "dropshipping", "retail"],
+                "high_value": ["7 figure", "8 figure", "million", "successful"],
+                "revenue_potential": 8.0
+            }
+        },
+        # Urgency and action indicators
+        "urgency_indicators": {
+            "high": ["book now", "call today", "limited time", "urgent", "asap", "immediate", "hurry"],
+            "medium": ["dm me", "message me", "contact", "reach out", "get in touch"],
+            "low": ["available", "open", "accepting"]
+        },
+        # Professional credibility indicators
+        "credibility_indicators": {
+            "certifications": ["certified", "licensed", "accredited", "board certified", "diploma"],
+            "achievements": ["award", "winner", "top", "best", "featured", "published", "recognized"],
+            "experience": ["years", "decade", "veteran", "expert", "specialist", "master"],
+            "scale": ["company", "agency", "firm", "corporation", "llc", "inc"]
+        },
+        # Contact readiness indicators
+        "contact_indicators": {
+            "direct": ["dm", "text", "call", "email", "whatsapp", "telegram"],
+            "booking": ["book", "schedule", "appointment", "consultation", "meeting"],
+            "social_proof": ["reviews", "testimonials", "clients", "customers", "satisfied"]
+        },
+        # Geographic regions with market value
+        "regions": {
+            "high_value": {
+                "keywords": ["manhattan", "beverly hills", "silicon valley", "miami beach", "soho"],
+                "multiplier": 1.5
+            },
+            "major_cities": {
+                "keywords": ["nyc", "new york", "los angeles", "chicago", "miami", "san francisco", "boston", "seattle"],
+                "multiplier": 1.3
+            },
+            "medium_cities": {
+                "keywords": ["atlanta", "dallas", "houston", "phoenix", "denver", "austin"],
+                "multiplier": 1.1
+            }
+        },
+        # Key indicator labels and the substrings that trigger them
+        "key_indicators": {
+            "Certified Professional": ["certified", "licensed"],
+            "Contact Ready": ["dm", "contact", "book"],
+            "Email Available": ["@", "📧"],
+            "Award Winner": ["award", "top", "best"],
+            "Business Entity": ["company", "llc", "inc"]
+        },
+
+        # Confidence = keyword_weight per keyword hit + high_value_weight per high-value hit;
+        # the first business type with strictly higher confidence than the best so far wins
+        "business": {
+            "keyword_weight": 0.3,
+            "high_value_weight": 0.7,
+            "confidence_cap": 1.0,
+            "contribution_factor": 3,
+            "contribution_cap": 3.0,
+            "default": {"type": "General Business", "confidence": 0.1, "score_contribution": 0.5,
+                        "revenue_potential": 5.0}
+        },
+        # base + weight per hit of each category (default_weight for categories not listed), capped
+        "urgency": {"base": 2.0, "cap": 10.0, "weights": {"high": 3.0, "medium": 2.0}, "default_weight": 1.0},
+        "credibility": {
+            "base": 0.0, "cap": 2.0, "default_weight": 0.0,
+            "weights": {"certifications": 0.7, "achievements": 0.6, "experience": 0.4, "scale": 0.5}
+        },
+        "contact": {
+            "base": 0.0, "cap": 2.0, "default_weight": 0.0,
+            "weights": {"direct": 0.8, "booking": 0.7, "social_proof": 0.5},
+            # An email symbol (CONTACT_SYMBOLS) / a phone number anywhere in the bio
+            "symbol_bonus": 0.8,
+            "phone_bonus": 1.0
+        },
+        "region_default": {"region": "Unknown", "value": "Standard", "multiplier": 1.0},
+        # (base + business contribution + credibility + contact) * region multiplier, capped
+        "pitch": {"base": 3.0, "cap": 10.0},
+        # (recommendation, minimum pitch, minimum urgency, minimum revenue potential), first
+        # match wins; None means no condition. Compared before rounding.
+        "recommendations": [
+            ("hot", 8.5, 7, None),
+            ("warm", 7, 5, None),
+            ("qualified", 5, None, None),
+            ("high_value_industry", None, None, 8)
+        ],
+        "recommendation_default": "standard"
+    },
+
+    "bio_score": {
+        "empty": {"pitch_score": 1.0, "urgency_score": 1.0, "language": "English", "region": "Unknown",
+                  "business_type": "Unknown"},
+        # (label, substrings); the first label with any substring in the bio wins
+        "regions": [
+            ("Los Angeles", ["la ", "los angeles", "hollywood", "beverly hills", "santa monica"]),
+            ("New York", ["nyc", "new york", "manhattan", "brooklyn", "queens"]),
+            ("London", ["london", "uk", "england"]),
+            ("Paris", ["paris", "france"]),
+            ("Toronto", ["toronto", "canada"])
+        ],
+        "region_default": "Unknown",
+        "business_types": [
+            ("Barber", ["barber", "haircut", "fade", "beard trim"]),
+            ("Salon", ["salon", "hair salon", "beauty", "nails"]),
+            ("Photographer", ["photographer", "photography", "photos", "photoshoot"]),
+            ("Artist", ["artist", "art", "painting", "drawing"]),
+            ("Coach", ["coach", "coaching", "mentor", "training"]),
+            ("Fitness/Gym", ["gym", "fitness", "personal trainer", "workout"]),
+            ("Agency", ["agency", "marketing", "advertising"]),
+            ("Catering", ["catering", "food", "chef", "restaurant"])
+        ],
+        "business_default": "Business",
+        # base + weight of every rule with any substring in the bio, in order, capped
+        "pitch": {
+            "base": 2.0, "cap": 10.0,
+            "rules": [
+                (["dm me", "dm for", "book now", "booking", "appointments"], 3.0),
+                (["link in bio", "website", "book online"], 2.0),
+                (["professional", "certified", "licensed"], 1.5),
+                (["years experience", "expert", "specialist"], 1.0),
+                # Former regex [📧📞☎️📲]|email|phone|call|contact: the class holds ☎ and U+FE0F separately
+                (["📧", "📞", "☎", "\ufe0f", "📲", "email", "phone", "call", "contact"], 1.5)
+            ]
+        },
+        "urgency": {
+            "base": 2.0, "cap": 10.0,
+            "rules": [
+                (["limited time", "special offer", "discount", "sale"], 3.0),
+                (["book now", "call today", "available now"], 2.5),
+                (["dm me", "message me", "contact me"], 2.0),
+                (["new", "opening", "grand opening"], 1.5)
+            ]
+        }
+    }
+}
+
+
+class _Source:
+    # Generated function source plus the non-literal constants it refers to
+    def __init__(self, namespace: Dict):
+        self.lines: List[str] = []
+        self.namespace = namespace
+        # Bound keyword sets; unlike the callables passed in namespace, these can be marshalled
+        self.constants: Dict = {}
+
+    def emit(self, depth: int, line: str):
+        self.lines.append("    " * depth + line)
+
+    def bind(self, value) -> str:
+        name = f"_k{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def repeated_add(self, depth: int, target: str, step: float, keywords: List[str]):
+        # target += step once per hit of keywords, unrolled: "if n: x += s; if n > 1: x += s ..."
+        # adds in the same order as a loop would, so the float result is bit-identical
+        if not keywords or step == 0.0:
+            return
+        self.emit(depth, f"n = len(hits & {self.bind(frozenset(keywords))})")
+        for count in range(len(set(keywords))):
+            self.emit(depth + count, "if n:" if count == 0 else f"if n > {count}:")
+            self.emit(depth + count + 1, f"{target} += {step!r}")
+
+    def cap(self, depth: int, target: str, cap: float):
+        # Same value as min(target, cap)
+        self.emit(depth, f"if {target} > {cap!r}:")
+        self.emit(depth + 1, f"{target} = {cap!r}")
+
+    def compile(self, name: str, filename: str, cache_key: Optional[str] = None) -> Callable:
+        # With a cache_key, the code and constants are stored in the artifact under it
+        source = "\n".join(self.lines) + "\n"
+        code = compile(source, filename, "exec")
+        if cache_key is not None:
+            _store(name, cache_key, code, self.constants)
+        function = _load(code, self.constants, self.namespace, name)
+        function.source = source
+        return function
+
+
+_loaded_artifact: Optional[Dict] = None
+
+
+def _artifact() -> Dict:
+    # {function name: {key: (code, constants)}}, read once per process
+    global _loaded_artifact
+    if _loaded_artifact is None:
+        try:
+            with open(RULES_ARTIFACT_PATH, "rb") as f:
+                _loaded_artifact = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            _loaded_artifact = {}
+        if not isinstance(_loaded_artifact, dict):
+            _loaded_artifact = {}
+    return _loaded_artifact
+
+
+def _store(name: str, cache_key: str, code, constants: Dict):
+    # Merged into the file as it is now, which other processes may have added to since
+    # this one read it
+    global _loaded_artifact
+    _loaded_artifact = None
+    artifact = _artifact()
+    entries = artifact.get(name)
+    if not isinstance(entries, dict):
+        entries = artifact[name] = {}
+    entries.pop(cache_key, None)
+    entries[cache_key] = (code, constants)
+    while len(entries) > RULES_ARTIFACT_ENTRIES:
+        del entries[next(iter(entries))]
+    _write_artifact(artifact)
+
+
+def _write_artifact(artifact: Dict):
+    try:
+        os.makedirs(os.path.dirname(RULES_ARTIFACT_PATH), exist_ok=True)
+        tmp_path = f"{RULES_ARTIFACT_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(artifact, f)
+        os.replace(tmp_path, RULES_ARTIFACT_PATH)
+    except OSError:
+        pass  # read-only checkout: compile in every process instead
+
+
+def _load(code, constants: Dict, externals: Dict, name: str) -> Callable:
+    namespace = dict(constants)
+    namespace.update(externals)
+    exec(code, namespace)
+    return namespace[name]
+
+
+def _cached(name: str, cache_key: str, externals: Dict) -> Optional[Callable]:
+    entries = _artifact().get(name)
+    entry = entries.get(cache_key) if isinstance(entries, dict) else None
+    if not (isinstance(entry, tuple) and len(entry) == 2):
+        return None
+    return _load(entry[0], entry[1], externals, name)
+
+
+def _any_substring(terms: List[str], text: str) -> str:
+    return " or ".join(f"{term!r} in {text}" for term in terms) or "False"
+
+
+def compile_bio_fast(tables: List, rules: Dict, recommendations: Dict[str, str], contact_symbols,
+                     phone_pattern, detect_language: Callable[[str], str], cache: bool = True) -> Callable:
+    # score(bio_lower, hits) -> the analyze_bio result; tables in keyword_tables() order,
+    # rules laid out like RULES["bio_score_fast"] (its keyword tables are not read).
+    # cache=False always generates, so the result carries .source
+    externals = {"_phone_search": phone_pattern.search, "_detect_language": detect_language}
+    cache_key = repr((tables, rules, recommendations, sorted(contact_symbols), phone_pattern.pattern)) if cache else None
+    function = _cached("score", cache_key, externals) if cache else None
+    if function is not None:
+        return function
+
+    business_keywords, urgency_indicators, credibility_indicators, contact_indicators, regions, key_indicators = tables
+    source = _Source(externals)
+    emit = source.emit
+    emit(0, "def score(bio_lower, hits):")
+
+    business = rules["business"]
+    default = business["default"]
+    emit(1, f"business_type = {default['type']!r}")
+    emit(1, f"confidence = {default['confidence']!r}")
+    emit(1, f"contribution = {default['score_contribution']!r}")
+    emit(1, f"revenue_potential = {default['revenue_potential']!r}")
+    for business_type, data in business_keywords.items():
+        emit(1, f"if not hits.isdisjoint({source.bind(frozenset(data['keywords']) | frozenset(data['high_value']))}):")
+        emit(2, "raw = 0.0")
+        source.repeated_add(2, "raw", business["keyword_weight"], data["keywords"])
+        source.repeated_add(2, "raw", business["high_value_weight"], data["high_value"])
+        emit(2, "if raw > confidence:")
+        emit(3, f"business_type = {business_type.replace('_', ' ').title()!r}")
+        emit(3, f"confidence = {business['confidence_cap']!r} if raw > {business['confidence_cap']!r} else raw")
+        emit(3, f"raw = raw * {business['contribution_factor']!r}")
+        emit(3, f"contribution = {business['contribution_cap']!r} if raw > {business['contribution_cap']!r} else raw")
+        emit(3, f"revenue_potential = {data['revenue_potential']!r}")
+
+    for target, table in (("urgency", urgency_indicators), ("credibility", credibility_indicators),
+                          ("contact", contact_indicators)):
+        rule = rules[target]
+        emit(1, f"{target} = {rule['base']!r}")
+        for category, keywords in table.items():
+            source.repeated_add(1, target, rule["weights"].get(category, rule["default_weight"]), keywords)
+        if target == "contact":
+            emit(1, f"if not hits.isdisjoint({source.bind(frozenset(contact_symbols))}):")
+            emit(2, f"contact += {rule['symbol_bonus']!r}")
+            emit(1, "if _phone_search(bio_lower):")
+            emit(2, f"contact += {rule['phone_bonus']!r}")
+        source.cap(1, target, rule["cap"])
+
+    # The first region type with a hit, then its first keyword in table order
+    branch = "if"
+    for region_type, data in regions.items():
+        for keyword in data["keywords"]:
+            emit(1, f"{branch} {keyword!r} in hits:")
+            emit(2, f"region = {keyword.title()!r}")
+            emit(2, f"region_value = {region_type.replace('_', ' ').title()!r}")
+            emit(2, f"multiplier = {data['multiplier']!r}")
+            branch = "elif"
+    region_default = rules["region_default"]
+    emit(1, "else:" if branch == "elif" else "if True:")
+    emit(2, f"region = {region_default['region']!r}")
+    emit(2, f"region_value = {region_default['value']!r}")
+    emit(2, f"multiplier = {region_default['multiplier']!r}")
+
+    emit(1, f"pitch = {rules['pitch']['base']!r}")
+    emit(1, "pitch += contribution")
+    emit(1, "pitch += credibility")
+    emit(1, "pitch += contact")
+    emit(1, "pitch *= multiplier")
+    source.cap(1, "pitch", rules["pitch"]["cap"])
+
+    emit(1, "key_indicators = []")
+    for label, keywords in key_indicators.items():
+        emit(1, f"if not hits.isdisjoint({source.bind(frozenset(keywords))}):")
+        emit(2, f"key_indicators.append({label!r})")
+
+    branch = "if"
+    for tier, pitch_minimum, urgency_minimum, revenue_minimum in rules["recommendations"]:
+        conditions = [f"{name} >= {minimum!r}" for name, minimum in (
+            ("pitch", pitch_minimum), ("urgency", urgency_minimum), ("revenue_potential", revenue_minimum)
+        ) if minimum is not None]
+        emit(1, f"{branch} {' and '.join(conditions) or 'True'}:")
+        emit(2, f"recommendation = {recommendations[tier]!r}")
+        branch = "elif"
+    emit(1, "else:" if branch == "elif" else "if True:")
+    emit(2, f"recommendation = {recommendations[rules['recommendation_default']]!r}")
+
+    emit(1, "return {")
+    for key, value in (
+        ("pitch_score", "round(pitch, 1)"), ("urgency_score", "round(urgency, 1)"),
+        ("credibility_score", "round(credibility, 1)"), ("contact_readiness", "round(contact, 1)"),
+        ("business_type", "business_type"), ("business_confidence", "confidence"),
+        ("revenue_potential", "revenue_potential"), ("language", "_detect_language(bio_lower)"),
+        ("region", "region"), ("region_value", "region_value"), ("key_indicators", "key_indicators"),
+        ("recommendation", "recommendation")
+    ):
+        emit(2, f"{key!r}: {value},")
+    emit(1, "}")
+    return source.compile("score", "<scoring_rules:bio_score_fast>", cache_key)
+
+
+def compile_bio_score(rules: Dict, detect_language: Callable[[str], str], cache: bool = True) -> Callable:
+    # score_bio(bio_text) for rules laid out like RULES["bio_score"]
+    externals = {"_detect_language": detect_language}
+    cache_key = repr(rules) if cache else None
+    function = _cached("score_bio", cache_key, externals) if cache else None
+    if function is not None:
+        return function
+
+    source = _Source(externals)
+    emit = source.emit
+    emit(0, "def score_bio(bio_text):")
+    emit(1, "if not bio_text:")
+    emit(2, f"return {rules['empty']!r}")
+    emit(1, "lower = bio_text.lower()")
+
+    for target, table, default in (("region", rules["regions"], rules["region_default"]),
+                                   ("business_type", rules["business_types"], rules["business_default"])):
+        branch = "if"
+        for label, terms in table:
+            emit(1, f"{branch} {_any_substring(terms, 'lower')}:")
+            emit(2, f"{target} = {label!r}")
+            branch = "elif"
+        emit(1, "else:" if branch == "elif" else "if True:")
+        emit(2, f"{target} = {default!r}")
+
+    for target in ("pitch", "urgency"):
+        rule = rules[target]
+        emit(1, f"{target} = {rule['base']!r}")
+        for terms, weight in rule["rules"]:
+            emit(1, f"if {_any_substring(terms, 'lower')}:")
+            emit(2, f"{target} += {weight!r}")
+        source.cap(1, target, rule["cap"])
+
+    emit(1, "return {")
+    emit(2, "'pitch_score': round(pitch, 1),")
+    emit(2, "'urgency_score': round(urgency, 1),")
+    emit(2, "'language': _detect_language(lower),")
+    emit(2, "'region': region,")
+    emit(2, "'business_type': business_type,")
+    emit(1, "}")
+    return source.compile("score_bio", "<scoring_rules:bio_score>", cache_key)
+
+
+def copy_rules(rules: Dict) -> Dict:
+    # Deep copy of a rules table (dicts, lists, tuples, strings and numbers only)
+    return marshal.loads(marshal.dumps(rules))
+
+
+if __name__ == "__main__":
+    # Print a generated function; parity is covered by tests/test_scoring_rules.py
+    scorer = sys.argv[1] if len(sys.argv) > 1 else "bio_score_fast"
+    if scorer == "bio_score":
+        from language_detect import detect_language
+        print(compile_bio_score(RULES["bio_score"], detect_language, cache=False).source)
+    else:
+        from bio_score_fast import CONTACT_SYMBOLS, PHONE_PATTERN, RECOMMENDATIONS, ProfessionalBioAnalyzer
+        from language_detect import detect_language
+        analyzer = ProfessionalBioAnalyzer()
+        print(compile_bio_fast(analyzer.keyword_tables(), analyzer.scoring_rules, RECOMMENDATIONS, CONTACT_SYMBOLS,
+                               PHONE_PATTERN, detect_language, cache=False).source)
@@ -0,0 +1,299 @@
+import sys
+import json
+import os
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import scoring_metrics
+from score_cache import ScoreCache
+from scoring_worker import ScoringWorker
+
+# Shared local scoring server with adaptive micro-batching.
+#
+# Same NDJSON requests as scoring_worker.py ({"id", "type", "input"}) over a Unix socket
+# or localhost TCP, so index.cjs and both scrapers can share one set of warm analyzers
+# (scoring_worker.js connects here when SCORING_SERVER is set). Responses carry the
+# request id and are written as soon as their batch is done, not in request order.
+#
+# Requests from all connections go into one queue. A single scoring thread takes them
+# in batches of up to max_batch: every request already waiting, and - when several were
+# waiting and the arrival rate predicts another before the oldest one's latency budget
+# (budget_ms) runs out - the next arrivals too. A lone request under light load is
+# dispatched at once; under load, requests queue up while a batch is scoring and the
+# next batch is larger (ScoringWorker.score_batch scores a batch's bios in one
+# analyze_bios call, each distinct bio once, and makes one thread hop per batch). Queueing delay is bounded by the budget plus one batch.
+#
+# Admission control: a request arriving while max_queue requests are waiting is
+# answered at once with {"error": ..., "overloaded": true}, and each connection may
+# have at most max_inflight requests outstanding (further reads wait, pushing back on
+# that client's socket). {"type": "stats"} returns queue, batch and latency stats.
+#
+#   python scoring_server.py [--socket cache/scoring.sock | --tcp 127.0.0.1:8765]
+#                            [--budget-ms 5] [--max-batch 64] [--max-queue 2048] [--cache] [--metrics]
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET_PATH = os.path.join(BACKEND_DIR, "cache", "scoring.sock")
+
+DEFAULT_BUDGET_MS = 5.0
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_QUEUE = 2048
+DEFAULT_MAX_INFLIGHT = 256
+LATENCY_SAMPLES = 10000
+# Weight of the newest inter-arrival gap in the arrival-rate estimate
+ARRIVAL_SMOOTHING = 0.2
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class Overloaded(Exception):
+    pass
+
+
+class _Pending:
+    __slots__ = ("kind", "value", "future", "enqueued")
+
+    def __init__(self, kind: str, value, future: asyncio.Future, enqueued: float):
+        self.kind = kind
+        self.value = value
+        self.future = future
+        self.enqueued = enqueued
+
+
+class ScoringServer:
+    def __init__(self, worker: ScoringWorker = None, budget_ms: float = DEFAULT_BUDGET_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_queue: int = DEFAULT_MAX_QUEUE,
+                 max_inflight: int = DEFAULT_MAX_INFLIGHT):
+        self.worker = worker or ScoringWorker()
+        self.budget = budget_ms / 1000.0
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.max_inflight = max_inflight
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="scoring")
+        self._batcher: Optional[asyncio.Task] = None
+        self._last_arrival: Optional[float] = None
+        self._arrival_gap = float("inf")
+        self._started = time.monotonic()
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_batch_seen = 0
+        self.max_queue_seen = 0
+        # batch size -> count, in power-of-two buckets (1, 2, 4, ...)
+        self.batch_sizes: Dict[int, int] = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def _ensure_started(self):
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.ensure_future(self._run_batches())
+
+    async def submit(self, kind: str, value):
+        # Score one request through the batch queue; raises Overloaded when the queue is full
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._queue.qsize() >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(f"Scoring server overloaded ({self._queue.qsize()} requests queued)")
+
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            if self._arrival_gap == float("inf"):
+                self._arrival_gap = gap
+            else:
+                self._arrival_gap += ARRIVAL_SMOOTHING * (gap - self._arrival_gap)
+        self._last_arrival = now
+
+        self.requests += 1
+        pending = _Pending(kind, value, loop.create_future(), now)
+        self._queue.put_nowait(pending)
+        self.max_queue_seen = max(self.max_queue_seen, self._queue.qsize())
+        result = await pending.future
+        self.latencies.append(loop.time() - now)
+        return result
+
+    async def _collect(self) -> List[_Pending]:
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        batch = [first]
+        deadline = first.enqueued + self.budget
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            # Only wait when requests are arriving concurrently (several already taken)
+            # and another is expected within the budget; a lone request - or a client
+            # waiting on its own answer before sending the next - is never held back
+            if len(batch) < 2 or remaining <= 0 or self._arrival_gap > remaining:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            requests = [(pending.kind, pending.value) for pending in batch]
+            try:
+                results = await loop.run_in_executor(self._pool, self.worker.score_batch, requests)
+            except Exception as e:
+                results = [e] * len(batch)
+
+            size = len(batch)
+            self.batches += 1
+            self.batched_requests += size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            bucket = 1 << (size - 1).bit_length()
+            self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+
+            for pending, result in zip(batch, results):
+                if pending.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    pending.future.set_exception(result)
+                else:
+                    pending.future.set_result(result)
+
+    def stats(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 3)
+
+        uptime = time.monotonic() - self._started
+        return {
+            "uptime_s": round(uptime, 1),
+            "connections": self.connections,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_seen,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "batch_size_buckets": {str(bucket): count for bucket, count in sorted(self.batch_sizes.items())},
+            "latency_ms": {"p50": percentile(0.5), "p90": percentile(0.9), "p99": percentile(0.99),
+                           "max": round(latencies[-1] * 1000, 3) if latencies else 0.0},
+            "arrival_gap_ms": round(self._arrival_gap * 1000, 3) if self._arrival_gap != float("inf") else None,
+            "requests_per_s": round(self.requests / uptime, 1) if uptime > 0 else 0.0,
+            "config": {"budget_ms": self.budget * 1000, "max_batch": self.max_batch,
+                       "max_queue": self.max_queue, "max_inflight": self.max_inflight}
+        }
+
+    async def _respond(self, request: Dict, writer: asyncio.StreamWriter, slots: asyncio.Semaphore):
+        request_id = request.get("id")
+        try:
+            result = await self.submit(request.get("type", ""), request.get("input"))
+            response = {"id": request_id, "result": result}
+        except Overloaded as e:
+            response = {"id": request_id, "error": str(e), "overloaded": True}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        finally:
+            slots.release()
+        self._write(writer, response)
+        await writer.drain()
+
+    def _write(self, writer: asyncio.StreamWriter, response: Dict):
+        if not writer.is_closing():
+            writer.write((json.dumps(response) + "\n").encode("utf-8"))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        slots = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    self._write(writer, {"id": None, "error": f"Invalid JSON: {e}"})
+                    continue
+                if not isinstance(request, dict):
+                    self._write(writer, {"id": None, "error": "Request must be a JSON object"})
+                    continue
+                if request.get("type") == "stats":
+                    # Answered inline so it can be read while the queue is backed up
+                    self._write(writer, {"id": request.get("id"), "result": self.stats()})
+                    continue
+
+                await slots.acquire()
+                task = asyncio.ensure_future(self._respond(request, writer, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve_unix(self, path: str = DEFAULT_SOCKET_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        return await asyncio.start_unix_server(self.handle_client, path, limit=STREAM_LIMIT)
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765):
+        return await asyncio.start_server(self.handle_client, host, port, limit=STREAM_LIMIT)
+
+    def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._pool.shutdown(wait=False)
+
+
+def _option(args: List[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    return args[args.index(name) + 1] if name in args else default
+
+
+async def _main(args: List[str]):
+    cache = ScoreCache() if "--cache" in args else None
+    server = ScoringServer(
+        ScoringWorker(cache),
+        budget_ms=float(_option(args, "--budget-ms", DEFAULT_BUDGET_MS)),
+        max_batch=int(_option(args, "--max-batch", DEFAULT_MAX_BATCH)),
+        max_queue=int(_option(args, "--max-queue", DEFAULT_MAX_QUEUE)),
+        max_inflight=int(_option(args, "--max-inflight", DEFAULT_MAX_INFLIGHT))
+    )
+    tcp = _option(args, "--tcp")
+    if tcp:
+        host, _, port = tcp.rpartition(":")
+        listener = await server.serve_tcp(host or "127.0.0.1", int(port))
+        address = f"{host or '127.0.0.1'}:{port}"
+    else:
+        address = _option(args, "--socket", DEFAULT_SOCKET_PATH)
+        listener = await server.serve_unix(address)
+    sys.stderr.write(f"[scoring_server] listening on {address}\n")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(scoring_metrics.enable_from_argv(sys.argv[1:])))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,204 @@
+const { spawn } = require('child_process');
+const net = require('net');
+const path = require('path');
+const readline = require('readline');
+
+// Binary response frames (see bio_result.py for the layout)
+const FRAME_CODEBOOK = 0;
+const FRAME_BIO = 1;
+const FRAME_JSON = 2;
+
+// 28-byte compact bio record -> the same object analyze_bio returns as JSON
+function decodeBioRecord(buf, offset, codebook) {
+  const indicators = buf.readUInt16LE(offset + 26);
+  return {
+    pitch_score: buf.readUInt8(offset) / 10,
+    urgency_score: buf.readUInt8(offset + 1) / 10,
+    credibility_score: buf.readUInt8(offset + 2) / 10,
+    contact_readiness: buf.readUInt8(offset + 3) / 10,
+    business_type: codebook.business_type[buf.readUInt8(offset + 20)],
+    business_confidence: buf.readDoubleLE(offset + 4),
+    revenue_potential: buf.readDoubleLE(offset + 12),
+    language: codebook.language[buf.readUInt8(offset + 21)],
+    region: codebook.region[buf.readUInt16LE(offset + 22)],
+    region_value: codebook.region_value[buf.readUInt8(offset + 24)],
+    key_indicators: codebook.key_indicators.filter((_, code) => indicators & (1 << code)),
+    recommendation: codebook.recommendation[buf.readUInt8(offset + 25)]
+  };
+}
+
+// 🧠 Resident Python scoring worker
+// Keeps one scoring_worker.py process alive and pipelines NDJSON requests through it,
+// instead of paying interpreter startup + analyzer construction for every lead.
+// With { binary: true } (or SCORING_WORKER_BINARY=1) responses come back as
+// length-prefixed binary frames, so bio results skip JSON parsing.
+// With { server } (or SCORING_SERVER=<unix socket path | host:port>) it connects to a
+// shared scoring_server.py instead, so concurrent scrapers batch through one process.
+class ScoringWorkerClient {
+  constructor(options = {}) {
+    this.pythonPath = options.pythonPath || process.env.PYTHON_PATH || 'python';
+    this.scriptPath = options.scriptPath || path.join(__dirname, 'scoring_worker.py');
+    this.timeoutMs = options.timeoutMs || 10000;
+    this.binary = options.binary !== undefined ? options.binary : process.env.SCORING_WORKER_BINARY === '1';
+    this.server = options.server || process.env.SCORING_SERVER || null;
+    this.proc = null;
+    this.nextId = 1;
+    this.pending = new Map();
+    this.codebook = null;
+    this.frameBuffer = Buffer.alloc(0);
+  }
+
+  start() {
+    if (this.proc) return this.proc;
+    if (this.server) return this.connect();
+
+    const args = ['-u', this.scriptPath].concat(this.binary ? ['--binary'] : []);
+    const proc = spawn(this.pythonPath, args, {
+      cwd: path.dirname(this.scriptPath),
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+
+    if (this.binary) {
+      this.frameBuffer = Buffer.alloc(0);
+      proc.stdout.on('data', (chunk) => this.handleData(chunk));
+    } else {
+      readline.createInterface({ input: proc.stdout }).on('line', (line) => this.handleLine(line));
+    }
+    proc.stderr.on('data', (data) => console.error(`[SCORING_WORKER] ${data.toString().trim()}`));
+    proc.stdin.on('error', (error) => this.handleExit(proc, error));
+    proc.on('error', (error) => this.handleExit(proc, error));
+    proc.on('exit', (code) => this.handleExit(proc, new Error(`Scoring worker exited with code ${code}`)));
+
+    this.proc = proc;
+    return proc;
+  }
+
+  connect() {
+    // host:port for TCP, anything else is a Unix socket path; the server speaks NDJSON only
+    const match = /^([\w.-]*):(\d+)$/.exec(this.server);
+    const socket = match
+      ? net.createConnection({ host: match[1] || '127.0.0.1', port: Number(match[2]) })
+      : net.createConnection({ path: this.server });
+    const conn = { stdin: socket, kill: () => socket.destroy() };
+
+    readline.createInterface({ input: socket }).on('line', (line) => this.handleLine(line));
+    socket.on('error', (error) => this.handleExit(conn, error));
+    socket.on('close', () => this.handleExit(conn, new Error('Scoring server connection closed')));
+
+    this.proc = conn;
+    return conn;
+  }
+
+  handleLine(line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (e) {
+      console.error(`[SCORING_WORKER] Unparseable response: ${line}`);
+      return;
+    }
+
+    this.settle(response.id, response.error, response.result);
+  }
+
+  handleData(chunk) {
+    const buffer = this.frameBuffer.length ? Buffer.concat([this.frameBuffer, chunk]) : chunk;
+    let offset = 0;
+    while (buffer.length - offset >= 5) {
+      const length = buffer.readUInt32LE(offset);
+      if (buffer.length - offset - 4 < length) break;
+      this.handleFrame(buffer.readUInt8(offset + 4), buffer.subarray(offset + 5, offset + 4 + length));
+      offset += 4 + length;
+    }
+    this.frameBuffer = buffer.subarray(offset);
+  }
+
+  handleFrame(kind, payload) {
+    if (kind === FRAME_CODEBOOK) {
+      this.codebook = JSON.parse(payload.toString('utf8'));
+      return;
+    }
+
+    const id = payload.readUInt32LE(0);
+    if (kind === FRAME_BIO) {
+      this.settle(id, null, decodeBioRecord(payload, 4, this.codebook));
+    } else if (kind === FRAME_JSON) {
+      this.settle(id, null, JSON.parse(payload.toString('utf8', 4)));
+    } else {
+      this.settle(id, payload.toString('utf8', 4));
+    }
+  }
+
+  settle(id, error, result) {
+    const entry = this.pending.get(id);
+    if (!entry) return;
+
+    this.pending.delete(id);
+    clearTimeout(entry.timer);
+    if (error) {
+      entry.reject(new Error(error));
+    } else {
+      entry.resolve(result);
+    }
+  }
+
+  handleExit(proc, error) {
+    if (this.proc !== proc) return;
+    this.proc = null;
+
+    // Fail everything in flight; the next request respawns the worker
+    for (const entry of this.pending.values()) {
+      clearTimeout(entry.timer);
+      entry.reject(error);
+    }
+    this.pending.clear();
+  }
+
+  score(type, input) {
+    const proc = this.start();
+    const id = this.nextId++;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        // A hung worker would stall every later request too: drop it and respawn
+        const error = new Error(`Scoring request ${id} (${type}) timed out`);
+        this.handleExit(proc, error);
+        proc.kill();
+      }, this.timeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      proc.stdin.write(JSON.stringify({ id, type, input }) + '\n');
+    });
+  }
+
+  scoreBio(bioText) {
+    return this.score('bio', bioText);
+  }
+
+  scoreVision(imagePath) {
+    return this.score('vision', imagePath);
+  }
+
+  // Whole profile in, final lead object out (bio + vision + contact info + lead score)
+  scoreLead(profile) {
+    return this.score('lead', profile);
+  }
+
+  // Stage timings; only populated when the worker runs with SCORING_METRICS=1
+  metrics(format = 'json') {
+    return this.score('metrics', format);
+  }
+
+  stop() {
+    if (this.proc) {
+      this.proc.stdin.end();
+      this.proc = null;
+    }
+  }
+}
+
+const scoringWorker = new ScoringWorkerClient();
+
+module.exports = scoringWorker;
+module.exports.ScoringWorkerClient = ScoringWorkerClient;
+module.exports.decodeBioRecord = decodeBioRecord;
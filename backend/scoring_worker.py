@@ -0,0 +1,188 @@
+import sys
+import json
+from typing import Dict, List, Tuple
+
+from bio_score_fast import DEFAULT_MEMO_SIZE, ProfessionalBioAnalyzer, _metrics_enabled
+from vision_score import ProfessionalVisionAnalyzer
+from score_cache import ScoreCache
+from bio_result import NO_ID, Codebook, FrameWriter
+from lead_score import LeadScorer
+
+# Resident scoring worker: one warm analyzer per kind, newline-delimited JSON in and out.
+#
+#   request:  {"id": 17, "type": "bio", "input": "Certified trainer in NYC - DM me"}
+#   response: {"id": 17, "result": {...}}   or   {"id": 17, "error": "..."}
+#
+# "type" is "bio" (bio_score_fast), "vision" (vision_score) or "lead" (lead_score: a
+# whole profile object in, the final lead object out, scored through the same warm
+# analyzers). Responses are written in request order and flushed per line so callers
+# can pipeline requests.
+#
+# Start with --cache to put the shared content-addressed score cache in front of
+# both analyzers (score_cache.py). Start with --metrics (or SCORING_METRICS=1) to time
+# each scoring stage; {"type": "metrics", "input": "prometheus"} returns
+# {"text": "..."} in Prometheus format, any other input the JSON snapshot.
+#
+# Start with --phash to reuse pixel statistics of near-duplicate screenshots
+# (phash_index.py); the index is loaded from and saved to cache/phash_index.json.
+#
+# Start with --binary to get length-prefixed frames (bio_result.py) on stdout instead
+# of NDJSON: bio results as 28-byte compact records, everything else as JSON frames.
+# Requests stay NDJSON; ids must then be integers below 2**32.
+
+SCRIPT_TYPES = {
+    "bio_score_fast.py": "bio",
+    "vision_score.py": "vision",
+    "lead_score.py": "lead",
+}
+
+
+class ScoringWorker:
+    def __init__(self, cache: ScoreCache = None, phash_index=None):
+        self.cache = cache
+        self.phash_index = phash_index
+        self._bio_analyzer = None
+        self._vision_analyzer = None
+        self._lead_scorer = None
+        self.handled = 0
+        if cache is not None and _metrics_enabled():
+            import scoring_metrics
+            scoring_metrics.metrics.register_collector("score_cache", cache.stats)
+
+    def _bio(self) -> ProfessionalBioAnalyzer:
+        if self._bio_analyzer is None:
+            self._bio_analyzer = ProfessionalBioAnalyzer(memo_size=DEFAULT_MEMO_SIZE)
+        return self._bio_analyzer
+
+    def score(self, kind: str, value) -> Dict:
+        kind = SCRIPT_TYPES.get(kind, kind)
+        if kind == "bio":
+            if self.cache is not None:
+                return self.cache.bio_score(self._bio(), value or "")
+            return self._bio().analyze_bio(value or "")
+        if kind == "vision":
+            if self._vision_analyzer is None:
+                self._vision_analyzer = ProfessionalVisionAnalyzer(self.phash_index)
+            if self.cache is not None:
+                return self.cache.vision_score(self._vision_analyzer, value or "")
+            return self._vision_analyzer.analyze_image(value or "")
+        if kind == "lead":
+            if self._lead_scorer is None:
+                self._lead_scorer = LeadScorer(lambda bio_text: self.score("bio", bio_text),
+                                               lambda image_path: self.score("vision", image_path))
+            return self._lead_scorer.score_lead(value)
+        if kind == "metrics":
+            import scoring_metrics
+            if value == "prometheus":
+                return {"text": scoring_metrics.metrics.to_prometheus()}
+            return scoring_metrics.metrics.snapshot()
+        raise ValueError(f"Unknown scoring type: {kind}")
+
+    def score_bios(self, bios: List[str]) -> List[Dict]:
+        # score("bio", ...) for many bios at once, through the analyzer's batch path
+        bios = [bio_text or "" for bio_text in bios]
+        if self.cache is not None:
+            return self.cache.bio_scores(self._bio(), bios)
+        return self._bio().analyze_bios(bios)
+
+    def score_batch(self, requests: List[Tuple[str, object]]) -> List[object]:
+        # One result (or the exception raised) per (kind, input). The batch's bio requests
+        # are scored together by score_bios and scattered back in request order; identical
+        # vision requests are scored once and share the result dict
+        results: List[object] = [None] * len(requests)
+        bio_positions: List[int] = []
+        seen: Dict[str, object] = {}
+        for position, (kind, value) in enumerate(requests):
+            kind = SCRIPT_TYPES.get(kind, kind)
+            if kind == "bio" and (value is None or isinstance(value, str)):
+                bio_positions.append(position)
+                continue
+            if kind == "vision" and isinstance(value, str) and value in seen:
+                results[position] = seen[value]
+                continue
+            try:
+                result = self.score(kind, value)
+            except Exception as e:
+                result = e
+            if kind == "vision" and isinstance(value, str):
+                seen[value] = result
+            results[position] = result
+
+        if bio_positions:
+            try:
+                scored = self.score_bios([requests[position][1] for position in bio_positions])
+            except Exception as e:
+                scored = [e] * len(bio_positions)
+            for position, result in zip(bio_positions, scored):
+                results[position] = result
+
+        self.handled += sum(1 for result in results if not isinstance(result, Exception))
+        return results
+
+    def handle_line(self, line: str) -> Dict:
+        return self._handle(line)[1]
+
+    def _handle(self, line: str) -> Tuple[str, Dict]:
+        # (scoring kind, response)
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return "", {"id": None, "error": f"Invalid JSON: {e}"}
+
+        if not isinstance(request, dict):
+            return "", {"id": None, "error": "Request must be a JSON object"}
+
+        request_id = request.get("id")
+        kind = request.get("type", "")
+        try:
+            kind = SCRIPT_TYPES.get(kind, kind)
+            result = self.score(kind, request.get("input"))
+        except Exception as e:
+            return kind, {"id": request_id, "error": str(e)}
+
+        self.handled += 1
+        return kind, {"id": request_id, "result": result}
+
+    def serve(self, stdin=None, stdout=None, binary: bool = False) -> int:
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        writer = None
+        if binary:
+            writer = FrameWriter(getattr(stdout, "buffer", stdout), Codebook.from_analyzer(self._bio()))
+            writer.flush()
+
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            if writer is None:
+                stdout.write(json.dumps(self.handle_line(line)) + "\n")
+                stdout.flush()
+                continue
+
+            kind, response = self._handle(line)
+            request_id = response["id"] if isinstance(response["id"], int) and 0 <= response["id"] < NO_ID else NO_ID
+            if "error" in response:
+                writer.write_error(request_id, response["error"])
+            elif kind == "bio":
+                writer.write_bio(request_id, response["result"])
+            else:
+                writer.write_json(request_id, response["result"])
+            writer.flush()
+
+        return self.handled
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--metrics" in args:
+        import scoring_metrics
+        args = scoring_metrics.enable_from_argv(args)
+    cache = ScoreCache() if "--cache" in args else None
+    phash_index = None
+    if "--phash" in args:
+        from phash_index import PerceptualIndex
+        phash_index = PerceptualIndex()
+    ScoringWorker(cache, phash_index).serve(binary="--binary" in args)
+    if phash_index is not None:
+        phash_index.save()
@@ -3,6 +3,7 @@ const fs = require('fs');
 const path = require('path');
 const { PythonShell } = require('python-shell');
 const aiCache = require('./ai_cache');
+const scoringWorker = require('./scoring_worker');
 const fetch = require('node-fetch');
 const { HttpsProxyAgent } = require('https-proxy-agent');
 
@@ -603,6 +604,13 @@ function getRealBusinessUsernames(keyword) {
 
 // Run Python AI scoring scripts
 async function runPythonScript(script, arg) {
+  // Prefer the resident scoring worker (no interpreter startup per lead)
+  try {
+    return await scoringWorker.score(script, arg);
+  } catch (error) {
+    logError(`⚠️ Scoring worker failed for ${script}, falling back to one-shot run: ${error.message}`);
+  }
+
   try {
     const options = {
       mode: 'text',
@@ -795,6 +803,75 @@ function calculateLeadScore(profileData, bioScore, visionScore) {
   };
 }
 
+// Fused scoring through the resident worker (lead_score.py): one round trip per lead
+// instead of separate bio and vision requests plus the JS contact/lead-score pass
+async function scoreLead(profileData, keyword) {
+  try {
+    return await scoringWorker.scoreLead({ ...profileData, keyword });
+  } catch (error) {
+    logError(`⚠️ Fused lead scoring failed for ${profileData.username}, scoring step by step: ${error.message}`);
+  }
+  return scoreLeadStepByStep(profileData, keyword);
+}
+
+// Same lead object as lead_score.py, built from separate bio and vision runs
+async function scoreLeadStepByStep(profileData, keyword) {
+  const finalScreenshotPath = profileData.screenshotPath;
+
+  // Enhanced data analysis
+  const contactInfo = extractContactInfo(profileData);
+  const activityData = analyzeActivity(profileData);
+
+  const bioScore = await runPythonScript('bio_score_fast.py', profileData.bio);
+  logError(`📝 Bio score: ${bioScore?.pitch_score ?? 'N/A'}`);
+
+  const visionScore = finalScreenshotPath ?
+    await runPythonScript('vision_score.py', finalScreenshotPath) :
+    { professional_score: 5 };
+  logError(`👁️ Vision score: ${visionScore?.professional_score ?? 'N/A'}`);
+
+  // Calculate lead score using your existing algorithm
+  const leadScore = calculateLeadScore(profileData, bioScore, visionScore);
+
+  // Build final lead object in your exact format
+  return {
+    username: profileData.username,
+    displayName: profileData.displayName,
+    bio: profileData.bio,
+    followers: profileData.followers,
+    following: profileData.following,
+    posts: profileData.posts,
+    isVerified: profileData.isVerified,
+    isPrivate: profileData.isPrivate,
+    url: profileData.url,
+    profilePicUrl: profileData.profilePicUrl,
+    externalUrl: profileData.externalUrl,
+    businessCategory: profileData.businessCategory,
+    isBusinessAccount: profileData.isBusinessAccount,
+    screenshot: finalScreenshotPath ? finalScreenshotPath.replace(__dirname, '').replace(/\\/g, '/') : null,  // Frontend expects 'screenshot' field
+    
+    // Enhanced fields
+    contactInfo: contactInfo,
+    activityData: activityData,
+    
+    // AI Analysis
+    bioScore: bioScore,
+    visionScore: visionScore,
+    leadScore: leadScore.score,
+    leadTier: leadScore.tier,
+    leadPriority: leadScore.priority,
+    leadAction: leadScore.action,
+    leadConfidence: leadScore.confidence,
+    leadFactors: leadScore.factors,
+    
+    // Metadata
+    scrapedAt: new Date().toISOString(),
+    source: 'apify_instagram',
+    keyword: keyword,
+    dataQuality: 'high'
+  };
+}
+
 // Main scraping function - maintains exact same interface as original scraper
 async function scrape(keyword, maxPages = 2, delayMs = 1000, massMode = false, options = {}) {
   const { minFollowers = 50, maxFollowers = 2500000 } = options;
@@ -1122,61 +1199,10 @@ async function scrape(keyword, maxPages = 2, delayMs = 1000, massMode = false, o
           continue;
         }
         
-        // Enhanced data analysis
-        const contactInfo = extractContactInfo(profileData);
-        const activityData = analyzeActivity(profileData);
-        
-        // AI Analysis (same as your original scraper)
+        // Bio + vision + contact info + lead score in one scoring worker round trip
         logError(`🧠 Running AI analysis for ${profileData.username}...`);
-        const bioScore = await runPythonScript('bio_score_fast.py', profileData.bio);
-        logError(`📝 Bio score: ${bioScore?.pitch_score ?? 'N/A'}`);
-        
-        const visionScore = finalScreenshotPath ? 
-          await runPythonScript('vision_score.py', finalScreenshotPath) : 
-          { professional_score: 5 };
-        logError(`👁️ Vision score: ${visionScore?.professional_score ?? 'N/A'}`);
-        
-        // Calculate lead score using your existing algorithm
-        const leadScore = calculateLeadScore(profileData, bioScore, visionScore);
-        logError(`🎯 Lead score: ${leadScore.score} (${leadScore.tier})`);
-        
-        // Build final lead object in your exact format
-        const lead = {
-          username: profileData.username,
-          displayName: profileData.displayName,
-          bio: profileData.bio,
-          followers: profileData.followers,
-          following: profileData.following,
-          posts: profileData.posts,
-          isVerified: profileData.isVerified,
-          isPrivate: profileData.isPrivate,
-          url: profileData.url,
-          profilePicUrl: profileData.profilePicUrl,
-          externalUrl: profileData.externalUrl,
-          businessCategory: profileData.businessCategory,
-          isBusinessAccount: profileData.isBusinessAccount,
-          screenshot: finalScreenshotPath ? finalScreenshotPath.replace(__dirname, '').replace(/\\/g, '/') : null,  // Frontend expects 'screenshot' field
-          
-          // Enhanced fields
-          contactInfo: contactInfo,
-          activityData: activityData,
-          
-          // AI Analysis
-          bioScore: bioScore,
-          visionScore: visionScore,
-          leadScore: leadScore.score,
-          leadTier: leadScore.tier,
-          leadPriority: leadScore.priority,
-          leadAction: leadScore.action,
-          leadConfidence: leadScore.confidence,
-          leadFactors: leadScore.factors,
-          
-          // Metadata
-          scrapedAt: new Date().toISOString(),
-          source: 'apify_instagram',
-          keyword: keyword,
-          dataQuality: 'high'
-        };
+        const lead = await scoreLead(profileData, keyword);
+        logError(`🎯 Lead score: ${lead.leadScore} (${lead.leadTier})`);
         
         // 🔥 REAL-TIME UPDATES: Add lead to global array immediately for frontend
         if (!global.latestLeads) {
@@ -1186,7 +1212,7 @@ async function scrape(keyword, maxPages = 2, delayMs = 1000, massMode = false, o
         logError(`📊 Real-time update: Added ${lead.username} to live feed (${global.latestLeads.length} total leads)`);
         
         leads.push(lead);
-        logError(`✅ Processed ${lead.username} - Score: ${leadScore.score} (${leadScore.tier})`);
+        logError(`✅ Processed ${lead.username} - Score: ${lead.leadScore} (${lead.leadTier})`);
         
         // Update scraping stats for real-time progress
         if (global.scrapingStats) {
@@ -2,6 +2,7 @@ const fs = require('fs');
 const puppeteer = require('puppeteer-extra');
 const StealthPlugin = require('puppeteer-extra-plugin-stealth');
 const { PythonShell } = require('python-shell');
+const { ScoringWorkerClient } = require('./scoring_worker');
 const path = require('path');
 const randomUseragent = require('random-useragent');
 const fetch = require('node-fetch');
@@ -16,6 +17,9 @@ const BROWSER_POOL_SIZE = 1; // Single browser for simplicity
 const MAX_CONCURRENT_PROFILES = 1; // Sequential processing for reliability
 const PYTHON_TIMEOUT = 3000; // 3 second timeout for Python scripts
 
+// Resident scorer held to the same budget as a one-shot script run
+const scoringWorker = new ScoringWorkerClient({ timeoutMs: PYTHON_TIMEOUT });
+
 // Paths
 const LOGS_DIR = path.join(__dirname, 'logs');
 const ERROR_LOG = path.join(LOGS_DIR, 'scrape_errors.log');
@@ -93,6 +97,13 @@ async function closeBrowser() {
 
 // Fast Python script execution with timeout
 async function runPythonScript(script, arg) {
+  // Prefer the resident scoring worker (no interpreter startup per lead)
+  try {
+    return await scoringWorker.score(script, arg);
+  } catch (error) {
+    logError(`Scoring worker failed for ${script}, falling back to one-shot run: ${error.message}`);
+  }
+
   return new Promise((resolve) => {
     const timeout = setTimeout(() => {
       logError(`⏰ Python script ${script} timed out`);
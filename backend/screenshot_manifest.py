@@ -0,0 +1,185 @@
+import sys
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from async_vision_scoring import IMAGE_EXTENSIONS, SCREENSHOTS_DIR
+from score_cache import content_hash, file_hash
+from vision_score import SCORER_VERSION, ProfessionalVisionAnalyzer
+
+# Incremental screenshot manifest: vision results keyed on stat fingerprints.
+#
+#   files(path TEXT PRIMARY KEY, directory TEXT, size INTEGER, mtime_ns INTEGER,
+#         inode INTEGER, content_key TEXT, version TEXT, result TEXT)
+#
+# A file whose (size, mtime_ns, inode) still matches its row, scored with the current
+# SCORER_VERSION, keeps its result without being opened. sync() finds everything else
+# with one os.scandir pass (d_type and inode come with the directory entry, so the only
+# per-file syscall is one stat) against the fingerprints of the directory, loaded in a
+# single query. Only a changed fingerprint costs a content hash:
+#   same content (touched, copied back)      -> new fingerprint, result kept
+#   content + name seen under another path   -> result reused (vision scores depend on
+#                                               the file name, so it is part of the key)
+#   otherwise                                -> scored
+# Rows of files that are gone are dropped. All changes land in one transaction.
+#
+#   python screenshot_manifest.py [directory]   -> sync, print counts
+#   python screenshot_manifest.py export [directory] > vision.jsonl
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST_PATH = os.path.join(BACKEND_DIR, "cache", "screenshot_manifest.db")
+
+Fingerprint = Tuple[int, int, int]
+
+
+def content_key(path: str) -> str:
+    # Same key score_cache.py uses for vision results: image bytes plus lowercased name
+    return content_hash(file_hash(path).encode("ascii") + os.path.basename(path).lower().encode("utf-8"))
+
+
+def scan_fingerprints(directory: str) -> Dict[str, Fingerprint]:
+    # path -> (size, mtime_ns, inode) for every image file, in one scandir pass
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file():
+                stat = entry.stat()
+                found[entry.path] = (stat.st_size, stat.st_mtime_ns, entry.inode())
+    return found
+
+
+class ScreenshotManifest:
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH, analyzer: ProfessionalVisionAnalyzer = None):
+        self.path = path
+        self._analyzer = analyzer
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                directory TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                content_key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                result TEXT NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_directory ON files (directory)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_content ON files (content_key, version)")
+        self._db.commit()
+
+    @property
+    def analyzer(self) -> ProfessionalVisionAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = ProfessionalVisionAnalyzer()
+        return self._analyzer
+
+    def _known_result(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT result FROM files WHERE content_key = ? AND version = ? LIMIT 1",
+                               (key, SCORER_VERSION)).fetchone()
+        return row[0] if row else None
+
+    def _refresh(self, path: str, stored: Optional[Tuple[str, str]], score: Callable[[str], Dict],
+                 pending: Dict[str, str]) -> Tuple[str, str, str]:
+        # (content_key, result JSON, outcome) for a file whose fingerprint changed;
+        # pending: content_key -> result of rows not yet written
+        key = content_key(path)
+        if stored is not None and stored[0] == key:
+            return key, stored[1], "touched"
+        result = pending.get(key) or self._known_result(key)
+        if result is not None:
+            return key, result, "reused"
+        result = pending[key] = json.dumps(score(path))
+        return key, result, "scored"
+
+    def sync(self, directory: str = SCREENSHOTS_DIR, score: Callable[[str], Dict] = None) -> Dict:
+        # Bring the directory's rows up to date; score(path) defaults to analyze_image
+        started = time.perf_counter()
+        directory = os.path.abspath(directory)
+        found = scan_fingerprints(directory)
+        known = {
+            path: ((size, mtime_ns, inode), version)
+            for path, size, mtime_ns, inode, version in self._db.execute(
+                "SELECT path, size, mtime_ns, inode, version FROM files WHERE directory = ?", (directory,))
+        }
+        counts = {"images": len(found), "unchanged": 0, "touched": 0, "reused": 0, "scored": 0, "deleted": 0}
+
+        changed = [path for path, fingerprint in found.items()
+                   if known.get(path) != (fingerprint, SCORER_VERSION)]
+        counts["unchanged"] = len(found) - len(changed)
+        deleted = [path for path in known if path not in found]
+
+        if changed or deleted:
+            score = score or self.analyzer.analyze_image
+            rows = []
+            pending: Dict[str, str] = {}
+            for path in sorted(changed):
+                stored = None
+                if path in known and known[path][1] == SCORER_VERSION:
+                    stored = self._db.execute("SELECT content_key, result FROM files WHERE path = ?", (path,)).fetchone()
+                try:
+                    key, result, outcome = self._refresh(path, stored, score, pending)
+                except OSError:
+                    # Vanished or unreadable since the scan; picked up by the next sync
+                    continue
+                counts[outcome] += 1
+                rows.append((path, directory) + found[path] + (key, SCORER_VERSION, result))
+            with self._db:
+                self._db.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in deleted])
+                self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            counts["deleted"] = len(deleted)
+
+        counts["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return counts
+
+    def analyze_image(self, image_path: str) -> Dict:
+        # analyze_image through the manifest: one stat, and a hash only on a changed fingerprint
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return self.analyzer.analyze_image(image_path)
+        path = os.path.abspath(image_path)
+        fingerprint = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        row = self._db.execute(
+            "SELECT size, mtime_ns, inode, version, content_key, result FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and tuple(row[:3]) == fingerprint and row[3] == SCORER_VERSION:
+            return json.loads(row[5])
+
+        stored = (row[4], row[5]) if row is not None and row[3] == SCORER_VERSION else None
+        key, result, _ = self._refresh(path, stored, self.analyzer.analyze_image, {})
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (path, os.path.dirname(path)) + fingerprint + (key, SCORER_VERSION, result))
+        return json.loads(result)
+
+    def results(self, directory: str = SCREENSHOTS_DIR) -> Iterator[Tuple[str, Dict]]:
+        query = "SELECT path, result FROM files WHERE directory = ? ORDER BY path"
+        for path, result in self._db.execute(query, (os.path.abspath(directory),)):
+            yield path, json.loads(result)
+
+    def stats(self) -> Dict:
+        files, directories = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT directory) FROM files").fetchone()
+        return {"files": files, "directories": directories}
+
+    def close(self):
+        self._db.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    manifest = ScreenshotManifest()
+    if args and args[0] == "export":
+        for path, result in manifest.results(args[1] if len(args) > 1 else SCREENSHOTS_DIR):
+            print(json.dumps({"type": "vision", "input": os.path.relpath(path, BACKEND_DIR), "result": result}))
+    else:
+        print(json.dumps(manifest.sync(args[0] if args else SCREENSHOTS_DIR)))
+    manifest.close()
@@ -0,0 +1,345 @@
+import sys
+import json
+import os
+import time
+import heapq
+import socket
+import hashlib
+import subprocess
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from score_cache import ScoreCache
+from scoring_worker import ScoringWorker
+
+# Hash-sharded scoring: a coordinator and any number of workers sharing one directory.
+#
+# The manifest is scoring_worker.py requests, one per line:
+#   {"id": 17, "type": "bio", "input": "Certified trainer in NYC"}
+#   {"id": "shot-3", "type": "vision", "input": "/data/screenshots/foo.png"}
+# Each request goes to shard sha256(type + input) % shards, so a given bio or
+# screenshot always lands in the same shard for the same shard count (and repeated
+# bios meet in one worker's memo). The split needs no image reads; paths are opened
+# as given, so give workers on other hosts paths that resolve there.
+#
+# Run directory: cache/shards/<manifest hash>-<shards>/
+#   run.json                   written last; its presence means the split is complete
+#   shard-0007.jsonl           input requests, each tagged with its manifest line "seq"
+#   shard-0007.claim           O_EXCL claim {"host", "pid", "claimed", "token"}, mtime = heartbeat
+#   shard-0007.out.jsonl       output, renamed into place only once the shard is done
+#
+# The directory is the queue: a worker claims the first shard with neither output nor
+# live claim, scores it, renames its output into place and drops the claim. A claim is
+# stale when its worker is gone (same host, dead pid) or its heartbeat is older than
+# CLAIM_LEASE_SECONDS (any host), and is then taken over: renamed aside, so only one
+# worker takes it. Workers recheck their claim token at each heartbeat and before
+# publishing output, and abandon a shard whose claim is no longer theirs. Workers on
+# other hosts only need the run directory on a shared filesystem:
+#   python shard_scoring.py worker cache/shards/<run> [--cache]
+#
+# The coordinator splits, starts local workers, polls until every shard has output
+# (rerunning it after a crash resumes: finished shards are kept) and merges the shard
+# outputs back into manifest order with a streaming k-way merge.
+#
+#   python shard_scoring.py run manifest.jsonl [shards] [workers] > results.jsonl
+#   python shard_scoring.py manifest > manifest.jsonl   (saved session bios + screenshots)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARDS_DIR = os.path.join(BACKEND_DIR, "cache", "shards")
+
+DEFAULT_SHARDS = 16
+CLAIM_LEASE_SECONDS = 300
+HEARTBEAT_ITEMS = 200
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 5
+
+
+def shard_of(kind: str, value, shards: int) -> int:
+    digest = hashlib.sha256(f"{kind}\0{value}".encode("utf-8", "surrogatepass")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _shard_path(run_dir: str, shard: int, suffix: str) -> str:
+    return os.path.join(run_dir, f"shard-{shard:04d}{suffix}")
+
+
+def split_manifest(manifest_path: str, shards: int = DEFAULT_SHARDS, shards_dir: str = SHARDS_DIR) -> str:
+    # Returns the run directory; an existing complete split of the same manifest is reused
+    run_dir = os.path.join(shards_dir, f"{file_digest(manifest_path)[:16]}-{shards}")
+    run_file = os.path.join(run_dir, "run.json")
+    if os.path.exists(run_file):
+        return run_dir
+
+    os.makedirs(run_dir, exist_ok=True)
+    outputs = [open(_shard_path(run_dir, shard, ".jsonl"), "w", encoding="utf-8") for shard in range(shards)]
+    items = 0
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            for seq, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    request = {"id": seq, "type": "bio", "input": request}
+                request["seq"] = seq
+                shard = shard_of(request.get("type", ""), request.get("input"), shards)
+                outputs[shard].write(json.dumps(request) + "\n")
+                items += 1
+    finally:
+        for output in outputs:
+            output.close()
+
+    temp = f"{run_file}.{os.getpid()}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump({"manifest": os.path.abspath(manifest_path), "shards": shards, "items": items}, f)
+    os.replace(temp, run_file)
+    return run_dir
+
+
+def read_run(run_dir: str) -> Dict:
+    with open(os.path.join(run_dir, "run.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def incomplete_shards(run_dir: str) -> List[int]:
+    return [shard for shard in range(read_run(run_dir)["shards"])
+            if not os.path.exists(_shard_path(run_dir, shard, ".out.jsonl"))]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _claim_is_stale(claim_path: str) -> bool:
+    try:
+        with open(claim_path, "r", encoding="utf-8") as f:
+            claim = json.load(f)
+        heartbeat = os.path.getmtime(claim_path)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        # Half-written claim: its worker died between create and write, or is still writing
+        try:
+            return time.time() - os.path.getmtime(claim_path) > CLAIM_LEASE_SECONDS
+        except OSError:
+            return False
+    if claim.get("host") == socket.gethostname() and not _pid_alive(claim.get("pid", 0)):
+        return True
+    return time.time() - heartbeat > CLAIM_LEASE_SECONDS
+
+
+class ShardWorker:
+    def __init__(self, run_dir: str, scorer: ScoringWorker = None):
+        self.run_dir = run_dir
+        self.scorer = scorer or ScoringWorker()
+        self.host = socket.gethostname()
+        self.shards = read_run(run_dir)["shards"]
+        # Identifies this worker's claims; host and pid alone can repeat across containers
+        self.token = os.urandom(8).hex()
+
+    def claim(self, shard: int) -> bool:
+        claim_path = _shard_path(self.run_dir, shard, ".claim")
+        for _ in range(2):
+            if os.path.exists(_shard_path(self.run_dir, shard, ".out.jsonl")):
+                return False
+            try:
+                fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not _claim_is_stale(claim_path) or not self._take_over(claim_path):
+                    return False
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"host": self.host, "pid": os.getpid(), "claimed": time.time(), "token": self.token}, f)
+            # The shard may have finished between the output check and the claim
+            if os.path.exists(_shard_path(self.run_dir, shard, ".out.jsonl")):
+                os.remove(claim_path)
+                return False
+            return self.owns(shard)
+        return False
+
+    def _take_over(self, claim_path: str) -> bool:
+        # Move a stale claim aside; rename is atomic, so of several workers that saw it
+        # stale only one moves it. If what was moved is no longer stale, another worker
+        # took the shard over between our check and the rename: put its claim back.
+        aside = f"{claim_path}.{self.host}.{os.getpid()}.stale"
+        try:
+            os.rename(claim_path, aside)
+        except FileNotFoundError:
+            return True
+        stale = _claim_is_stale(aside)
+        if not stale:
+            try:
+                os.link(aside, claim_path)
+            except FileExistsError:
+                # A third worker claimed meanwhile; the displaced owner sees it has lost
+                # the claim at its next ownership check and abandons the shard
+                pass
+        os.remove(aside)
+        return stale
+
+    def owns(self, shard: int) -> bool:
+        try:
+            with open(_shard_path(self.run_dir, shard, ".claim"), "r", encoding="utf-8") as f:
+                return json.load(f).get("token") == self.token
+        except (OSError, ValueError):
+            return False
+
+    def score_shard(self, shard: int) -> Optional[int]:
+        # Item count, or None if the claim was lost to another worker mid-shard
+        claim_path = _shard_path(self.run_dir, shard, ".claim")
+        output_path = _shard_path(self.run_dir, shard, ".out.jsonl")
+        temp = f"{output_path}.{self.host}.{os.getpid()}.tmp"
+        count = 0
+        with open(_shard_path(self.run_dir, shard, ".jsonl"), "r", encoding="utf-8") as source, \
+                open(temp, "w", encoding="utf-8") as out:
+            for line in source:
+                seq = json.loads(line)["seq"]
+                response = self.scorer.handle_line(line)
+                response["seq"] = seq
+                out.write(json.dumps(response) + "\n")
+                count += 1
+                if count % HEARTBEAT_ITEMS == 0:
+                    if not self.owns(shard):
+                        break
+                    os.utime(claim_path)
+        if not self.owns(shard):
+            os.remove(temp)
+            return None
+        os.replace(temp, output_path)
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            pass
+        return count
+
+    def run(self) -> Dict:
+        done = []
+        for shard in range(self.shards):
+            if self.claim(shard):
+                try:
+                    count = self.score_shard(shard)
+                except BaseException:
+                    # Release the claim so another worker can retry the shard
+                    if self.owns(shard):
+                        try:
+                            os.remove(_shard_path(self.run_dir, shard, ".claim"))
+                        except FileNotFoundError:
+                            pass
+                    raise
+                if count is not None:
+                    done.append(shard)
+        return {"host": self.host, "pid": os.getpid(), "shards": done}
+
+
+def merge_outputs(run_dir: str) -> Iterator[Dict]:
+    # Shard outputs are each in seq order, so a k-way merge restores manifest order
+    missing = incomplete_shards(run_dir)
+    if missing:
+        raise RuntimeError(f"Shards not finished: {missing}")
+
+    def read(shard: int) -> Iterator:
+        with open(_shard_path(run_dir, shard, ".out.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                response = json.loads(line)
+                yield response.pop("seq"), response
+
+    for _, response in heapq.merge(*(read(shard) for shard in range(read_run(run_dir)["shards"])),
+                                   key=lambda item: item[0]):
+        yield response
+
+
+def coordinate(manifest_path: str, shards: int = DEFAULT_SHARDS, workers: Optional[int] = None,
+               worker_args: List[str] = None, shards_dir: str = SHARDS_DIR) -> str:
+    # Split, run local workers until every shard has output, return the run directory.
+    # Shards held by live claims (workers on other hosts, or a previous coordinator's)
+    # are waited on until they finish or their lease lapses; only rounds in which local
+    # workers ran and still left shards unclaimed count towards MAX_ATTEMPTS.
+    run_dir = split_manifest(manifest_path, shards, shards_dir)
+    workers = workers or os.cpu_count() or 1
+    attempt = 0
+    while True:
+        missing = incomplete_shards(run_dir)
+        if not missing:
+            remove_partial_outputs(run_dir)
+            return run_dir
+        claimable = [shard for shard in missing if not _claimed(run_dir, shard)]
+        if not claimable:
+            time.sleep(POLL_SECONDS)
+            continue
+        attempt += 1
+        if attempt > MAX_ATTEMPTS:
+            raise RuntimeError(f"Shards still unfinished after {MAX_ATTEMPTS} attempts: {claimable}")
+        sys.stderr.write(f"[shards] attempt {attempt}: {len(missing)}/{shards} shards left "
+                         f"({len(claimable)} unclaimed), {workers} workers\n")
+        processes = [
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", run_dir] + (worker_args or []),
+                             stdout=subprocess.DEVNULL)
+            for _ in range(min(workers, len(claimable)))
+        ]
+        for process in processes:
+            if process.wait() != 0:
+                sys.stderr.write(f"[shards] worker {process.pid} exited with {process.returncode}\n")
+
+
+def _claimed(run_dir: str, shard: int) -> bool:
+    claim_path = _shard_path(run_dir, shard, ".claim")
+    return os.path.exists(claim_path) and not _claim_is_stale(claim_path)
+
+
+def remove_partial_outputs(run_dir: str):
+    # Output temp files left behind by workers that died mid-shard
+    for name in os.listdir(run_dir):
+        if name.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(run_dir, name))
+            except FileNotFoundError:
+                pass
+
+
+def write_manifest(out: TextIO) -> int:
+    # Saved session bios and screenshots as a manifest
+    from parallel_scoring import collect_session_bios, list_screenshots
+    count = 0
+    for bio_text in collect_session_bios():
+        out.write(json.dumps({"id": count, "type": "bio", "input": bio_text}) + "\n")
+        count += 1
+    for path in list_screenshots():
+        out.write(json.dumps({"id": count, "type": "vision", "input": path}) + "\n")
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    command = args[0] if args else "run"
+    if command == "worker":
+        cache = ScoreCache() if "--cache" in flags else None
+        print(json.dumps(ShardWorker(args[1], ScoringWorker(cache)).run()))
+    elif command == "manifest":
+        write_manifest(sys.stdout)
+    elif command == "merge":
+        for response in merge_outputs(args[1]):
+            sys.stdout.write(json.dumps(response) + "\n")
+    else:
+        manifest_path = args[1]
+        shards = int(args[2]) if len(args) > 2 else DEFAULT_SHARDS
+        workers = int(args[3]) if len(args) > 3 else None
+        run_dir = coordinate(manifest_path, shards, workers, [flag for flag in flags if flag == "--cache"])
+        for response in merge_outputs(run_dir):
+            sys.stdout.write(json.dumps(response) + "\n")
+        sys.stderr.write(f"[shards] merged {run_dir}\n")
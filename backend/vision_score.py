@@ -1,11 +1,73 @@
+from __future__ import annotations
+
 import sys
-import json
+import io
 import os
-from typing import Dict, List
-import hashlib
+import math
+import struct
+
+# Only type checkers need typing; skipping it trims the per-screenshot CLI start
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Tuple
+
+# Bump when scoring logic changes so cached results are not reused (score_cache.py)
+SCORER_VERSION = "vision_score/3"
+
+# Pixel statistics are computed on a reduced copy no larger than this (longest side)
+ANALYSIS_SIZE = 256
+
+# screenshot_normalize.py saves that reduced copy next to the original as
+# <name><NORMALIZED_SUFFIX>: a NORMALIZED_HEADER record (magic, version, original
+# width/height, reduced rows/cols, then the pixel statistics in NORMALIZED_STATS order)
+# followed by the zlib-compressed rgb uint8 pixels, with its mtime set to the
+# original's. A copy with a matching mtime and version answers the statistics from its
+# header alone, so a one-shot vision_score.py run imports neither numpy nor Pillow
+# (~300 ms); the pixels are inflated (~0.3 ms against several ms for decoding a
+# full-size PNG) only where they are still needed, for the perceptual hash. Small
+# originals get a header-only copy (rows = cols = 0). Bump NORMALIZED_VERSION whenever
+# _pixel_statistics changes, so stored statistics are recomputed
+NORMALIZED_SUFFIX = ".analysis.z"
+NORMALIZED_VERSION = 4
+NORMALIZED_MAGIC = b"VSAZ"
+NORMALIZED_STATS = ("width", "height", "brightness", "contrast", "sharpness", "color_entropy", "edge_density",
+                    "balance", "thirds")
+NORMALIZED_HEADER = struct.Struct("<4sHIIHH" + "d" * len(NORMALIZED_STATS))
+
+# Methods timed when scoring_metrics is enabled (_error_score calls count failures)
+METRIC_STAGES = (
+    "analyze_image", "_score_image", "_file_info", "_image_statistics", "normalized_statistics", "image_pixels",
+    "normalized_pixels", "reduced_pixels", "_pixel_statistics",
+    "_analyze_professionalism", "_analyze_branding_elements", "_error_score"
+)
+
+_pixel_libraries_cache = None
+
+def _pixel_libraries():
+    # numpy + Pillow are optional; without them scoring falls back to file heuristics
+    global _pixel_libraries_cache
+    if _pixel_libraries_cache is None:
+        try:
+            import numpy
+            from PIL import Image
+            _pixel_libraries_cache = (numpy, Image)
+        except ImportError:
+            _pixel_libraries_cache = ()
+    return _pixel_libraries_cache or None
+
+def _metrics_enabled() -> bool:
+    # scoring_metrics is imported only when instrumentation can be on: something already
+    # loaded it (enable(), --metrics) or SCORING_METRICS is set
+    if "scoring_metrics" not in sys.modules and not os.environ.get("SCORING_METRICS"):
+        return False
+    import scoring_metrics
+    return scoring_metrics.enabled()
 
 class ProfessionalVisionAnalyzer:
-    def __init__(self):
+    def __init__(self, phash_index=None):
+        # Optional phash_index.PerceptualIndex: near-duplicate images reuse stored pixel statistics
+        self.phash_index = phash_index
+
         # Professional image indicators (based on filename patterns and common characteristics)
         self.professional_indicators = {
             "high_quality": ["hd", "high", "quality", "professional", "studio"],
@@ -32,28 +94,85 @@ class ProfessionalVisionAnalyzer:
             "composition": ["headshot", "portrait", "professional", "centered"]
         }
 
-    def analyze_image(self, image_path: str) -> Dict:
-        if not image_path or not os.path.exists(image_path):
+        if _metrics_enabled():
+            self._instrument()
+
+    def _instrument(self):
+        import scoring_metrics
+        metrics = scoring_metrics.metrics
+        metrics.instrument(self, "vision", METRIC_STAGES)
+        if self.phash_index is not None:
+            self.phash_index.lookup = metrics.timed("vision.phash_lookup", self.phash_index.lookup)
+            metrics.register_collector("phash_index", self.phash_index.stats)
+
+    def analyze_image(self, image_path: str, file_size: Optional[int] = None) -> Dict:
+        # file_size: the size the caller already stat'ed (async_vision_scoring.py's scandir)
+        if not image_path or (file_size is None and not os.path.exists(image_path)):
             return self._default_score()
         
+        if self.phash_index is not None:
+            return self._score_indexed(image_path, file_size)
+        
+        return self._score_image(image_path, file_size)
+
+    def analyze_image_data(self, image_path: str, data: bytes, file_size: int) -> Dict:
+        # Same result as analyze_image for bytes the caller already read and stat'ed;
+        # image_path only supplies the file name, so a normalized copy is never used
+        if self.phash_index is not None:
+            return self._score_indexed(image_path, file_size, data)
+
+        return self._score_image(image_path, file_size, data)
+
+    def _score_indexed(self, image_path: str, file_size: Optional[int] = None, data: Optional[bytes] = None) -> Dict:
+        # Near-duplicates share pixel statistics only: quality and composition come from
+        # the stored stats, while the name- and size-based scores are computed for this file.
+        # The image is decoded once: the hash is taken from the same reduced pixels
+        # (or normalized copy) the statistics use
+        from phash_index import dhash_pixels
+        pixels = self.image_pixels(image_path if data is None else io.BytesIO(data))
+        image_hash = dhash_pixels(pixels[0]) if pixels is not None else None
+        match = self.phash_index.lookup(image_hash)
+        if match is not None:
+            distance, entry = match
+            result = self._score_image(image_path, file_size, data, entry["stats"])
+            if "error" not in result:
+                result["duplicate_of"] = entry["path"]
+                result["hash_distance"] = distance
+            return result
+
+        image_stats = self._statistics(pixels)
+        result = self._score_image(image_path, file_size, data, image_stats)
+        if image_hash is not None and image_stats is not None:
+            self.phash_index.add(image_path, image_hash, image_stats)
+        return result
+
+    def _score_image(self, image_path: str, file_size: Optional[int] = None, data: Optional[bytes] = None,
+                     image_stats: Optional[Dict[str, float]] = None) -> Dict:
+        # image_stats: pixel statistics already computed for this image (decoded here if None)
         try:
-            # Get file information
-            file_stats = os.stat(image_path)
-            file_size = file_stats.st_size
-            filename = os.path.basename(image_path).lower()
+            if file_size is None:
+                file_size, filename = self._file_info(image_path)
+            else:
+                filename = os.path.basename(image_path).lower()
             
-            # Quick analysis based on file characteristics
-            quality_score = self._analyze_image_quality(file_size, filename)
+            # Pixel statistics when the image can be decoded, file characteristics otherwise
+            if image_stats is None:
+                image_stats = self._image_statistics(image_path if data is None else io.BytesIO(data))
+            if image_stats is not None:
+                quality_score = self._pixel_quality_score(image_stats)
+                composition_score = self._pixel_composition_score(image_stats)
+            else:
+                quality_score = self._analyze_image_quality(file_size, filename)
+                composition_score = self._analyze_composition(filename, file_size)
             professional_score = self._analyze_professionalism(filename, file_size)
             branding_score = self._analyze_branding_elements(filename)
-            composition_score = self._analyze_composition(filename, file_size)
             
             # Calculate overall scores
             overall_professional = self._calculate_overall_professional_score(
                 quality_score, professional_score, branding_score, composition_score
             )
             
-            return {
+            result = {
                 "professional_score": round(overall_professional, 1),
                 "quality_score": round(quality_score, 1),
                 "branding_score": round(branding_score, 1),
@@ -66,10 +185,165 @@ class ProfessionalVisionAnalyzer:
                 "marketability": self._assess_marketability(overall_professional, branding_score),
                 "recommendation": self._generate_recommendation(overall_professional, quality_score)
             }
+            if image_stats is not None:
+                result["image_stats"] = {key: round(value, 3) for key, value in image_stats.items()}
+            return result
             
         except Exception as e:
             return self._error_score(str(e))
 
+    def _file_info(self, image_path: str) -> Tuple[int, str]:
+        return os.stat(image_path).st_size, os.path.basename(image_path).lower()
+
+    def _image_statistics(self, source) -> Optional[Dict[str, float]]:
+        # source: a path or a binary file object
+        image_stats = self.normalized_statistics(source) if isinstance(source, str) else None
+        return image_stats if image_stats is not None else self._statistics(self.image_pixels(source))
+
+    def _statistics(self, pixels) -> Optional[Dict[str, float]]:
+        if pixels is None:
+            return None
+        np = _pixel_libraries()[0]
+        rgb, width, height = pixels
+        return self._pixel_statistics(np, rgb.astype(np.float32), width, height)
+
+    def image_pixels(self, source):
+        # (rgb, width, height) as pixel statistics see the image: a path's fresh normalized
+        # copy, else the decoded and reduced image; None if not decodable (or no numpy/Pillow)
+        pixels = self.normalized_pixels(source) if isinstance(source, str) else None
+        return pixels if pixels is not None else self.reduced_pixels(source)
+
+    def normalized_statistics(self, image_path: str) -> Optional[Dict[str, float]]:
+        # Pixel statistics from a fresh normalized copy's header, or None; needs neither numpy nor Pillow
+        copy = self._normalized_copy(image_path, header_only=True)
+        return dict(zip(NORMALIZED_STATS, copy[0][6:])) if copy is not None else None
+
+    def normalized_pixels(self, image_path: str):
+        # (rgb, width, height) from a fresh normalized copy, or None (no copy, a header-only
+        # copy, or numpy missing)
+        libraries = _pixel_libraries()
+        if libraries is None:
+            return None
+        np = libraries[0]
+        import zlib
+
+        copy = self._normalized_copy(image_path, header_only=False)
+        if copy is None:
+            return None
+        (_, _, width, height, rows, cols, *_), data = copy
+        if not rows:
+            return None
+        try:
+            rgb = np.frombuffer(zlib.decompress(data[NORMALIZED_HEADER.size:]), np.uint8)
+            return rgb.reshape(rows, cols, 3), width, height
+        except (ValueError, zlib.error):
+            return None
+
+    def _normalized_copy(self, image_path: str, header_only: bool):
+        # (header fields, file contents) of a fresh normalized copy, or None
+        copy_path = image_path + NORMALIZED_SUFFIX
+        try:
+            if os.stat(copy_path).st_mtime_ns != os.stat(image_path).st_mtime_ns:
+                return None
+            with open(copy_path, "rb") as f:
+                data = f.read(NORMALIZED_HEADER.size) if header_only else f.read()
+            fields = NORMALIZED_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if fields[0] != NORMALIZED_MAGIC or fields[1] != NORMALIZED_VERSION:
+            return None
+        return fields, data
+
+    def reduced_pixels(self, source):
+        # (uint8 rgb no larger than ANALYSIS_SIZE, original width, original height), or None
+        libraries = _pixel_libraries()
+        if libraries is None:
+            return None
+        np, Image = libraries
+
+        try:
+            with Image.open(source) as img:
+                width, height = img.size
+                # JPEG can decode straight at a reduced scale; other formats reduce after decoding
+                img.draft("RGB", (ANALYSIS_SIZE, ANALYSIS_SIZE))
+                if img.mode != "RGB":
+                    img = img.convert("RGB")
+                # Rounded up, so the result is never larger than ANALYSIS_SIZE
+                factor = -(-max(img.size) // ANALYSIS_SIZE)
+                if factor > 1:
+                    img = img.reduce(factor)
+                return np.asarray(img), width, height
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+
+    def _pixel_statistics(self, np, rgb, width: int, height: int) -> Dict[str, float]:
+        gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        stats = {
+            "width": float(width),
+            "height": float(height),
+            "brightness": float(gray.mean()) / 255,
+            "contrast": float(gray.std()) / 255,
+            "sharpness": 0.0,
+            "color_entropy": 0.0,
+            "edge_density": 0.0,
+            "balance": 0.0,
+            "thirds": 0.0
+        }
+
+        # Color entropy over a 3-bit-per-channel palette, normalized to 0-1
+        levels = rgb.astype(np.uint8) >> 5
+        palette = (levels[..., 0].astype(np.int32) << 6) | (levels[..., 1].astype(np.int32) << 3) | levels[..., 2]
+        counts = np.bincount(palette.ravel(), minlength=512)
+        p = counts[counts > 0] / palette.size
+        stats["color_entropy"] = float(-(p * np.log2(p)).sum()) / 9
+
+        if min(gray.shape) < 3:
+            return stats
+
+        # Sharpness: variance of the Laplacian
+        laplacian = 4 * gray[1:-1, 1:-1] - gray[:-2, 1:-1] - gray[2:, 1:-1] - gray[1:-1, :-2] - gray[1:-1, 2:]
+        stats["sharpness"] = float(laplacian.var())
+
+        # Composition from gradient energy: how busy, how centered, how much on the thirds lines
+        energy = np.abs(np.diff(gray, axis=0))[:, :-1] + np.abs(np.diff(gray, axis=1))[:-1, :]
+        total = float(energy.sum())
+        stats["edge_density"] = float(energy.mean()) / 255
+        if total > 0:
+            rows, cols = energy.shape
+            row_weights = energy.sum(axis=1)
+            col_weights = energy.sum(axis=0)
+            center_y = float((row_weights * np.arange(rows)).sum()) / total / max(rows - 1, 1)
+            center_x = float((col_weights * np.arange(cols)).sum()) / total / max(cols - 1, 1)
+            stats["balance"] = max(0.0, 1.0 - 2 * ((center_x - 0.5) ** 2 + (center_y - 0.5) ** 2) ** 0.5)
+
+            band_rows = np.zeros(rows, dtype=bool)
+            band_cols = np.zeros(cols, dtype=bool)
+            for third in (1 / 3, 2 / 3):
+                band_rows[int(rows * (third - 1 / 12)):int(rows * (third + 1 / 12)) + 1] = True
+                band_cols[int(cols * (third - 1 / 12)):int(cols * (third + 1 / 12)) + 1] = True
+            band = band_rows[:, None] | band_cols[None, :]
+            # Energy share on the thirds bands relative to their share of the area (1.0 = uniform)
+            stats["thirds"] = float(energy[band].sum()) / total / float(band.mean())
+
+        return stats
+
+    def _pixel_quality_score(self, stats: Dict[str, float]) -> float:
+        sharpness = min(math.log1p(stats["sharpness"]) / math.log1p(1500), 1.0)
+        exposure = 1.0 - min(abs(stats["brightness"] - 0.5) * 2, 1.0)
+        contrast = min(stats["contrast"] / 0.25, 1.0)
+        resolution = min(stats["width"] * stats["height"] / (1080 * 1080), 1.0) ** 0.5
+
+        score = 1.0 + 3.0 * sharpness + 2.0 * exposure + 2.0 * contrast + 2.0 * resolution
+        return min(score, 10.0)
+
+    def _pixel_composition_score(self, stats: Dict[str, float]) -> float:
+        # Some structure, but not clutter (edge density around 0.08 reads as a clear subject)
+        detail = max(0.0, 1.0 - abs(stats["edge_density"] - 0.08) / 0.08)
+        thirds = min(max(stats["thirds"] - 0.8, 0.0) / 0.6, 1.0)
+
+        score = 1.0 + 3.0 * stats["balance"] + 2.0 * thirds + 2.0 * stats["color_entropy"] + 2.0 * detail
+        return min(score, 10.0)
+
     def _analyze_image_quality(self, file_size: int, filename: str) -> float:
         base_score = 3.0
         
@@ -247,7 +521,8 @@ class ProfessionalVisionAnalyzer:
             "key_strengths": [],
             "improvement_suggestions": [f"Error: {error_msg}"],
             "marketability": "Cannot assess",
-            "recommendation": f"❌ ERROR"
+            "recommendation": f"❌ ERROR",
+            "error": error_msg
         }
 
 def vision_score(image_path):
@@ -255,13 +530,23 @@ def vision_score(image_path):
     return analyzer.analyze_image(image_path)
 
 if __name__ == "__main__":
+    # --metrics (or SCORING_METRICS=1) reports stage timings on stderr when done
+    args = sys.argv[1:]
+    scoring_metrics = None
+    if "--metrics" in args or _metrics_enabled():
+        import scoring_metrics
+        args = scoring_metrics.enable_from_argv(args)
+    # cli_json writes what json.dumps would, without importing re and enum
+    import cli_json
     try:
-        img_path = sys.argv[1] if len(sys.argv) > 1 else ""
+        img_path = args[0] if args else ""
         result = vision_score(img_path)
-        print(json.dumps(result))
+        print(cli_json.dumps(result))
     except Exception as e:
         error_result = {
             "professional_score": 0.0,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(cli_json.dumps(error_result))
+    if scoring_metrics is not None:
+        scoring_metrics.dump_if_enabled()
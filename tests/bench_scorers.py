@@ -0,0 +1,286 @@
+# Benchmark harness for the Python scorers (bio_score.py, bio_score_fast.py, vision_score.py).
+#
+# Measures per-item latency (p50/p99), throughput, peak RSS and startup time, both
+# in-process (one warm analyzer) and in single-call CLI mode (one interpreter per item,
+# the way the Node scrapers call the scripts). Each scorer is benchmarked in its own
+# subprocess, so peak RSS (in-process: that subprocess; CLI: the largest of its
+# children) belongs to that scorer alone. Results are written as JSON and can be
+# compared against a saved baseline; any metric that regresses past the tolerance
+# makes the run exit non-zero. Runs too short to be stable (fewer than MIN_GATE_ITEMS
+# items or runs, in either result) are not gated, and a regression must also exceed
+# the section's NOISE_FLOOR_MS.
+#
+#   python tests/bench_scorers.py --output bench.json
+#   python tests/bench_scorers.py --baseline bench.json --tolerance 0.25
+
+import argparse
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Synthetic corpus vocabulary: scorer keywords mixed with everyday words per language
+KEYWORDS = [
+    "certified trainer", "personal trainer", "fitness coach", "yoga", "barber", "salon", "makeup",
+    "wedding photographer", "headshots", "chef", "catering", "realtor", "luxury homes", "consultant",
+    "business coach", "dentist", "clinic", "attorney", "law firm", "digital marketing", "seo",
+    "shopify", "online store", "book now", "dm me", "call today", "limited time", "award winning",
+    "10 years", "llc", "reviews", "nyc", "los angeles", "miami beach", "austin", "📧", "@studio"
+]
+FILLER = {
+    "english": "the and for with my our your love life daily helping people every day best team".split(),
+    "spanish": "el la de y en con para por una un es mi tu su que pero como muy".split(),
+    "french": "le la et un une des pour avec est mon ton son je tu il nous vous".split(),
+    "german": "der die das und ist ein eine mit für ich du er sie wir ihr".split(),
+    "portuguese": "o a os as de do da em um uma para com não que se por mais".split()
+}
+BIO_LENGTHS = (40, 150, 600, 2400)  # characters
+
+
+def generate_bios(count, seed=7):
+    rng = random.Random(seed)
+    bios = []
+    for i in range(count):
+        language = list(FILLER)[i % len(FILLER)]
+        target = BIO_LENGTHS[i % len(BIO_LENGTHS)]
+        words = []
+        while sum(len(w) + 1 for w in words) < target:
+            words.append(rng.choice(KEYWORDS) if rng.random() < 0.25 else rng.choice(FILLER[language]))
+        bios.append(" ".join(words)[:target])
+    return bios
+
+
+def write_png(path, width, height, seed):
+    # Minimal RGB PNG writer (stdlib only): smooth gradient plus noise
+    rng = random.Random(seed)
+    rows = []
+    for y in range(height):
+        row = bytearray([0])
+        for x in range(width):
+            noise = rng.randint(0, 40)
+            row += bytes(((x * 255 // max(width, 1) + noise) % 256, (y * 255 // max(height, 1)) % 256, (noise * 5) % 256))
+        rows.append(bytes(row))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(b"".join(rows), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def generate_images(directory, count, seed=7):
+    sizes = [(1, 1), (150, 150), (400, 400), (375, 667), (1080, 1080)]
+    paths = []
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        path = os.path.join(directory, f"synthetic_{i}_{width}x{height}.png")
+        write_png(path, width, height, seed + i)
+        paths.append(path)
+    return paths
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def peak_rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def summarize(latencies, elapsed):
+    return {
+        "items": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else None
+    }
+
+
+def build_scorers():
+    import bio_score
+    import bio_score_fast
+    import vision_score
+
+    fast = bio_score_fast.ProfessionalBioAnalyzer()
+    vision = vision_score.ProfessionalVisionAnalyzer()
+    return {
+        "bio_score": ("bio_score.py", bio_score.score_bio, "bio"),
+        "bio_score_fast": ("bio_score_fast.py", fast.analyze_bio, "bio"),
+        "vision_score": ("vision_score.py", vision.analyze_image, "image")
+    }
+
+
+def bench_in_process(score, items, warmup=20):
+    for item in items[:warmup]:
+        score(item)
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        score(item)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_cli(script, items):
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, script, item], cwd=BACKEND_DIR, capture_output=True, check=True)
+        latencies.append(time.perf_counter() - t0)
+    result = summarize(latencies, time.perf_counter() - started)
+    result["peak_rss_mb"] = peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+    return result
+
+
+def bench_startup(script, runs):
+    # Interpreter start + imports + analyzer construction, scoring an empty input
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, script, ""], cwd=BACKEND_DIR, capture_output=True, check=True)
+        timings.append(time.perf_counter() - t0)
+    return {"runs": runs, "p50_ms": round(percentile(timings, 0.5) * 1000, 2), "min_ms": round(min(timings) * 1000, 2)}
+
+
+def bench_scorer(name, args, image_dir):
+    # One scorer's entry; runs in a subprocess of its own (see run)
+    script, score, kind = build_scorers()[name]
+    items = generate_bios(args.items) if kind == "bio" else \
+        sorted(os.path.join(image_dir, image) for image in os.listdir(image_dir))
+    entry = {"in_process": bench_in_process(score, items)}
+    entry["in_process"]["peak_rss_mb"] = peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+    if args.cli_items:
+        entry["cli"] = bench_cli(script, items[:args.cli_items])
+        entry["startup"] = bench_startup(script, args.startup_runs)
+    return entry
+
+
+def run(args):
+    results = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "items": args.items,
+        "cli_items": args.cli_items,
+        "scorers": {}
+    }
+
+    with tempfile.TemporaryDirectory() as image_dir:
+        generate_images(image_dir, max(10, args.items // 10))
+        for name in ("bio_score", "bio_score_fast", "vision_score"):
+            if args.only and name not in args.only:
+                continue
+            command = [sys.executable, os.path.abspath(__file__), "--scorer", name, "--image-dir", image_dir,
+                       "--items", str(args.items), "--cli-items", str(args.cli_items),
+                       "--startup-runs", str(args.startup_runs)]
+            entry = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+            results["scorers"][name] = entry
+            print(f"[bench] {name}: {json.dumps(entry)}", file=sys.stderr)
+
+    return results
+
+
+# Metrics where higher is worse; throughput is checked separately (lower is worse)
+LATENCY_METRICS = [("in_process", "p50_ms"), ("in_process", "p99_ms"), ("cli", "p50_ms"), ("startup", "p50_ms")]
+# Fewest items (startup: runs) a section needs, in both results, to be gated at all
+MIN_GATE_ITEMS = {"in_process": 200, "cli": 10, "startup": 10}
+# Latency changes smaller than this are noise whatever the tolerance says
+NOISE_FLOOR_MS = {"in_process": 0.02, "cli": 5.0, "startup": 5.0}
+
+
+def _run_length(section_result):
+    return section_result.get("items", section_result.get("runs", 0))
+
+
+def compare(results, baseline, tolerance):
+    # (regressions, skipped): skipped lists the sections too short to gate
+    regressions = []
+    skipped = []
+    for name, entry in results["scorers"].items():
+        base = baseline.get("scorers", {}).get(name)
+        if not base:
+            continue
+        gated = set()
+        for section in MIN_GATE_ITEMS:
+            if section not in entry or section not in base:
+                continue
+            if min(_run_length(entry[section]), _run_length(base[section])) < MIN_GATE_ITEMS[section]:
+                skipped.append(f"{name}.{section}")
+            else:
+                gated.add(section)
+
+        for section, metric in LATENCY_METRICS:
+            if section not in gated:
+                continue
+            new, old = entry[section].get(metric), base[section].get(metric)
+            if new is not None and old and new > old * (1 + tolerance) and new - old > NOISE_FLOOR_MS[section]:
+                regressions.append(f"{name}.{section}.{metric}: {old} -> {new}")
+        if "in_process" in gated:
+            new, old = entry["in_process"].get("throughput_per_s"), base["in_process"].get("throughput_per_s")
+            if new is not None and old and new < old * (1 - tolerance):
+                regressions.append(f"{name}.in_process.throughput_per_s: {old} -> {new}")
+    return regressions, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python lead scorers")
+    parser.add_argument("--items", type=int, default=2000, help="synthetic bios per in-process run")
+    parser.add_argument("--cli-items", type=int, default=20, help="items scored via one subprocess each (0 to skip)")
+    parser.add_argument("--startup-runs", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="subset of: bio_score bio_score_fast vision_score")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against a saved results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--scorer", help=argparse.SUPPRESS)
+    parser.add_argument("--image-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scorer:
+        # Subprocess of run(): benchmark one scorer, entry JSON on stdout
+        print(json.dumps(bench_scorer(args.scorer, args, args.image_dir)))
+        return 0
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions, skipped = compare(results, json.load(f), args.tolerance)
+        for section in skipped:
+            print(f"[bench] not gated (run too short): {section}", file=sys.stderr)
+        for regression in regressions:
+            print(f"[bench] REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
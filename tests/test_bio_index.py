@@ -0,0 +1,62 @@
+# Tests for bio_index.BioIndex.sync: after a table or rule edit, stored results must
+# equal a fresh analyze_bio, and only the bios that can change are rescored.
+#
+#   python -m pytest tests/test_bio_index.py
+
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from bio_index import BioIndex
+from bio_score_fast import ProfessionalBioAnalyzer
+
+BIOS = [
+    "Certified personal trainer in NYC, book now - limited spots",
+    "Award winning wedding photographer based in Miami",
+    "Realtor and top producer, DM me for listings",
+    "Just living my best life",
+]
+
+
+def _index(tmp_path) -> BioIndex:
+    index = BioIndex(str(tmp_path / "bio_index.db"), ProfessionalBioAnalyzer())
+    index.add(enumerate(BIOS))
+    return index
+
+
+def _assert_current(index: BioIndex):
+    for bio_id, text in enumerate(BIOS):
+        assert index.result(bio_id) == index.analyzer.analyze_bio(text), text
+
+
+def test_unchanged_tables_rescore_nothing(tmp_path):
+    index = _index(tmp_path)
+    assert index.sync()["rescored"] == 0
+    index.close()
+
+
+def test_keyword_edit_rescores_affected_bios(tmp_path):
+    index = _index(tmp_path)
+    index.analyzer.urgency_indicators["high"].append("living")
+    index.analyzer.reload_tables()
+    summary = index.sync()
+    assert summary["changed_keywords"] == ["living"]
+    assert summary["rescored"] == 1
+    _assert_current(index)
+    index.close()
+
+
+def test_weight_edit_rescores_everything(tmp_path):
+    index = _index(tmp_path)
+    before = index.result(0)
+    index.analyzer.scoring_rules["urgency"]["weights"]["high"] = 5.0
+    index.analyzer.reload_tables()
+    summary = index.sync()
+    assert summary["changed_keywords"] == "all"
+    assert summary["rescored"] == len(BIOS)
+    assert index.result(0) != before
+    _assert_current(index)
+    assert index.sync()["rescored"] == 0
+    index.close()
@@ -0,0 +1,42 @@
+# Tests for cli_json.dumps: the one-shot CLIs' output must be exactly json.dumps's.
+#
+#   python -m pytest tests/test_cli_json.py
+
+import json
+import math
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+import cli_json
+from bio_score_fast import ProfessionalBioAnalyzer
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scoring_rules_corpus.json")
+
+
+@pytest.mark.parametrize("value", [
+    "plain", "", 'quote " and \\ backslash', "\n\r\t\b\f\x00\x1f\x7f", "über café", "🔥 HOT LEAD", "日本語",
+    "\ud800 lone surrogate", 0, -12, 10 ** 30, 0.1, -2.5, 1e300, 1e-7, math.nan, math.inf, -math.inf,
+    True, False, None, [], {}, [1, "a", [None]], (1, 2), {"a": {"b": [1.5, "📧"]}},
+    {3: "int key", 2.5: "float key", True: "bool key", None: "none key"},
+])
+def test_matches_json_dumps(value):
+    assert cli_json.dumps(value) == json.dumps(value)
+
+
+def test_matches_json_dumps_on_bio_results():
+    analyzer = ProfessionalBioAnalyzer()
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        for case in json.load(f):
+            result = analyzer.analyze_bio(case["bio"])
+            assert cli_json.dumps(result) == json.dumps(result)
+
+
+@pytest.mark.parametrize("value", [object(), {("tuple", "key"): 1}, {1, 2}])
+def test_unserializable_raises_type_error(value):
+    with pytest.raises(TypeError):
+        cli_json.dumps(value)
@@ -0,0 +1,91 @@
+# Tests for keyword_matcher.KeywordMatcher.
+#
+# find() must return exactly {k for k in keywords if k in text} - the per-keyword
+# substring loop it replaced - both before the trie regex is compiled (the first
+# COMPILE_AFTER_CALLS calls) and after, and after a to_state()/from_state() round trip.
+#
+#   python -m pytest tests/test_keyword_matcher.py
+
+import json
+import marshal
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+import keyword_matcher
+from bio_score_fast import ProfessionalBioAnalyzer
+from keyword_matcher import KeywordMatcher
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scoring_rules_corpus.json")
+
+KEYWORDS = ["ceo", "coach", "fit", "fitness", "fitness coach", "dm me", "new york", "york",
+            "book", "book now", "nyc", "@", "📧", "co", "e.com"]
+
+
+def _substring_loop(keywords, text):
+    return {keyword for keyword in keywords if keyword in text}
+
+
+@pytest.fixture(params=["scan", "compiled"])
+def matcher(request, monkeypatch):
+    # "scan" stays on the pre-compile per-keyword path, "compiled" uses the trie regex from the first call
+    monkeypatch.setattr(keyword_matcher, "COMPILE_AFTER_CALLS", 10 ** 9 if request.param == "scan" else 0)
+    return KeywordMatcher(KEYWORDS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Substring semantics, not whole words: "ceo" inside "ceos", "fit" inside "outfit"
+    ("ceos and outfits", {"ceo", "fit"}),
+    ("coach@example.com", {"coach", "co", "@", "e.com"}),
+    ("📧coach", {"📧", "coach", "co"}),
+    ("", set()),
+    ("   ", set()),
+])
+def test_word_boundaries(matcher, text, expected):
+    assert matcher.find(text) == expected == _substring_loop(KEYWORDS, text)
+
+
+def test_prefix_closure(matcher):
+    # The lookahead scan reports only the longest word at each position; every shorter
+    # keyword starting there must still be found
+    assert matcher.find("fitness") == {"fit", "fitness"}
+    assert matcher.find("fitnes") == {"fit"}
+    assert matcher.find("cocoach") == {"co", "coach"}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("fitness coach in new york", {"fit", "fitness", "coach", "co", "fitness coach", "new york", "york"}),
+    # All words present but not adjacent: the phrase does not match
+    ("york is new", {"york"}),
+    ("coach for fitness", {"coach", "co", "fit", "fitness"}),
+    # Phrase words count only inside the phrase: "dm" and "me" are not keywords
+    ("dm me now", {"dm me"}),
+    ("dm  me", set()),
+    ("dm meet", {"dm me"}),
+    ("book nowhere", {"book", "book now"}),
+])
+def test_multi_word_phrases(matcher, text, expected):
+    assert matcher.find(text) == expected == _substring_loop(KEYWORDS, text)
+
+
+def test_state_round_trip_through_marshal():
+    original = KeywordMatcher(KEYWORDS)
+    restored = KeywordMatcher.from_state(marshal.loads(marshal.dumps(original.to_state())))
+    for text in ("fitness coach in new york", "dm me", "coach@example.com"):
+        assert restored.find(text) == original.find(text) == _substring_loop(KEYWORDS, text)
+
+
+def test_matches_substring_loop_on_analyzer_keywords():
+    # The scorer's real vocabulary over the scoring corpus, on both sides of the compile switch
+    matcher = ProfessionalBioAnalyzer()._matcher
+    keywords = list(matcher.keywords)
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        bios = [case["bio"].lower() for case in json.load(f)]
+    assert len(bios) > keyword_matcher.COMPILE_AFTER_CALLS
+    for bio in bios:
+        assert matcher.find(bio) == _substring_loop(keywords, bio), bio
+    assert matcher._word_pattern is not None
@@ -0,0 +1,53 @@
+# Tests for language_detect.LanguageDetector.
+#
+#   python -m pytest tests/test_language_detect.py
+
+import os
+import re
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from language_detect import LanguageDetector, detect_language, letter_runs
+
+
+@pytest.mark.parametrize("bio, language", [
+    ("hola! soy entrenador personal en madrid, clases de yoga y nutrición para todos.", "Spanish"),
+    ("je suis coach sportif à paris, pour vous et avec vous", "French"),
+    ("hallo! ich bin friseur in berlin, termine auf anfrage und mit liebe gemacht.", "German"),
+    ("olá! sou fotógrafa em são paulo, ensaios e casamentos com você.", "Portuguese"),
+    ("certified personal trainer in nyc. dm me or book now!", "English"),
+    ("", "English"),
+])
+def test_detects_language(bio, language):
+    assert detect_language(bio) == language
+
+
+@pytest.mark.parametrize("bio", [
+    # US place names are not Spanish
+    "personal trainer in los angeles and las vegas",
+    "realtor in la jolla and el paso, call me",
+    # A few foreign stopwords do not outvote as many English ones
+    "mi casa es su casa - the best airbnb host in the city, book with me",
+])
+def test_english_bios_with_foreign_words_stay_english(bio):
+    assert detect_language(bio) == "English"
+
+
+def test_other_language_needs_strict_lead_over_default():
+    detector = LanguageDetector({"Spanish": ["el", "de", "mi"], "English": ["the", "in", "and"]})
+    assert detector.detect("el de the in") == "English"
+    assert detector.detect("el de mi the in") == "Spanish"
+    assert detector.detect("el de") == "Spanish"
+    assert detector.detect("el") == "English"
+
+
+@pytest.mark.parametrize("token", [
+    "hola!", "(de", "don't", "snake_case", "a1b2c", "x²y", "½de", "١٢abc", "über-cool", "日本語です",
+    "e\u0301te", "__", "123", "📧coach", "", "l'été",
+])
+def test_letter_runs_match_regex(token):
+    assert letter_runs(token) == re.findall(r"[^\W\d_]+", token)
@@ -0,0 +1,61 @@
+# Tests for score_cache.ScoreCache.
+#
+#   python -m pytest tests/test_score_cache.py
+
+import os
+import shutil
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from bio_score_fast import ProfessionalBioAnalyzer
+from score_cache import ScoreCache
+from vision_score import ProfessionalVisionAnalyzer
+
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+
+
+def test_error_results_are_not_cached(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.db"))
+    assert cache.cached("vision", "k", "v1", lambda: {"error": "unreadable"}) == {"error": "unreadable"}
+    assert cache.get("vision", "k", "v1") is None
+    assert cache.cached("vision", "k", "v1", lambda: {"score": 1.0}) == {"score": 1.0}
+    assert cache.get("vision", "k", "v1") == {"score": 1.0}
+    assert cache.stats()["entries"] == 1
+    cache.close()
+
+
+def test_transient_vision_failure_is_rescored(tmp_path, monkeypatch):
+    cache = ScoreCache(str(tmp_path / "scores.db"))
+    name = sorted(name for name in os.listdir(SCREENSHOTS_DIR) if name.endswith(".png"))[0]
+    image_path = str(tmp_path / name)
+    shutil.copy(os.path.join(SCREENSHOTS_DIR, name), image_path)
+    analyzer = ProfessionalVisionAnalyzer()
+
+    def vanished(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(analyzer, "_file_info", vanished)
+    assert "error" in cache.vision_score(analyzer, image_path)
+    assert cache.stats()["entries"] == 0
+
+    monkeypatch.undo()
+    result = cache.vision_score(analyzer, image_path)
+    assert "error" not in result
+    assert cache.vision_score(analyzer, image_path) == result
+    assert cache.stats()["entries"] == 1
+    cache.close()
+
+
+def test_non_string_bio_scores_as_insufficient_data(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.db"))
+    analyzer = ProfessionalBioAnalyzer()
+    empty = analyzer.analyze_bio("")
+    for bio in (12345, 3.5, None, ["a list"], {"bio": "nested"}):
+        assert analyzer.analyze_bio(bio) == empty
+        assert cache.bio_score(analyzer, bio) == empty
+    assert analyzer.analyze_bios([42, "fitness coach in nyc"])[0] == empty
+    assert cache.bio_scores(analyzer, [42, None]) == [empty, empty]
+    assert analyzer.keyword_hits(42) == set()
+    cache.close()
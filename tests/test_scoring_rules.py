@@ -0,0 +1,143 @@
+# Parity tests for the rule tables in scoring_rules.py.
+#
+# fixtures/scoring_rules_corpus.json holds bios (edge cases plus a corpus chosen so that
+# every business type, region, recommendation, key indicator and score step the two
+# scorers produce appears at least once) with the results recorded from the
+# hand-written scorers the rules replaced. Both compiled scorers must reproduce them
+# exactly, whether the function was generated in this process or loaded from the
+# marshal artifact.
+#
+#   python -m pytest tests/test_scoring_rules.py
+
+import json
+import os
+import re
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+import bio_score_fast
+import scoring_rules
+from bio_score_fast import CONTACT_SYMBOLS, PHONE_PATTERN, RECOMMENDATIONS, ProfessionalBioAnalyzer
+from language_detect import detect_language
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scoring_rules_corpus.json")
+
+with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+@pytest.fixture
+def rules_artifact(tmp_path, monkeypatch):
+    # A fresh artifact per test, so the first compile generates and the second loads
+    monkeypatch.setattr(scoring_rules, "RULES_ARTIFACT_PATH", str(tmp_path / "rules.marshal"))
+    monkeypatch.setattr(scoring_rules, "_loaded_artifact", None)
+    return tmp_path / "rules.marshal"
+
+
+def _fast_scorer(analyzer, cache=True):
+    return scoring_rules.compile_bio_fast(analyzer.keyword_tables(), analyzer.scoring_rules, RECOMMENDATIONS,
+                                          CONTACT_SYMBOLS, PHONE_PATTERN, detect_language, cache=cache)
+
+
+def test_analyze_bio_matches_recorded_results():
+    analyzer = ProfessionalBioAnalyzer()
+    for case in CORPUS:
+        assert analyzer.analyze_bio(case["bio"]) == case["bio_score_fast"], case["bio"]
+
+
+def test_score_bio_matches_recorded_results():
+    from bio_score import score_bio
+    for case in CORPUS:
+        assert score_bio(case["bio"]) == case["bio_score"], case["bio"]
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_fast_rules_generated_and_loaded_agree(rules_artifact, cache):
+    analyzer = ProfessionalBioAnalyzer()
+    generated = _fast_scorer(analyzer)
+    assert rules_artifact.exists()
+    scoring_rules._loaded_artifact = None
+    loaded = _fast_scorer(analyzer, cache)
+    assert hasattr(loaded, "source") is not cache
+
+    for case in CORPUS:
+        bio_lower = case["bio"].lower()
+        if len(bio_lower.strip()) < 5:
+            continue
+        hits = analyzer._matcher.find(bio_lower)
+        assert generated(bio_lower, hits) == loaded(bio_lower, hits) == case["bio_score_fast"], case["bio"]
+
+
+def test_bio_score_rules_loaded_from_artifact(rules_artifact):
+    generated = scoring_rules.compile_bio_score(scoring_rules.RULES["bio_score"], detect_language)
+    scoring_rules._loaded_artifact = None
+    loaded = scoring_rules.compile_bio_score(scoring_rules.RULES["bio_score"], detect_language)
+    assert hasattr(generated, "source") and not hasattr(loaded, "source")
+    for case in CORPUS:
+        assert loaded(case["bio"]) == generated(case["bio"]) == case["bio_score"], case["bio"]
+
+
+def test_table_edit_invalidates_cached_rules(rules_artifact):
+    analyzer = ProfessionalBioAnalyzer()
+    bio = "certified personal trainer in nyc, book now"
+    before = analyzer.analyze_bio(bio)
+
+    analyzer.scoring_rules["urgency"]["base"] += 1.0
+    analyzer.reload_tables()
+    after = analyzer.analyze_bio(bio)
+    assert after["urgency_score"] == round(before["urgency_score"] + 1.0, 1)
+
+
+def test_edited_tables_do_not_evict_default_rules(rules_artifact, monkeypatch):
+    default = ProfessionalBioAnalyzer()
+    edited = ProfessionalBioAnalyzer()
+    edited.scoring_rules["urgency"]["base"] += 1.0
+    edited.reload_tables()
+
+    # Alternating between the two in fresh processes loads both without regenerating
+    # or rewriting the artifact
+    writes = []
+    monkeypatch.setattr(scoring_rules, "_write_artifact", writes.append)
+    for analyzer in (default, edited, default, edited):
+        scoring_rules._loaded_artifact = None
+        assert not hasattr(_fast_scorer(analyzer), "source")
+    assert writes == []
+
+
+def test_artifact_keeps_newest_entries(rules_artifact, monkeypatch):
+    monkeypatch.setattr(scoring_rules, "RULES_ARTIFACT_ENTRIES", 2)
+    analyzer = ProfessionalBioAnalyzer()
+    for _ in range(3):
+        analyzer.scoring_rules["urgency"]["base"] += 1.0
+        analyzer.reload_tables()
+    scoring_rules._loaded_artifact = None
+    assert len(scoring_rules._artifact()["score"]) == 2
+    assert not hasattr(_fast_scorer(analyzer), "source")
+
+
+def test_analyze_bios_matches_analyze_bio():
+    # Batch path used by ScoringWorker.score_batch, with in-batch duplicates and a memo
+    analyzer = ProfessionalBioAnalyzer(memo_size=16)
+    bios = [case["bio"] for case in CORPUS]
+    bios += bios[:10]
+    results = analyzer.analyze_bios(bios)
+    assert results == [case["bio_score_fast"] for case in CORPUS] + [case["bio_score_fast"] for case in CORPUS[:10]]
+    assert len({id(result) for result in results}) == len(results)
+    assert analyzer.analyze_bios(bios[-5:]) == results[-5:]
+    assert len(analyzer._memo) <= 16
+
+
+@pytest.mark.parametrize("compile_after_calls", [10 ** 9, 0])
+def test_phone_pattern_matches_regex(monkeypatch, compile_after_calls):
+    # Before the regex is compiled, bios with fewer than ten digits are ruled out without it
+    monkeypatch.setattr(bio_score_fast, "COMPILE_AFTER_CALLS", compile_after_calls)
+    pattern = type(PHONE_PATTERN)()
+    for text in ["call 555-123-4567", "555.123.4567", "5551234567", "555-1234567", "555--123-4567",
+                 "12 345 678 90", "call me at 555 123 4567", "١٢٣٤٥٦٧٨٩٠", "no digits", ""]:
+        expected = re.search(PHONE_PATTERN.pattern, text)
+        found = pattern.search(text)
+        assert (found and found.group()) == (expected and expected.group()), text
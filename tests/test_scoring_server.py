@@ -0,0 +1,84 @@
+# End-to-end tests for scoring_server.py over a Unix socket.
+#
+# The server is built the way `python scoring_server.py --cache` builds it: the score
+# cache is created on the event loop thread and used on the server's scoring thread.
+#
+#   python -m pytest tests/test_scoring_server.py
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from score_cache import ScoreCache
+from scoring_server import ScoringServer
+from scoring_worker import ScoringWorker
+
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+
+pytestmark = pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="needs Unix sockets")
+
+
+def _screenshot() -> str:
+    names = sorted(name for name in os.listdir(SCREENSHOTS_DIR) if name.endswith(".png"))
+    return os.path.join(SCREENSHOTS_DIR, names[0])
+
+
+async def _exchange(socket_path: str, requests):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    for request in requests:
+        writer.write((json.dumps(request) + "\n").encode("utf-8"))
+    await writer.drain()
+    responses = {}
+    for _ in requests:
+        response = json.loads(await reader.readline())
+        responses[response["id"]] = response
+    writer.close()
+    return responses
+
+
+def _serve(tmp_path, cache, batches):
+    socket_path = str(tmp_path / "scoring.sock")
+
+    async def run():
+        server = ScoringServer(ScoringWorker(cache))
+        listener = await server.serve_unix(socket_path)
+        try:
+            return [await _exchange(socket_path, requests) for requests in batches]
+        finally:
+            listener.close()
+            server.close()
+
+    return asyncio.run(run())
+
+
+def test_server_scores_through_cache(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.db"))
+    image = _screenshot()
+    requests = [
+        {"id": 1, "type": "bio", "input": "Certified personal trainer in NYC, DM me to book"},
+        {"id": 2, "type": "bio", "input": "ceo and founder of a marketing agency"},
+        {"id": 3, "type": "vision", "input": image},
+    ]
+    first, second = _serve(tmp_path, cache, [requests, requests])
+
+    for request in requests:
+        assert "error" not in first[request["id"]], first[request["id"]]
+        assert "error" not in first[request["id"]]["result"]
+        assert second[request["id"]]["result"] == first[request["id"]]["result"]
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["misses"] == 3 and stats["hits"] == 3
+    cache.close()
+
+
+def test_server_without_cache(tmp_path):
+    (responses,) = _serve(tmp_path, None, [[{"id": "a", "type": "bio", "input": "fitness coach"},
+                                            {"id": "b", "type": "nope", "input": ""}]])
+    assert "pitch_score" in responses["a"]["result"]
+    assert "error" in responses["b"] or "error" in responses["b"].get("result", {})
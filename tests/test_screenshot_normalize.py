@@ -0,0 +1,80 @@
+# Tests for screenshot_normalize.py and vision_score's use of the normalized copies.
+#
+# A screenshot scored through its copy must get exactly the result of decoding the
+# original, and the statistics must come from the copy's header without touching pixels.
+#
+#   python -m pytest tests/test_screenshot_normalize.py
+
+import os
+import shutil
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from screenshot_normalize import normalize_directory, normalized_path
+from vision_score import NORMALIZED_HEADER, ProfessionalVisionAnalyzer
+
+SCREENSHOTS_DIR = os.path.join(BACKEND_DIR, "screenshots")
+# 400x400 and 1249x1325 get reduced copies; small.png (made from the first) a header-only one
+SCREENSHOTS = ["1013292530224018.png", "1554245014870700.png"]
+
+
+@pytest.fixture
+def screenshots(tmp_path):
+    originals = tmp_path / "originals"
+    normalized = tmp_path / "normalized"
+    for directory in (originals, normalized):
+        directory.mkdir()
+        for name in SCREENSHOTS:
+            shutil.copy2(os.path.join(SCREENSHOTS_DIR, name), directory / name)
+        with Image.open(os.path.join(SCREENSHOTS_DIR, SCREENSHOTS[0])) as img:
+            img.resize((200, 150)).save(directory / "small.png")
+    return originals, normalized
+
+
+def test_copies_score_like_originals(screenshots):
+    originals, normalized = screenshots
+    counts = normalize_directory(str(normalized), workers=2)
+    assert (counts["written"], counts["small"], counts["failed"]) == (2, 1, 0)
+    assert os.path.getsize(normalized_path(str(normalized / "small.png"))) == NORMALIZED_HEADER.size
+
+    analyzer = ProfessionalVisionAnalyzer()
+    for name in SCREENSHOTS + ["small.png"]:
+        expected = analyzer.analyze_image(str(originals / name))
+        assert "image_stats" in expected
+        assert analyzer.analyze_image(str(normalized / name)) == expected, name
+
+    assert normalize_directory(str(normalized))["skipped"] == len(SCREENSHOTS) + 1
+
+
+def test_statistics_come_from_header(screenshots, monkeypatch):
+    _, normalized = screenshots
+    normalize_directory(str(normalized))
+    analyzer = ProfessionalVisionAnalyzer()
+
+    def no_pixels(*args):
+        raise AssertionError("pixels decoded despite a fresh copy")
+
+    monkeypatch.setattr(analyzer, "image_pixels", no_pixels)
+    for name in SCREENSHOTS + ["small.png"]:
+        assert "image_stats" in analyzer.analyze_image(str(normalized / name))
+
+
+def test_stale_copy_is_ignored(screenshots):
+    originals, normalized = screenshots
+    normalize_directory(str(normalized))
+    image_path = str(normalized / SCREENSHOTS[1])
+    analyzer = ProfessionalVisionAnalyzer()
+    assert analyzer.normalized_pixels(image_path) is not None
+
+    # Replaced by a different screenshot: the copy's mtime no longer matches
+    shutil.copy(os.path.join(SCREENSHOTS_DIR, SCREENSHOTS[0]), image_path)
+    assert analyzer.normalized_statistics(image_path) is None
+    assert analyzer.normalized_pixels(image_path) is None
+    assert analyzer.analyze_image(image_path) == analyzer.analyze_image(str(originals / SCREENSHOTS[0]))